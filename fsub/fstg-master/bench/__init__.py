@@ -0,0 +1,15 @@
+import os
+
+# Benchmarks run offline: storage is always in memory and the credentials are
+# placeholders, so they must be set before `bot` reads its configuration.
+os.environ["DATABASE_BACKEND"] = "memory"
+os.environ.setdefault("API_ID", "1")
+os.environ.setdefault("API_HASH", "offline")
+os.environ.setdefault("BOT_TOKEN", "1000:offline")
+os.environ.setdefault("OWNER_ID", "1")
+os.environ.setdefault("DATABASE_CHAT_ID", "-1000000000001")
+
+from .fake import FakeClient, FakeMessage, FakeUser  # noqa: E402
+from .offline import setup_offline  # noqa: E402
+
+__all__ = ["FakeClient", "FakeMessage", "FakeUser", "setup_offline"]
@@ -0,0 +1,166 @@
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import platform
+import resource
+import subprocess
+from typing import Any, Dict, List
+
+from bot import database
+
+from . import FakeClient, setup_offline
+from .suite import (
+    bench_broadcast,
+    bench_decode_data,
+    bench_join_buttons,
+    bench_start_handler,
+    bench_url_safe,
+    bench_user_is_not_join,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m bench",
+        description="Benchmarks the /start, membership-gate and broadcast hot paths.",
+    )
+    parser.add_argument("--users", type=int, nargs="+", default=[10000])
+    parser.add_argument("--fs-chats", type=int, nargs="+", default=[2])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--joined-ratio", type=float, default=0.9)
+    parser.add_argument("--api-latency", type=float, default=0.0)
+    parser.add_argument("--api-jitter", type=float, default=0.0)
+    parser.add_argument("--db-latency", type=float, default=0.0)
+    parser.add_argument("--flood-rate", type=float, default=0.0)
+    parser.add_argument("--no-broadcast", action="store_true")
+    parser.add_argument("--trace-memory", action="store_true")
+    parser.add_argument("--output", default="bench.json")
+    parser.add_argument("--compare", metavar="BASELINE")
+    parser.add_argument("--verbose", action="store_true")
+    return parser.parse_args()
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run_suite(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    for users in args.users:
+        for fs_chats in args.fs_chats:
+            database.docs.clear()
+            database.users.clear()
+
+            client = FakeClient(
+                latency=args.api_latency,
+                jitter=args.api_jitter,
+                flood_rate=args.flood_rate,
+                flood_value=0,
+                seed=0,
+            )
+            await setup_offline(
+                client,
+                users=users,
+                fs_chats=fs_chats,
+                joined_ratio=args.joined_ratio,
+                db_latency=args.db_latency,
+                seed=0,
+            )
+
+            params = {"users": users, "fs_chats": fs_chats, "batch_size": None}
+            runs = [
+                await bench_user_is_not_join(
+                    client, users, args.iterations, args.trace_memory
+                ),
+                await bench_join_buttons(
+                    client, users, args.iterations, args.trace_memory
+                ),
+                await bench_url_safe(args.iterations, args.trace_memory),
+                await bench_start_handler(
+                    client, users, 1, args.iterations, args.trace_memory, payload=False
+                ),
+            ]
+            results.extend({**params, **run} for run in runs)
+
+            for batch_size in args.batch_sizes:
+                params = {**params, "batch_size": batch_size}
+                runs = [
+                    await bench_decode_data(
+                        batch_size, args.iterations, args.trace_memory
+                    ),
+                    await bench_start_handler(
+                        client,
+                        users,
+                        batch_size,
+                        args.iterations,
+                        args.trace_memory,
+                        payload=True,
+                    ),
+                ]
+                results.extend({**params, **run} for run in runs)
+
+            if not args.no_broadcast:
+                run = await bench_broadcast(client, args.trace_memory)
+                results.append({**params, "batch_size": None, **run})
+
+    return results
+
+
+def result_key(result: Dict[str, Any]) -> tuple:
+    return result["name"], result["users"], result["fs_chats"], result["batch_size"]
+
+
+def print_results(results: List[Dict[str, Any]], baseline: Dict[tuple, Any]) -> None:
+    header = f"{'benchmark':<24}{'users':>9}{'chats':>6}{'batch':>6}{'ops/s':>12}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header + ("  vs baseline" if baseline else ""))
+    for result in results:
+        line = (
+            f"{result['name']:<24}{result['users']:>9}{result['fs_chats']:>6}"
+            f"{result['batch_size'] or '-':>6}{result['throughput']:>12.1f}"
+            f"{result['p50_ms']:>9.3f}{result['p95_ms']:>9.3f}{result['p99_ms']:>9.3f}"
+        )
+        base = baseline.get(result_key(result))
+        if base and base["throughput"]:
+            change = (result["throughput"] / base["throughput"] - 1) * 100
+            line += f"  {change:+.1f}% ops/s"
+        print(line)
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.ERROR)
+
+    results = asyncio.run(run_suite(args))
+    report = {
+        "commit": git_commit(),
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "results": results,
+    }
+    with open(args.output, mode="w", encoding="utf-8") as doc:
+        json.dump(report, doc, indent=2)
+
+    baseline: Dict[tuple, Any] = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as doc:
+            baseline = {result_key(r): r for r in json.load(doc)["results"]}
+
+    print_results(results, baseline)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
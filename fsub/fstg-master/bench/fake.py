@@ -0,0 +1,201 @@
+import asyncio
+import itertools
+import random
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+from hydrogram.enums import ChatType, ParseMode
+from hydrogram.errors import FloodWait, UserIsBlocked, UserNotParticipant
+
+from bot.base import UpdateQueue
+
+
+class FakeUser:
+    """
+    A minimal stand-in for `hydrogram.types.User`.
+    """
+
+    def __init__(
+        self, user_id: int, first_name: str = "User", last_name: Optional[str] = None
+    ) -> None:
+        self.id = user_id
+        self.first_name = first_name
+        self.last_name = last_name
+        self.username = None
+        self.is_bot = False
+
+    def mention(self, name: Optional[str] = None) -> str:
+        return f'<a href="tg://user?id={self.id}">{name or self.first_name}</a>'
+
+
+class FakeMessage:
+    """
+    A minimal stand-in for `hydrogram.types.Message`, bound to a `FakeClient`.
+    """
+
+    def __init__(
+        self,
+        client: "FakeClient",
+        message_id: int,
+        chat_id: int,
+        text: str = "",
+        from_user: Optional[FakeUser] = None,
+        reply_to_message: Optional["FakeMessage"] = None,
+        empty: bool = False,
+    ) -> None:
+        self._client = client
+        self.id = message_id
+        self.chat = SimpleNamespace(id=chat_id, type=ChatType.PRIVATE)
+        self.text = text
+        self.from_user = from_user
+        self.reply_to_message = reply_to_message
+        self.empty = empty
+        self.command = text[1:].split() if text.startswith("/") else None
+
+    async def reply_text(self, text: str, **kwargs: Any) -> "FakeMessage":
+        return await self._client.send_message(self.chat.id, text, **kwargs)
+
+    async def edit_text(self, text: str, **kwargs: Any) -> "FakeMessage":
+        return await self._client.edit_message_text(self.chat.id, self.id, text)
+
+    async def delete(self) -> bool:
+        return await self._client.delete_messages(self.chat.id, self.id)
+
+    async def copy(self, chat_id: int, **kwargs: Any) -> "FakeMessage":
+        return await self._client.copy_message(chat_id, self.chat.id, self.id)
+
+
+class FakeClient:
+    """
+    A hydrogram-like client that answers from local tables instead of Telegram.
+
+    Every call sleeps for `latency` plus a random `jitter`, may raise
+    `FloodWait` with probability `flood_rate`, and is counted in `calls`.
+
+    Attributes:
+        me (SimpleNamespace): The bot account, as `Client.me`.
+        chats (Dict[int, SimpleNamespace]): Chats returned by `get_chat`.
+        members (Dict[int, Set[int]]): Member user IDs of each chat.
+        blocked (Set[int]): Users for whom sending raises `UserIsBlocked`.
+        calls (Counter): Number of calls per method name.
+        flood_waits (int): Number of injected `FloodWait` errors.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        flood_rate: float = 0.0,
+        flood_value: int = 1,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.flood_rate = flood_rate
+        self.flood_value = flood_value
+        self.random = random.Random(seed)
+        self.me = SimpleNamespace(id=1, username="FakeBot", is_bot=True)
+        self.chats: Dict[int, SimpleNamespace] = {}
+        self.members: Dict[int, Set[int]] = {}
+        self.blocked: Set[int] = set()
+        self.calls: Counter = Counter()
+        self.flood_waits = 0
+        self.message_ids = itertools.count(1)
+        self.executor = None
+        self.parse_mode = ParseMode.DEFAULT
+        self.updates = UpdateQueue()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running loop, used by hydrogram to run synchronous filters."""
+        return asyncio.get_running_loop()
+
+    def get_listener_matching_with_data(self, data: Any, listener_type: Any) -> None:
+        """No conversation listeners are active during load tests."""
+        return None
+
+    def add_chat(
+        self, chat_id: int, chat_type: ChatType = ChatType.CHANNEL
+    ) -> SimpleNamespace:
+        """Registers a chat with an invite link and no members."""
+        chat = SimpleNamespace(
+            id=chat_id,
+            type=chat_type,
+            invite_link=f"https://t.me/+fake{abs(chat_id)}",
+        )
+        self.chats[chat_id] = chat
+        self.members.setdefault(chat_id, set())
+        return chat
+
+    def join(self, chat_id: int, user_ids: Iterable[int]) -> None:
+        """Adds users to the member table of a chat."""
+        self.members.setdefault(chat_id, set()).update(user_ids)
+
+    async def call(self, method: str) -> None:
+        """Accounts for, delays and possibly fails one API call."""
+        self.calls[method] += 1
+        delay = self.latency + (
+            self.random.uniform(0, self.jitter) if self.jitter else 0
+        )
+        await asyncio.sleep(delay)
+        if self.flood_rate and self.random.random() < self.flood_rate:
+            self.flood_waits += 1
+            raise FloodWait(value=self.flood_value)
+
+    def new_message(self, chat_id: int, text: str = "") -> FakeMessage:
+        return FakeMessage(self, next(self.message_ids), chat_id, text)
+
+    async def get_chat(self, chat_id: int) -> SimpleNamespace:
+        await self.call("get_chat")
+        return self.chats[chat_id]
+
+    async def get_chat_member(self, chat_id: int, user_id: int) -> SimpleNamespace:
+        await self.call("get_chat_member")
+        if user_id not in self.members.get(chat_id, ()):
+            raise UserNotParticipant()
+        return SimpleNamespace(chat_id=chat_id, user_id=user_id)
+
+    async def get_messages(
+        self, chat_id: int, message_ids: Union[int, Iterable[int]]
+    ) -> Union[FakeMessage, List[FakeMessage]]:
+        await self.call("get_messages")
+        if isinstance(message_ids, int):
+            return FakeMessage(self, message_ids, chat_id, "content")
+        return [FakeMessage(self, i, chat_id, "content") for i in message_ids]
+
+    async def send_message(self, chat_id: int, text: str, **kwargs: Any) -> FakeMessage:
+        await self.call("send_message")
+        if chat_id in self.blocked:
+            raise UserIsBlocked()
+        return self.new_message(chat_id, text)
+
+    async def copy_message(
+        self, chat_id: int, from_chat_id: int, message_id: int, **kwargs: Any
+    ) -> FakeMessage:
+        await self.call("copy_message")
+        if chat_id in self.blocked:
+            raise UserIsBlocked()
+        return self.new_message(chat_id)
+
+    async def edit_message_text(
+        self, chat_id: int, message_id: int, text: str, **kwargs: Any
+    ) -> FakeMessage:
+        await self.call("edit_message_text")
+        return FakeMessage(self, message_id, chat_id, text)
+
+    async def delete_messages(
+        self, chat_id: int, message_ids: Union[int, Iterable[int]], **kwargs: Any
+    ) -> bool:
+        await self.call("delete_messages")
+        return True
+
+    async def answer_callback_query(
+        self, callback_query_id: str, **kwargs: Any
+    ) -> bool:
+        await self.call("answer_callback_query")
+        return True
+
+    async def invoke(self, query: Any, **kwargs: Any) -> Any:
+        await self.call(type(query).__name__)
+        return None
@@ -0,0 +1,54 @@
+import random
+from typing import Optional
+
+from bot import cache, config, database, initial_database
+
+from .fake import FakeClient
+
+
+async def setup_offline(
+    client: FakeClient,
+    users: int = 0,
+    fs_chats: int = 0,
+    joined_ratio: float = 1.0,
+    db_latency: float = 0.0,
+    seed: Optional[int] = None,
+) -> None:
+    """
+    Seeds the in-memory database and the fake client, then loads the cache.
+
+    Users get IDs from 1000 upwards. Each user is a member of every F-Sub chat
+    with probability `joined_ratio`.
+
+    Args:
+        client (FakeClient): The client the cache should query.
+        users (int): The number of bot users to create.
+        fs_chats (int): The number of F-Sub chats to create.
+        joined_ratio (float): The probability of a user being in a chat.
+        db_latency (float): Seconds slept by every database operation.
+        seed (Optional[int]): Seed for the membership assignment.
+    """
+    bot_id = int(config.BOT_ID)
+    database.latency = 0.0
+
+    await initial_database()
+
+    user_ids = list(range(1000, 1000 + users))
+    await database.add_users(bot_id, user_ids)
+
+    rng = random.Random(seed)
+    for i in range(fs_chats):
+        chat_id = -1001000000000 - i
+        client.add_chat(chat_id)
+        client.join(chat_id, [u for u in user_ids if rng.random() < joined_ratio])
+        await database.add_value(bot_id, "FSUB_CHATS", chat_id)
+
+    cache.client = client
+    await cache.start_text_init()
+    await cache.force_text_init()
+    await cache.generate_status_init()
+    await cache.protect_content_init()
+    await cache.admins_init()
+    await cache.fs_chats_init()
+
+    database.latency = db_latency
@@ -0,0 +1,341 @@
+import argparse
+import asyncio
+import datetime
+import importlib
+import itertools
+import json
+import logging
+import pkgutil
+import random
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from hydrogram import Client
+from hydrogram.enums import ChatType
+from hydrogram.handlers import CallbackQueryHandler, MessageHandler
+from hydrogram.handlers.handler import Handler
+from hydrogram.types import CallbackQuery, Chat, Message, User
+
+import plugins
+from bot import cache, config, database
+from bot.base import UpdateQueue
+from plugins.broadcast import broadcast_manager
+
+from . import FakeClient, setup_offline
+from .suite import encode_payload, percentile
+
+Update = Union[Message, CallbackQuery]
+
+HANDLER_TYPES = {MessageHandler: Message, CallbackQueryHandler: CallbackQuery}
+
+
+def load_handlers() -> List[Tuple[int, Handler]]:
+    """
+    Collects the handlers registered by the plugin modules, like `Client.load_plugins`.
+
+    Returns:
+        List[Tuple[int, Handler]]: Handlers with their group, in group order.
+    """
+    handlers: List[Tuple[int, Handler]] = []
+    for module_info in pkgutil.iter_modules(plugins.__path__):
+        module = importlib.import_module(f"plugins.{module_info.name}")
+        for obj in vars(module).values():
+            for handler, group in getattr(obj, "handlers", None) or []:
+                if isinstance(handler, Handler):
+                    handlers.append((group, handler))
+
+    return sorted(handlers, key=lambda item: item[0])
+
+
+class Replay:
+    """
+    Generates a synthetic stream of updates and feeds it through the plugin handlers.
+
+    Updates are produced at a target rate into a queue drained by a fixed
+    number of workers, as hydrogram's dispatcher does. End-to-end latency is
+    measured from the scheduled arrival of each update to the completion of
+    its handlers, and event-loop lag is sampled continuously.
+    """
+
+    def __init__(
+        self,
+        client: FakeClient,
+        users: int,
+        workers: int,
+        batch_size: int,
+        storm_size: int,
+        seed: int = 0,
+    ) -> None:
+        self.client = client
+        self.users = users
+        self.workers = workers
+        self.storm_size = storm_size
+        self.random = random.Random(seed)
+        self.handlers = load_handlers()
+        self.payload = encode_payload(batch_size)
+        self.ids = itertools.count(1)
+        # Shared with the client, so handlers see the backlog when shedding load
+        self.queue = client.updates = UpdateQueue(
+            sender=lambda item: item[2].from_user.id,
+            text=lambda item: getattr(item[2], "text", None),
+            per_user=config.USER_QUEUE_SIZE,
+        )
+        self.queue.priority_ids = cache.authorized
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.lags: List[float] = []
+        self.errors = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def user(self, user_id: int) -> User:
+        return User(client=self.client, id=user_id, first_name="Load", last_name="Test")
+
+    def message(
+        self, user_id: int, text: str, reply_to: Optional[Message] = None
+    ) -> Message:
+        return Message(
+            client=self.client,
+            id=next(self.ids),
+            from_user=self.user(user_id),
+            chat=Chat(client=self.client, id=user_id, type=ChatType.PRIVATE),
+            date=datetime.datetime.now(),
+            text=text,
+            reply_to_message=reply_to,
+        )
+
+    def callback(self, user_id: int, data: str) -> CallbackQuery:
+        return CallbackQuery(
+            client=self.client,
+            id=str(next(self.ids)),
+            from_user=self.user(user_id),
+            chat_instance="0",
+            message=self.message(user_id, "Menu"),
+            data=data,
+        )
+
+    def random_user(self) -> int:
+        return 1000 + self.random.randrange(self.users)
+
+    def next_updates(self) -> List[Tuple[str, Update]]:
+        """
+        Draws the next arrival from the traffic mix.
+
+        Returns:
+            List[Tuple[str, Update]]: One or more labelled updates arriving together.
+        """
+        roll = self.random.random()
+        if roll < 0.40:
+            return [("start", self.message(self.random_user(), "/start"))]
+        if roll < 0.70:
+            text = f"/start {self.payload}"
+            return [("start_payload", self.message(self.random_user(), text))]
+        if roll < 0.90:
+            user_id, text = self.random_user(), f"/start {self.payload}"
+            return [
+                ("try_again", self.message(user_id, text))
+                for _ in range(self.storm_size)
+            ]
+        if roll < 0.95:
+            data = self.random.choice(
+                ["change_generate", "change_protect", "menu_start", "settings"]
+            )
+            return [("admin", self.callback(config.OWNER_ID, data))]
+        return [("ping", self.message(self.random_user(), "/ping"))]
+
+    def broadcast(self) -> Tuple[str, Update]:
+        content = self.message(config.OWNER_ID, "Broadcast")
+        return "broadcast", self.message(config.OWNER_ID, "/broadcast", content)
+
+    async def dispatch(self, update: Update) -> None:
+        """Runs every matching handler, mirroring hydrogram's dispatcher."""
+        for _, handler in self.handlers:
+            if not isinstance(update, HANDLER_TYPES.get(type(handler), ())):
+                continue
+            try:
+                if await handler.check(self.client, update):
+                    await handler.callback(self.client, update)
+            except Exception:
+                self.errors += 1
+
+    async def worker(self) -> None:
+        while True:
+            scheduled, label, update = await self.queue.get()
+            try:
+                await self.dispatch(update)
+                self.latencies[label].append(time.monotonic() - scheduled)
+            finally:
+                self.queue.task_done()
+
+    async def producer(self, rate: float, duration: float) -> int:
+        """Enqueues arrivals on a fixed schedule; returns the number queued."""
+        started = time.monotonic()
+        count = 0
+        for arrival in itertools.count():
+            scheduled = started + arrival / rate
+            if scheduled - started >= duration:
+                break
+            delay = scheduled - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            for label, update in self.next_updates():
+                if self.queue.put_nowait((scheduled, label, update)):
+                    count += 1
+                else:
+                    self.dropped += 1
+            self.max_depth = max(self.max_depth, self.queue.qsize())
+
+        return count
+
+    async def lag_sampler(self, interval: float = 0.01) -> None:
+        while True:
+            expected = time.monotonic() + interval
+            await asyncio.sleep(interval)
+            self.lags.append(max(0.0, time.monotonic() - expected))
+
+    async def run_step(
+        self, rate: float, duration: float, broadcasts: int, drain: float
+    ) -> Dict[str, Any]:
+        """
+        Replays traffic at one target rate.
+
+        Args:
+            rate (float): Target arrivals per second.
+            duration (float): Seconds of traffic to generate.
+            broadcasts (int): Broadcast commands issued at the start of the step.
+            drain (float): Seconds to wait for the backlog after the last arrival.
+
+        Returns:
+            Dict[str, Any]: Throughput, latency, backlog and lag figures.
+        """
+        self.latencies.clear()
+        self.lags.clear()
+        self.errors, self.dropped, self.max_depth = 0, 0, 0
+
+        tasks = [asyncio.create_task(self.worker()) for _ in range(self.workers)]
+        tasks.append(asyncio.create_task(self.lag_sampler()))
+        for _ in range(broadcasts):
+            label, update = self.broadcast()
+            self.queue.put_nowait((time.monotonic(), label, update))
+
+        started = time.monotonic()
+        enqueued = await self.producer(rate, duration) + broadcasts
+        backlog = self.queue.qsize()
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=drain)
+        except asyncio.TimeoutError:
+            pass
+        elapsed = time.monotonic() - started
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        broadcast_manager.is_running = False
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.queue.task_done()
+
+        completed = sum(len(samples) for samples in self.latencies.values())
+        every = [sample for samples in self.latencies.values() for sample in samples]
+        return {
+            "target_rate": rate,
+            "enqueued": enqueued,
+            "dropped": self.dropped,
+            "completed": completed,
+            "throughput": round(completed / elapsed, 2),
+            "backlog_at_end": backlog,
+            "max_queue_depth": self.max_depth,
+            "errors": self.errors,
+            "saturated": backlog > rate * 0.5 or completed < enqueued,
+            "latency_ms": {
+                label: latency_summary(samples)
+                for label, samples in [("all", every), *self.latencies.items()]
+            },
+            "loop_lag_ms": latency_summary(self.lags),
+        }
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(samples),
+        "p50": round(percentile(samples, 0.50) * 1000, 3),
+        "p95": round(percentile(samples, 0.95) * 1000, 3),
+        "p99": round(percentile(samples, 0.99) * 1000, 3),
+        "max": round(max(samples, default=0.0) * 1000, 3),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m bench.replay",
+        description="Replays synthetic updates through the plugin handlers at rising rates.",
+    )
+    parser.add_argument("--rates", type=float, nargs="+", default=[50, 100, 200, 400])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--drain", type=float, default=10.0)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--fs-chats", type=int, default=2)
+    parser.add_argument("--joined-ratio", type=float, default=0.8)
+    parser.add_argument("--batch-size", type=int, default=5)
+    parser.add_argument("--storm-size", type=int, default=5)
+    parser.add_argument("--broadcasts", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=config.WORKERS or Client.WORKERS)
+    parser.add_argument("--api-latency", type=float, default=0.05)
+    parser.add_argument("--api-jitter", type=float, default=0.02)
+    parser.add_argument("--db-latency", type=float, default=0.002)
+    parser.add_argument("--flood-rate", type=float, default=0.0)
+    parser.add_argument("--output", default="replay.json")
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    client = FakeClient(
+        latency=args.api_latency,
+        jitter=args.api_jitter,
+        flood_rate=args.flood_rate,
+        flood_value=1,
+        seed=0,
+    )
+    await setup_offline(
+        client,
+        users=args.users,
+        fs_chats=args.fs_chats,
+        joined_ratio=args.joined_ratio,
+        db_latency=args.db_latency,
+        seed=0,
+    )
+    replay = Replay(client, args.users, args.workers, args.batch_size, args.storm_size)
+
+    steps = []
+    for rate in args.rates:
+        step = await replay.run_step(rate, args.duration, args.broadcasts, args.drain)
+        steps.append(step)
+        overall, lag = step["latency_ms"]["all"], step["loop_lag_ms"]
+        print(
+            f"{rate:>8.0f}/s  done {step['throughput']:>8.1f}/s  "
+            f"p50 {overall['p50']:>8.1f}  p95 {overall['p95']:>8.1f}  "
+            f"p99 {overall['p99']:>8.1f} ms  backlog {step['backlog_at_end']:>6}  "
+            f"lag p99 {lag['p99']:>6.1f} ms"
+            + ("  SATURATED" if step["saturated"] else "")
+        )
+
+    database.latency = 0.0
+    return steps
+
+
+def main() -> None:
+    args = parse_args()
+    logging.getLogger().setLevel(logging.ERROR)
+
+    steps = asyncio.run(run(args))
+    sustained = [step["target_rate"] for step in steps if not step["saturated"]]
+    with open(args.output, mode="w", encoding="utf-8") as doc:
+        json.dump({"params": vars(args), "steps": steps}, doc, indent=2)
+
+    print(f"\nSustained: {max(sustained, default=0):.0f} updates/s")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
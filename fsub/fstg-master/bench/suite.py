@@ -0,0 +1,230 @@
+import random
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from bot import cache, config, decode_data, join_buttons, url_safe
+from plugins.broadcast import BroadcastManager
+from plugins.start import start_handler
+
+from .fake import FakeClient, FakeMessage, FakeUser
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    Returns the nearest-rank percentile of a list of samples.
+
+    Args:
+        samples (List[float]): The samples, in any order.
+        fraction (float): The percentile as a fraction, e.g. 0.95.
+
+    Returns:
+        float: The percentile, or 0.0 if there are no samples.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(
+    name: str, samples_ns: List[int], seconds: float, peak_bytes: Optional[int]
+) -> Dict[str, Any]:
+    """
+    Builds the result record of one benchmark.
+
+    Args:
+        name (str): The benchmark name.
+        samples_ns (List[int]): Per-operation latencies in nanoseconds.
+        seconds (float): The wall time of the whole run.
+        peak_bytes (Optional[int]): The traced memory peak, if measured.
+
+    Returns:
+        Dict[str, Any]: Throughput, latency percentiles and peak memory.
+    """
+    samples_ms = [sample / 1e6 for sample in samples_ns]
+    return {
+        "name": name,
+        "ops": len(samples_ms),
+        "seconds": round(seconds, 6),
+        "throughput": round(len(samples_ms) / seconds, 2) if seconds else 0.0,
+        "p50_ms": round(percentile(samples_ms, 0.50), 4),
+        "p95_ms": round(percentile(samples_ms, 0.95), 4),
+        "p99_ms": round(percentile(samples_ms, 0.99), 4),
+        "max_ms": round(max(samples_ms, default=0.0), 4),
+        "peak_bytes": peak_bytes,
+    }
+
+
+async def measure(
+    name: str,
+    operation: Callable[[int], Awaitable[Any]],
+    iterations: int,
+    trace_memory: bool,
+) -> Dict[str, Any]:
+    """
+    Times an async operation repeatedly.
+
+    Args:
+        name (str): The benchmark name.
+        operation (Callable): Called with the iteration number.
+        iterations (int): The number of calls.
+        trace_memory (bool): Whether to record the traced memory peak.
+
+    Returns:
+        Dict[str, Any]: The result record.
+    """
+    if trace_memory:
+        tracemalloc.start()
+
+    samples: List[int] = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter_ns()
+        await operation(i)
+        samples.append(time.perf_counter_ns() - t0)
+    seconds = time.perf_counter() - started
+
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return summarize(name, samples, seconds, peak)
+
+
+def encode_payload(batch_size: int) -> str:
+    """
+    Builds a `/start` payload covering `batch_size` storage messages.
+
+    Args:
+        batch_size (int): The number of messages in the link.
+
+    Returns:
+        str: The encoded payload, as produced by /batch and the generator.
+    """
+    factor = abs(config.DATABASE_CHAT_ID)
+    if batch_size <= 1:
+        return url_safe.encode_data(f"id-{factor}")
+    return url_safe.encode_data(f"id-{factor}-{batch_size * factor}")
+
+
+async def bench_user_is_not_join(
+    client: FakeClient, users: int, iterations: int, trace_memory: bool
+) -> Dict[str, Any]:
+    """
+    Checks the membership of random users against every F-Sub chat.
+    """
+    rng = random.Random(0)
+
+    async def operation(_: int) -> None:
+        await cache.user_is_not_join(1000 + rng.randrange(users))
+
+    return await measure("cache.user_is_not_join", operation, iterations, trace_memory)
+
+
+async def bench_join_buttons(
+    client: FakeClient, users: int, iterations: int, trace_memory: bool
+) -> Dict[str, Any]:
+    """
+    Builds the join keyboard for random users.
+    """
+    rng = random.Random(0)
+    message = FakeMessage(client, 1, 1, f"/start {encode_payload(1)}")
+
+    async def operation(_: int) -> None:
+        await join_buttons(client, message, 1000 + rng.randrange(users))
+
+    return await measure("join_buttons", operation, iterations, trace_memory)
+
+
+async def bench_decode_data(
+    batch_size: int, iterations: int, trace_memory: bool
+) -> Dict[str, Any]:
+    """
+    Decodes a `/start` payload into storage message IDs.
+    """
+    payload = encode_payload(batch_size)
+
+    async def operation(_: int) -> None:
+        list(decode_data(payload))
+
+    return await measure("decode_data", operation, iterations, trace_memory)
+
+
+async def bench_url_safe(iterations: int, trace_memory: bool) -> Dict[str, Any]:
+    """
+    Encodes and decodes single-message payloads.
+    """
+    factor = abs(config.DATABASE_CHAT_ID)
+
+    async def operation(i: int) -> None:
+        url_safe.decode_data(url_safe.encode_data(f"id-{i * factor}"))
+
+    return await measure("url_safe.roundtrip", operation, iterations, trace_memory)
+
+
+async def bench_start_handler(
+    client: FakeClient,
+    users: int,
+    batch_size: int,
+    iterations: int,
+    trace_memory: bool,
+    payload: bool,
+) -> Dict[str, Any]:
+    """
+    Runs `/start` for random users, with or without a content payload.
+    """
+    rng = random.Random(0)
+    text = f"/start {encode_payload(batch_size)}" if payload else "/start"
+
+    async def operation(i: int) -> None:
+        user = FakeUser(1000 + rng.randrange(users), "Bench", "User")
+        message = FakeMessage(client, i, user.id, text, from_user=user)
+        await start_handler(client, message)
+
+    name = "start_handler.payload" if payload else "start_handler.plain"
+    return await measure(name, operation, iterations, trace_memory)
+
+
+async def bench_broadcast(client: FakeClient, trace_memory: bool) -> Dict[str, Any]:
+    """
+    Runs one full broadcast to every user; latency samples are the gaps
+    between consecutive copies.
+    """
+    manager = BroadcastManager()
+    owner = FakeUser(config.OWNER_ID)
+    command = FakeMessage(client, 1, owner.id, "/broadcast", from_user=owner)
+    broadcast_msg = client.new_message(owner.id, "Benchmark")
+
+    samples: List[int] = []
+    copy_message = client.copy_message
+    last = time.perf_counter_ns()
+
+    async def timed_copy(*args: Any, **kwargs: Any) -> FakeMessage:
+        nonlocal last
+        try:
+            return await copy_message(*args, **kwargs)
+        finally:
+            now = time.perf_counter_ns()
+            samples.append(now - last)
+            last = now
+
+    client.copy_message = timed_copy
+    if trace_memory:
+        tracemalloc.start()
+
+    started = time.perf_counter()
+    last = time.perf_counter_ns()
+    try:
+        await manager.start_broadcast(client, command, broadcast_msg)
+    finally:
+        client.copy_message = copy_message
+
+    seconds = time.perf_counter() - started
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return summarize("broadcast", samples, seconds, peak)
@@ -2,23 +2,56 @@ from .base import BotError, bot, database
 from .db_funcs import (
     add_admin,
     add_broadcast_data_id,
+    add_clone,
     add_fs_chat,
     add_user,
     del_admin,
     del_broadcast_data_id,
+    del_clone,
     del_fs_chat,
     del_user,
     get_broadcast_data_ids,
+    get_clones,
+    get_setting,
     get_users,
     initial_database,
+    set_setting,
+    unwrap_value,
     update_force_text_msg,
     update_generate_status,
     update_protect_content,
     update_start_text_msg,
 )
-from .filters import filter_authorized, filter_broadcast
-from .helpers import admin_buttons, button, cache, join_buttons
-from .utils import aiofiles_read, config, decode_data, logger, url_safe
+from .filters import filter_authorized, filter_broadcast, filter_main_bot
+from .helpers import (
+    admin_buttons,
+    button,
+    cache,
+    clones,
+    deferred,
+    fs_chats_buttons,
+    join_buttons,
+    latency,
+    prefetch,
+    throttle,
+)
+from .utils import (
+    LOG_FILE,
+    LOG_LEVELS,
+    Template,
+    aiofiles_read,
+    calls,
+    config,
+    current_bot,
+    decode_data,
+    logger,
+    metrics,
+    per_bot,
+    profiler,
+    search_logs,
+    url_safe,
+    watchdog,
+)
 
 __all__ = [
     "BotError",
@@ -26,28 +59,51 @@ __all__ = [
     "database",
     "add_admin",
     "add_broadcast_data_id",
+    "add_clone",
     "add_fs_chat",
     "add_user",
     "del_admin",
     "del_broadcast_data_id",
+    "del_clone",
     "del_fs_chat",
     "del_user",
     "get_broadcast_data_ids",
+    "get_clones",
+    "get_setting",
     "get_users",
     "initial_database",
+    "set_setting",
+    "unwrap_value",
     "update_force_text_msg",
     "update_generate_status",
     "update_protect_content",
     "update_start_text_msg",
     "filter_authorized",
     "filter_broadcast",
+    "filter_main_bot",
     "admin_buttons",
     "button",
     "cache",
+    "clones",
+    "deferred",
+    "fs_chats_buttons",
     "join_buttons",
+    "latency",
+    "prefetch",
+    "throttle",
     "aiofiles_read",
+    "calls",
     "config",
+    "current_bot",
     "decode_data",
+    "LOG_FILE",
+    "LOG_LEVELS",
     "logger",
+    "metrics",
+    "per_bot",
+    "profiler",
+    "search_logs",
+    "Template",
     "url_safe",
+    "watchdog",
 ]
@@ -1,5 +1,6 @@
 from .client import bot
+from .database import Database, database
 from .exception import BotError
-from .mongo import database
+from .queue import UpdateQueue
 
-__all__ = ["bot", "BotError", "database"]
+__all__ = ["bot", "BotError", "Database", "database", "UpdateQueue"]
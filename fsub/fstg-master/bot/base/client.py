@@ -1,12 +1,21 @@
-from hydrogram import Client
+import asyncio
+import hashlib
+import time
+from typing import Any, List, Optional, Tuple
+
+from hydrogram import Client, ContinuePropagation, StopPropagation
 from hydrogram.enums import ParseMode
-from hydrogram.errors import RPCError
-from hydrogram.types import BotCommand, BotCommandScopeAllPrivateChats
+from hydrogram.errors import FloodWait, RPCError
+from hydrogram.handlers.handler import Handler
+from hydrogram.raw.core import TLObject
+from hydrogram.session import Session
+from hydrogram.types import BotCommand, BotCommandScopeAllPrivateChats, ListenerTypes
 
-from bot.utils import config, logger
+from bot.utils import calls, config, current_handler, logger, metrics, per_bot, watchdog
 
+from .database import database
 from .exception import BotError
-from .mongo import database
+from .queue import UpdateQueue
 
 
 class Bot(Client):
@@ -15,15 +24,41 @@ class Bot(Client):
 
     Methods:
         start() -> None:
-            Starts the bot and connects to MongoDB.
+            Starts the bot and connects to the database concurrently.
+
+        start_client() -> None:
+            Starts the Telegram client alone, as done for clone bots.
 
         stop() -> None:
-            Stops the bot and closes the MongoDB connection.
+            Stops the bot and closes the database connection.
 
-        bot_commands_setup() -> None:
+        stop_client() -> None:
+            Stops the Telegram client alone.
+
+        bot_commands_setup() -> bool:
             Sets up bot commands for users.
+
+        commands_digest() -> str:
+            Fingerprints the command set.
+
+        listening(user_id: int) -> bool:
+            Checks whether a conversation waits for a user's next message.
+
+        add_handler(handler: Handler, group: int) -> Tuple[Handler, int]:
+            Registers a handler, recording its latency and errors.
+
+        invoke(query: TLObject, ...) -> TLObject:
+            Calls a raw Telegram method, accounting for it in the metrics and
+            the rolling call statistics.
     """
 
+    COMMANDS: List[BotCommand] = [
+        BotCommand("start", "Start Bot"),
+        BotCommand("ping", "Server Latency"),
+        BotCommand("uptime", "Bot Uptime"),
+        BotCommand("privacy", "Privacy Policy"),
+    ]
+
     def __init__(self) -> None:
         """
         Initializes the Bot instance with required configurations.
@@ -35,28 +70,58 @@ class Bot(Client):
             bot_token=str(config.BOT_TOKEN),
             workdir="sessions",
             plugins={"root": "plugins"},
+            workers=config.WORKERS or Client.WORKERS,
+        )
+        self.metrics_server: Optional[asyncio.AbstractServer] = None
+        self.updates = self.dispatcher.updates_queue = UpdateQueue(
+            per_user=config.USER_QUEUE_SIZE
         )
+        self.updates.bypass = self.listening
 
     async def start(self) -> None:
         """
-        Starts the bot, connecting to MongoDB and setting up commands.
-        """
-        logger.info("MongoDB: Connecting...")
-        await database.connect()
+        Starts the bot and connects to the database, both at once.
 
+        Bot commands are set up separately, see `bot_commands_setup`.
+        """
+        logger.info(f"{database.name}: Connecting...")
         logger.info("Bot: Starting...")
+        await asyncio.gather(database.connect(), self.start_client())
+
+        watchdog.start()
+
+        if config.METRICS_PORT:
+            self.metrics_server = await metrics.serve(
+                config.METRICS_HOST, config.METRICS_PORT
+            )
+
+    async def start_client(self) -> None:
+        """
+        Starts the Telegram client.
+        """
         try:
             await super().start()
             logger.info("Bot: Started")
         except RPCError as rpc:
             raise BotError(str(rpc.MESSAGE))
 
-        await self.bot_commands_setup()
         self.set_parse_mode(ParseMode.HTML)
 
     async def stop(self) -> None:
         """
-        Stops the bot and closes the MongoDB connection.
+        Stops the bot and closes the database connection.
+        """
+        if self.metrics_server:
+            self.metrics_server.close()
+        watchdog.stop()
+        await self.stop_client()
+
+        logger.info(f"{database.name}: Closing...")
+        await database.close()
+
+    async def stop_client(self) -> None:
+        """
+        Stops the Telegram client.
         """
         logger.info("Bot: Stopping...")
         try:
@@ -66,27 +131,145 @@ class Bot(Client):
         else:
             logger.info("Bot: Stopped")
 
-        logger.info("MongoDB: Closing...")
-        await database.close()
-
-    async def bot_commands_setup(self) -> None:
+    async def bot_commands_setup(self) -> bool:
         """
         Sets up the bot commands for user interaction.
+
+        Returns:
+            bool: True if the commands were set.
         """
-        await self.delete_bot_commands()
         try:
+            await self.delete_bot_commands()
             await self.set_bot_commands(
-                commands=[
-                    BotCommand("start", "Start Bot"),
-                    BotCommand("ping", "Server Latency"),
-                    BotCommand("uptime", "Bot Uptime"),
-                    BotCommand("privacy", "Privacy Policy"),
-                ],
-                scope=BotCommandScopeAllPrivateChats(),
+                commands=self.COMMANDS, scope=BotCommandScopeAllPrivateChats()
             )
+            return True
         except RPCError:
-            pass
+            return False
+
+    def commands_digest(self) -> str:
+        """
+        Fingerprints the command set, to skip setting it up again unchanged.
+
+        Returns:
+            str: A hex digest of the commands and descriptions.
+        """
+        commands = "\n".join(f"{c.command} {c.description}" for c in self.COMMANDS)
+        return hashlib.sha256(commands.encode()).hexdigest()[:16]
+
+    def listening(self, user_id: int) -> bool:
+        """
+        Checks whether a conversation waits for the next message of a user,
+        which must then not queue behind the handler waiting for it.
+
+        Args:
+            user_id (int): The user to check.
+
+        Returns:
+            bool: True if a message listener may match the user.
+        """
+        for listener in self.listeners[ListenerTypes.MESSAGE]:
+            user_ids = listener.identifier.from_user_id
+            if user_ids is None or user_id == user_ids:
+                return True
+            if isinstance(user_ids, list) and user_id in user_ids:
+                return True
+        return False
+
+    def add_handler(self, handler: Handler, group: int = 0) -> Tuple[Handler, int]:
+        """
+        Registers a handler, wrapping its callback to record latency and errors,
+        to attribute the API calls it makes and to report it when slow.
+
+        Plugin handlers are shared by the main bot and its clones, so a
+        callback is wrapped only by the first client registering it.
+
+        Args:
+            handler (Handler): The handler to register.
+            group (int): The handler group.
+
+        Returns:
+            Tuple[Handler, int]: The handler and its group.
+        """
+        if getattr(handler, "_fsub_wrapped", False):
+            return super().add_handler(handler, group)
+
+        name = getattr(handler, "original_callback", handler.callback).__name__
+        callback = handler.callback
+
+        async def attributed(client: Client, *args: Any) -> Any:
+            token = current_handler.set(name)
+            try:
+                with watchdog.track(name, args[0] if args else None):
+                    return await callback(client, *args)
+            finally:
+                current_handler.reset(token)
+
+        handler.callback = metrics.timed(
+            attributed,
+            "fsub_handler",
+            ignore=(StopPropagation, ContinuePropagation),
+            handler=name,
+        )
+        handler._fsub_wrapped = True
+        return super().add_handler(handler, group)
+
+    async def invoke(
+        self,
+        query: TLObject,
+        retries: int = Session.MAX_RETRIES,
+        timeout: float = Session.WAIT_TIMEOUT,
+        sleep_threshold: Optional[float] = None,
+    ) -> TLObject:
+        """
+        Calls a raw Telegram method, recording its latency, errors and
+        FloodWaits in the metrics and the rolling call statistics.
+
+        Recording is optional: unless `API_STATS_WINDOW` or `METRICS_PORT` is
+        set, the call goes straight to the session. Otherwise FloodWaits within
+        the sleep threshold are slept here instead of inside the session, so
+        that both their number and the time spent are counted.
+
+        Args:
+            query (TLObject): The raw function to call.
+            retries (int): Number of retries.
+            timeout (float): Timeout in seconds.
+            sleep_threshold (Optional[float]): FloodWaits up to this many
+                seconds are slept and retried; defaults to the client's.
+
+        Returns:
+            TLObject: The raw result.
+        """
+        if not (calls.window or config.METRICS_PORT):
+            return await super().invoke(query, retries, timeout, sleep_threshold)
+
+        method = type(query).__name__
+        threshold = self.sleep_threshold if sleep_threshold is None else sleep_threshold
+        while True:
+            started = time.perf_counter()
+            error, flood_wait = None, None
+            try:
+                return await super().invoke(query, retries, timeout, 0)
+            except FloodWait as fw:
+                error, flood_wait = "FloodWait", fw.value
+                metrics.inc("fsub_telegram_flood_waits_total", method=method)
+                if flood_wait > threshold:
+                    raise
+            except Exception as exc:
+                error = type(exc).__name__
+                metrics.inc("fsub_telegram_errors_total", method=method, error=error)
+                raise
+            finally:
+                seconds = time.perf_counter() - started
+                metrics.observe("fsub_telegram_seconds", seconds, method=method)
+                calls.record(method, seconds, error, flood_wait)
+
+            logger.warning(f"FloodWait: Sleep {flood_wait} ({method})")
+            metrics.inc(
+                "fsub_flood_wait_sleep_seconds_total", flood_wait, source="client"
+            )
+            await asyncio.sleep(flood_wait)
 
 
-# Instantiate the bot
-bot: Bot = Bot()
+# Instantiate the bot, once per hosted bot
+bot: Bot = per_bot(Bot)
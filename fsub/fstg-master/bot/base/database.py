@@ -0,0 +1,211 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional
+
+from bot.utils import config, metrics
+
+
+class Database(ABC):
+    """
+    The storage interface shared by every database backend.
+
+    Data is organized as one document per bot, addressed by the bot ID, plus
+    the users of each bot. Document fields are either scalars or lists with
+    set semantics.
+
+    Attributes:
+        name (str): The backend name used in logs.
+
+    Methods:
+        connect() -> None:
+            Establishes a connection to the storage.
+
+        close() -> None:
+            Closes the storage connection.
+
+        ping() -> None:
+            Makes one round trip to the storage.
+
+        create_indexes() -> None:
+            Creates the indexes required by the storage layout.
+
+        list_docs() -> List[int]:
+            Lists all document IDs.
+
+        get_doc(_id: int) -> Optional[Dict[str, Any]]:
+            Retrieves a document by its ID.
+
+        get_slice(_id: int, key: str, skip: int, limit: int) -> List[Any]:
+            Retrieves part of a document's list field.
+
+        add_value(_id: int, key: str, value: Any) -> None:
+            Adds a value to a document's list field.
+
+        set_value(_id: int, key: str, value: Any) -> Any:
+            Sets a scalar field in a document.
+
+        toggle_value(_id: int, key: str) -> bool:
+            Atomically negates a boolean field in a document.
+
+        fill_defaults(_id: int, defaults: Dict[str, Any], version: int) -> Optional[Dict[str, Any]]:
+            Fills missing fields of a document in a single upsert.
+
+        set_fields(_id: int, fields: Dict[str, Any], unset: Iterable[str]) -> None:
+            Sets and clears several fields in a single update.
+
+        unwrap_values(_id: int, keys: Iterable[str]) -> None:
+            Replaces legacy one-element array fields with their element.
+
+        del_value(_id: int, key: str, value: Any) -> None:
+            Removes a value from a document's list field.
+
+        clear_value(_id: int, key: str) -> None:
+            Clears a field in a document.
+
+        del_doc(_id: int) -> None:
+            Deletes a document by its ID.
+
+        add_user(_id: int, user_id: int) -> None:
+            Adds a user to a bot.
+
+        add_users(_id: int, user_ids: List[int]) -> None:
+            Adds many users to a bot in one bulk write.
+
+        del_user(_id: int, user_id: int) -> None:
+            Removes a user from a bot.
+
+        list_users(_id: int) -> List[int]:
+            Lists the user IDs of a bot.
+
+        instrument() -> Database:
+            Records the latency and errors of every data operation.
+    """
+
+    name: str = "Database"
+
+    @abstractmethod
+    async def connect(self) -> None:
+        """Establishes a connection to the storage."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Closes the storage connection."""
+
+    @abstractmethod
+    async def ping(self) -> None:
+        """Makes one round trip to the storage."""
+
+    @abstractmethod
+    async def create_indexes(self) -> None:
+        """Creates the indexes required by the storage layout."""
+
+    @abstractmethod
+    async def list_docs(self) -> List[int]:
+        """Lists all document IDs."""
+
+    @abstractmethod
+    async def get_doc(self, _id: int) -> Optional[Dict[str, Any]]:
+        """Retrieves a document by its ID."""
+
+    @abstractmethod
+    async def get_slice(self, _id: int, key: str, skip: int, limit: int) -> List[Any]:
+        """Retrieves part of a document's list field."""
+
+    @abstractmethod
+    async def add_value(self, _id: int, key: str, value: Any) -> None:
+        """Adds a value to a document's list field."""
+
+    @abstractmethod
+    async def set_value(self, _id: int, key: str, value: Any) -> Any:
+        """Sets a scalar field in a document."""
+
+    @abstractmethod
+    async def toggle_value(self, _id: int, key: str) -> bool:
+        """Atomically negates a boolean field in a document."""
+
+    @abstractmethod
+    async def fill_defaults(
+        self, _id: int, defaults: Dict[str, Any], version: int
+    ) -> Optional[Dict[str, Any]]:
+        """Fills missing fields of a document in a single upsert."""
+
+    @abstractmethod
+    async def set_fields(
+        self, _id: int, fields: Dict[str, Any], unset: Iterable[str] = ()
+    ) -> None:
+        """Sets and clears several fields in a single update."""
+
+    @abstractmethod
+    async def unwrap_values(self, _id: int, keys: Iterable[str]) -> None:
+        """Replaces legacy one-element array fields with their element."""
+
+    @abstractmethod
+    async def del_value(self, _id: int, key: str, value: Any) -> None:
+        """Removes a value from a document's list field."""
+
+    @abstractmethod
+    async def clear_value(self, _id: int, key: str) -> None:
+        """Clears a field in a document."""
+
+    @abstractmethod
+    async def del_doc(self, _id: int) -> None:
+        """Deletes a document by its ID."""
+
+    @abstractmethod
+    async def add_user(self, _id: int, user_id: int) -> None:
+        """Adds a user to a bot."""
+
+    @abstractmethod
+    async def add_users(self, _id: int, user_ids: List[int]) -> None:
+        """Adds many users to a bot in one bulk write."""
+
+    @abstractmethod
+    async def del_user(self, _id: int, user_id: int) -> None:
+        """Removes a user from a bot."""
+
+    @abstractmethod
+    async def list_users(self, _id: int) -> List[int]:
+        """Lists the user IDs of a bot."""
+
+    def instrument(self) -> "Database":
+        """
+        Wraps every data operation of this instance to record its latency and
+        errors in the metrics registry, labelled by backend and operation.
+
+        Returns:
+            Database: The same instance.
+        """
+        for op in sorted(Database.__abstractmethods__ - {"connect", "close"}):
+            timed = metrics.timed(
+                getattr(self, op), "fsub_database", backend=self.name, op=op
+            )
+            setattr(self, op, timed)
+
+        return self
+
+
+def create_database() -> Database:
+    """
+    Creates the database backend selected by the configuration.
+
+    Backend modules are imported lazily, so only the driver of the selected
+    backend has to be installed.
+
+    Returns:
+        Database: The backend instance, not yet connected.
+    """
+    if config.DATABASE_BACKEND == "sqlite":
+        from .sqlite import SQLiteDatabase
+
+        return SQLiteDatabase(config.SQLITE_PATH)
+
+    if config.DATABASE_BACKEND == "memory":
+        from .memory import MemoryDatabase
+
+        return MemoryDatabase()
+
+    from .mongo import MongoDatabase
+
+    return MongoDatabase()
+
+
+database: Database = create_database().instrument()
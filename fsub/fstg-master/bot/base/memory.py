@@ -0,0 +1,269 @@
+import asyncio
+import copy
+from typing import Any, Dict, Iterable, List, Optional
+
+from bot.utils import logger
+
+from .database import Database
+
+
+class MemoryDatabase(Database):
+    """
+    A class keeping all data in process memory, for offline benchmarking.
+
+    Every operation yields to the event loop, optionally after a configurable
+    delay that emulates a network round trip. Nothing is persisted.
+
+    Attributes:
+        latency (float): Seconds slept by every operation.
+        docs (Dict[int, Dict[str, Any]]): The documents keyed by ID.
+        users (Dict[int, Dict[int, None]]): The users of each bot, in insertion order.
+    """
+
+    name: str = "Memory"
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """
+        Initializes the MemoryDatabase instance with empty storage.
+
+        Args:
+            latency (float): Seconds slept by every operation.
+        """
+        self.latency: float = latency
+        self.docs: Dict[int, Dict[str, Any]] = {}
+        self.users: Dict[int, Dict[int, None]] = {}
+
+    async def round_trip(self) -> None:
+        """Emulates the delay of a database round trip."""
+        await asyncio.sleep(self.latency)
+
+    async def connect(self) -> None:
+        """Nothing to connect to."""
+        logger.info("Memory: Connected")
+
+    async def close(self) -> None:
+        """Nothing to close; the data stays until the process exits."""
+        logger.info("Memory: Closed")
+
+    async def ping(self) -> None:
+        """Emulates a round trip."""
+        await self.round_trip()
+
+    async def create_indexes(self) -> None:
+        """Dictionaries need no indexes."""
+        await self.round_trip()
+
+    async def list_docs(self) -> List[int]:
+        """Lists all document IDs.
+
+        Returns:
+            List[int]: A list of document IDs.
+        """
+        await self.round_trip()
+        return list(self.docs)
+
+    async def get_doc(self, _id: int) -> Optional[Dict[str, Any]]:
+        """Retrieves a copy of a document by its ID.
+
+        Args:
+            _id (int): The ID of the document.
+
+        Returns:
+            Optional[Dict[str, Any]]: The document, if found.
+        """
+        await self.round_trip()
+        document = self.docs.get(_id)
+        return copy.deepcopy(document) if document is not None else None
+
+    async def get_slice(self, _id: int, key: str, skip: int, limit: int) -> List[Any]:
+        """Retrieves part of a document's list field.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The list field to read.
+            skip (int): The number of leading elements to skip.
+            limit (int): The maximum number of elements to return.
+
+        Returns:
+            List[Any]: The requested elements, empty if there are none.
+        """
+        await self.round_trip()
+        value = self.docs.get(_id, {}).get(key)
+        return list(value[skip : skip + limit]) if isinstance(value, list) else []
+
+    async def add_value(self, _id: int, key: str, value: Any) -> None:
+        """Adds a value to a document's list field if not already present.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field to which the value will be added.
+            value (Any): The value to be added.
+        """
+        await self.round_trip()
+        values = self.docs.setdefault(_id, {"_id": _id}).setdefault(key, [])
+        if value not in values:
+            values.append(value)
+
+    async def set_value(self, _id: int, key: str, value: Any) -> Any:
+        """Sets a scalar field in a document.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field to be set.
+            value (Any): The value to be stored.
+
+        Returns:
+            Any: The stored value.
+        """
+        await self.round_trip()
+        self.docs.setdefault(_id, {"_id": _id})[key] = copy.deepcopy(value)
+        return value
+
+    async def toggle_value(self, _id: int, key: str) -> bool:
+        """Negates a boolean field and returns the new value.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field to be toggled.
+
+        Returns:
+            bool: The value after toggling.
+        """
+        await self.round_trip()
+        document = self.docs.setdefault(_id, {"_id": _id})
+        value = document.get(key)
+        if isinstance(value, list):
+            value = value[0] if value else None
+
+        document[key] = not value
+        return document[key]
+
+    async def fill_defaults(
+        self, _id: int, defaults: Dict[str, Any], version: int
+    ) -> Optional[Dict[str, Any]]:
+        """Fills missing fields of a document.
+
+        Args:
+            _id (int): The ID of the document.
+            defaults (Dict[str, Any]): Field names mapped to default values.
+            version (int): The schema version of newly created documents.
+
+        Returns:
+            Optional[Dict[str, Any]]: The document before the update, or None
+                if it was just created.
+        """
+        await self.round_trip()
+        before = copy.deepcopy(self.docs.get(_id))
+        document = self.docs.setdefault(_id, {"_id": _id})
+        document.setdefault("SCHEMA_VERSION", version if before is None else 0)
+        for key, value in defaults.items():
+            document.setdefault(key, copy.deepcopy(value))
+
+        return before
+
+    async def set_fields(
+        self, _id: int, fields: Dict[str, Any], unset: Iterable[str] = ()
+    ) -> None:
+        """Sets and clears several fields at once.
+
+        Args:
+            _id (int): The ID of the document.
+            fields (Dict[str, Any]): Field names mapped to their new values.
+            unset (Iterable[str]): Field names to be cleared.
+        """
+        await self.round_trip()
+        document = self.docs.setdefault(_id, {"_id": _id})
+        document.update(copy.deepcopy(fields))
+        for key in unset:
+            document.pop(key, None)
+
+    async def unwrap_values(self, _id: int, keys: Iterable[str]) -> None:
+        """Replaces legacy one-element array fields with their element.
+
+        Args:
+            _id (int): The ID of the document.
+            keys (Iterable[str]): The fields to be unwrapped.
+        """
+        await self.round_trip()
+        document = self.docs.get(_id, {})
+        for key in keys:
+            value = document.get(key)
+            if isinstance(value, list):
+                if value:
+                    document[key] = value[0]
+                else:
+                    del document[key]
+
+    async def del_value(self, _id: int, key: str, value: Any) -> None:
+        """Removes a value from a document's list field.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field from which the value will be removed.
+            value (Any): The value to be removed.
+        """
+        await self.round_trip()
+        values = self.docs.get(_id, {}).get(key)
+        if isinstance(values, list) and value in values:
+            values.remove(value)
+
+    async def clear_value(self, _id: int, key: str) -> None:
+        """Clears a field in a document.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field to be cleared.
+        """
+        await self.round_trip()
+        self.docs.get(_id, {}).pop(key, None)
+
+    async def del_doc(self, _id: int) -> None:
+        """Deletes a document by its ID.
+
+        Args:
+            _id (int): The ID of the document.
+        """
+        await self.round_trip()
+        self.docs.pop(_id, None)
+
+    async def add_user(self, _id: int, user_id: int) -> None:
+        """Adds a user to a bot.
+
+        Args:
+            _id (int): The ID of the bot document.
+            user_id (int): The ID of the user.
+        """
+        await self.round_trip()
+        self.users.setdefault(_id, {})[user_id] = None
+
+    async def add_users(self, _id: int, user_ids: List[int]) -> None:
+        """Adds many users to a bot.
+
+        Args:
+            _id (int): The ID of the bot document.
+            user_ids (List[int]): The IDs of the users.
+        """
+        await self.round_trip()
+        self.users.setdefault(_id, {}).update(dict.fromkeys(user_ids))
+
+    async def del_user(self, _id: int, user_id: int) -> None:
+        """Removes a user from a bot.
+
+        Args:
+            _id (int): The ID of the bot document.
+            user_id (int): The ID of the user.
+        """
+        await self.round_trip()
+        self.users.get(_id, {}).pop(user_id, None)
+
+    async def list_users(self, _id: int) -> List[int]:
+        """Lists the user IDs of a bot.
+
+        Args:
+            _id (int): The ID of the bot document.
+
+        Returns:
+            List[int]: A list of user IDs.
+        """
+        await self.round_trip()
+        return list(self.users.get(_id, {}))
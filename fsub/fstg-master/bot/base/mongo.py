@@ -1,50 +1,31 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from async_pymongo import AsyncClient
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
 
 from bot.utils import config, logger
 
+from .database import Database
 from .exception import BotError
 
 
-class Database:
+class MongoDatabase(Database):
     """
     A class to manage MongoDB connections and operations.
 
     Attributes:
         client (Optional[AsyncClient]): The MongoDB client instance.
         db (Optional[Any]): The database instance.
-
-    Methods:
-        connect() -> None:
-            Establishes a connection to the MongoDB server.
-
-        close() -> None:
-            Closes the MongoDB connection.
-
-        list_docs() -> List[str]:
-            Lists all document IDs in the collection.
-
-        get_doc(_id: int) -> Optional[Dict[str, Any]]:
-            Retrieves a document by its ID.
-
-        add_value(_id: int, key: str, value: Any) -> None:
-            Adds a value to a document's list field.
-
-        del_value(_id: int, key: str, value: Any) -> None:
-            Removes a value from a document's list field.
-
-        clear_value(_id: int, key: str) -> None:
-            Clears a field in a document.
-
-        del_doc(_id: int) -> None:
-            Deletes a document by its ID.
+        users (Optional[Any]): The collection holding one document per bot user.
     """
 
+    name: str = "MongoDB"
+
     def __init__(self) -> None:
         """Initializes the Database instance with no active connection."""
         self.client: Optional[AsyncClient] = None
         self.db: Optional[Any] = None
+        self.users: Optional[Any] = None
 
     async def connect(self) -> None:
         """Establishes a connection to the MongoDB server."""
@@ -52,6 +33,7 @@ class Database:
             try:
                 self.client = AsyncClient(config.MONGODB_URL)
                 self.db = self.client["FSUB_DATABASE"]["COLLECTIONS"]
+                self.users = self.client["FSUB_DATABASE"]["USERS"]
                 logger.info("MongoDB: Connected")
             except Exception as exc:
                 raise BotError(str(exc))
@@ -62,15 +44,30 @@ class Database:
             await self.client.close()
             self.client = None
             self.db = None
+            self.users = None
             logger.info("MongoDB: Closed")
         else:
             logger.info("MongoDB: Already Closed")
 
-    async def list_docs(self) -> List[str]:
+    async def ping(self) -> None:
+        """Sends the ping command to the server."""
+        await self.client["admin"].command("ping")
+
+    async def create_indexes(self) -> None:
+        """Creates the indexes required by the storage layout.
+
+        Bot documents are only looked up by `_id`, which is always indexed.
+        Users are looked up by bot and deduplicated per bot.
+        """
+        await self.users.create_index(
+            [("bot_id", ASCENDING), ("user_id", ASCENDING)], unique=True
+        )
+
+    async def list_docs(self) -> List[int]:
         """Lists all document IDs in the collection.
 
         Returns:
-            List[str]: A list of document IDs.
+            List[int]: A list of document IDs.
         """
         pipeline = [{"$project": {"_id": 1}}]
         cursor = self.db.aggregate(pipeline)
@@ -88,6 +85,39 @@ class Database:
         document = await self.db.find_one({"_id": _id})
         return document
 
+    async def get_slice(self, _id: int, key: str, skip: int, limit: int) -> List[Any]:
+        """Retrieves part of a document's list field without reading the rest.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The list field to read.
+            skip (int): The number of leading elements to skip.
+            limit (int): The maximum number of elements to return.
+
+        Returns:
+            List[Any]: The requested elements, empty if there are none.
+        """
+        # A find projection with $slice still returns every other field
+        field = f"${key}"
+        pipeline = [
+            {"$match": {"_id": _id}},
+            {
+                "$project": {
+                    "_id": 0,
+                    key: {
+                        "$cond": [
+                            {"$isArray": field},
+                            {"$slice": [field, skip, limit]},
+                            [],
+                        ]
+                    },
+                }
+            },
+        ]
+        async for document in self.db.aggregate(pipeline):
+            return document[key]
+        return []
+
     async def add_value(self, _id: int, key: str, value: Any) -> None:
         """Adds a value to a document's list field.
 
@@ -98,6 +128,127 @@ class Database:
         """
         await self.db.update_one({"_id": _id}, {"$addToSet": {key: value}}, upsert=True)
 
+    async def set_value(self, _id: int, key: str, value: Any) -> Any:
+        """Sets a scalar field in a document, replacing any previous shape.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field to be set.
+            value (Any): The value to be stored.
+
+        Returns:
+            Any: The stored value.
+        """
+        await self.db.update_one({"_id": _id}, {"$set": {key: value}}, upsert=True)
+        return value
+
+    async def toggle_value(self, _id: int, key: str) -> bool:
+        """Atomically negates a boolean field and returns the new value.
+
+        A legacy one-element array is unwrapped before negation, so the field
+        is always stored as a scalar afterwards. A missing field counts as False.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field to be toggled.
+
+        Returns:
+            bool: The value after toggling.
+        """
+        field = f"${key}"
+        current = {"$cond": [{"$isArray": field}, {"$arrayElemAt": [field, 0]}, field]}
+        document = await self.db.find_one_and_update(
+            {"_id": _id},
+            [{"$set": {key: {"$not": [current]}}}],
+            projection={key: 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return bool(document[key])
+
+    async def fill_defaults(
+        self, _id: int, defaults: Dict[str, Any], version: int
+    ) -> Optional[Dict[str, Any]]:
+        """Fills missing fields of a document in a conditional upsert.
+
+        Existing fields are never overwritten, so MongoDB performs no write at
+        all when every field is already present. A document that did not
+        exist then gets `SCHEMA_VERSION` set to `version` in a second update;
+        an existing document without one is marked as version 0 (the legacy
+        shape), whichever fields it has.
+
+        Args:
+            _id (int): The ID of the document.
+            defaults (Dict[str, Any]): Field names mapped to default values.
+            version (int): The schema version of newly created documents.
+
+        Returns:
+            Optional[Dict[str, Any]]: The document before the update, or None
+                if it was just created.
+        """
+        pipeline = [
+            {"$set": {"SCHEMA_VERSION": {"$ifNull": ["$SCHEMA_VERSION", 0]}}},
+            {
+                "$set": {
+                    key: {"$ifNull": [f"${key}", {"$literal": value}]}
+                    for key, value in defaults.items()
+                }
+            },
+        ]
+        document = await self.db.find_one_and_update(
+            {"_id": _id},
+            pipeline,
+            upsert=True,
+            return_document=ReturnDocument.BEFORE,
+        )
+        # A pipeline update cannot tell an insert apart, unlike $setOnInsert
+        if document is None:
+            await self.db.update_one(
+                {"_id": _id}, {"$set": {"SCHEMA_VERSION": version}}
+            )
+        return document
+
+    async def set_fields(
+        self, _id: int, fields: Dict[str, Any], unset: Iterable[str] = ()
+    ) -> None:
+        """Sets and clears several fields in a single update.
+
+        Args:
+            _id (int): The ID of the document.
+            fields (Dict[str, Any]): Field names mapped to their new values.
+            unset (Iterable[str]): Field names to be cleared.
+        """
+        update: Dict[str, Dict[str, Any]] = {}
+        if fields:
+            update["$set"] = fields
+        if unset:
+            update["$unset"] = {key: "" for key in unset}
+        if update:
+            await self.db.update_one({"_id": _id}, update, upsert=True)
+
+    async def unwrap_values(self, _id: int, keys: Iterable[str]) -> None:
+        """Replaces legacy one-element array fields with their element.
+
+        Empty arrays are removed, scalar fields are left untouched.
+
+        Args:
+            _id (int): The ID of the document.
+            keys (Iterable[str]): The fields to be unwrapped.
+        """
+        unwrapped = {}
+        for key in keys:
+            field = f"${key}"
+            first = {
+                "$cond": [
+                    {"$gt": [{"$size": field}, 0]},
+                    {"$arrayElemAt": [field, 0]},
+                    "$$REMOVE",
+                ]
+            }
+            unwrapped[key] = {"$cond": [{"$isArray": field}, first, field]}
+
+        await self.db.update_one({"_id": _id}, [{"$set": unwrapped}])
+
     async def del_value(self, _id: int, key: str, value: Any) -> None:
         """Removes a value from a document's list field.
 
@@ -125,5 +276,48 @@ class Database:
         """
         await self.db.delete_one({"_id": _id})
 
+    async def add_user(self, _id: int, user_id: int) -> None:
+        """Adds a user to a bot.
 
-database: Database = Database()
+        Args:
+            _id (int): The ID of the bot document.
+            user_id (int): The ID of the user.
+        """
+        user = {"bot_id": _id, "user_id": user_id}
+        await self.users.update_one(user, {"$setOnInsert": user}, upsert=True)
+
+    async def add_users(self, _id: int, user_ids: List[int]) -> None:
+        """Adds many users to a bot in one unordered bulk write.
+
+        Args:
+            _id (int): The ID of the bot document.
+            user_ids (List[int]): The IDs of the users.
+        """
+        requests = []
+        for user_id in user_ids:
+            user = {"bot_id": _id, "user_id": user_id}
+            requests.append(UpdateOne(user, {"$setOnInsert": user}, upsert=True))
+
+        if requests:
+            await self.users.bulk_write(requests, ordered=False)
+
+    async def del_user(self, _id: int, user_id: int) -> None:
+        """Removes a user from a bot.
+
+        Args:
+            _id (int): The ID of the bot document.
+            user_id (int): The ID of the user.
+        """
+        await self.users.delete_one({"bot_id": _id, "user_id": user_id})
+
+    async def list_users(self, _id: int) -> List[int]:
+        """Lists the user IDs of a bot, served from the index alone.
+
+        Args:
+            _id (int): The ID of the bot document.
+
+        Returns:
+            List[int]: A list of user IDs.
+        """
+        cursor = self.users.find({"bot_id": _id}, {"_id": 0, "user_id": 1})
+        return [document["user_id"] async for document in cursor]
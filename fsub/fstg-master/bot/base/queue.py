@@ -0,0 +1,199 @@
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, FrozenSet, Hashable, Optional, Tuple
+
+from bot.utils import config, logger, metrics, watchdog
+
+
+def raw_sender_id(packet: Any) -> Optional[int]:
+    """
+    Finds the user behind a raw update packet of the dispatcher.
+
+    Args:
+        packet (Any): The (update, users, chats) tuple, or None.
+
+    Returns:
+        Optional[int]: The user ID of a message or callback query, if any.
+    """
+    update = packet[0] if packet else None
+    user_id = getattr(update, "user_id", None)
+    if user_id is None:
+        message = getattr(update, "message", None)
+        peer = getattr(message, "from_id", None) or getattr(message, "peer_id", None)
+        user_id = getattr(peer, "user_id", None)
+    return user_id if isinstance(user_id, int) else None
+
+
+def raw_text(packet: Any) -> Optional[str]:
+    """
+    Reads the command of a raw message update packet.
+
+    Args:
+        packet (Any): The (update, users, chats) tuple, or None.
+
+    Returns:
+        Optional[str]: The message text if it is a command, such as
+            `/start ...`, None for other messages and updates.
+    """
+    message = getattr(packet[0], "message", None) if packet else None
+    text = getattr(message, "message", None)
+    return text if isinstance(text, str) and text.startswith("/") else None
+
+
+class UpdateQueue(asyncio.Queue):
+    """
+    The update queue of the dispatcher, handing out one update per user at a time.
+
+    Updates are queued per user. A user is ready while they have updates
+    and none is being handled; ready users are served in turn, so a user
+    sending many updates waits behind the others instead of holding every
+    worker, and their updates are handled in order. At most `per_user`
+    updates are queued for each user; further ones are dropped, as are
+    commands repeating one of the user's that is queued or being handled.
+    Updates without a user, and those of users for whom `bypass` is true,
+    are handed out independently.
+
+    Updates from `priority_ids` are handed out independently too, before
+    all others, and are never dropped, so admins keep control of the bot
+    while it is backed up or busy with one of their own commands, such as
+    `/stop` during a broadcast, and the files they send to get links are
+    all handled. The bot counts as
+    overloaded while the oldest ready update has waited `SHED_QUEUE_AGE_MS`,
+    or while `SHED_IN_FLIGHT` handlers are running; either is ignored if 0.
+
+    Attributes:
+        sender (Callable[[Any], Optional[int]]): Finds the user of an item.
+        text (Callable[[Any], Optional[str]]): Finds the command of a message
+            item, if it is one.
+        bypass (Callable[[int], bool]): Whether a user's updates must not
+            wait for each other, such as the answer to a conversation.
+        per_user (int): The most updates queued for one user, 0 for no limit.
+        priority_ids (FrozenSet[int]): Users whose updates go first.
+        shedding (bool): Whether the bot was overloaded at the last check.
+    """
+
+    def __init__(
+        self,
+        sender: Callable[[Any], Optional[int]] = raw_sender_id,
+        text: Callable[[Any], Optional[str]] = raw_text,
+        per_user: int = 10,
+    ) -> None:
+        super().__init__()
+        self.sender = sender
+        self.text = text
+        self.bypass: Callable[[int], bool] = lambda _: False
+        self.per_user = per_user
+        self.priority_ids: FrozenSet[int] = frozenset()
+        self.shedding = False
+
+    def _init(self, maxsize: int) -> None:
+        self._pending: Dict[Hashable, Deque[Tuple[float, Optional[str], Any]]] = {}
+        self._handling: Dict[Hashable, Optional[str]] = {}
+        self._ready: Deque[Hashable] = deque()
+        self._urgent: Deque[Hashable] = deque()
+        self._busy: Dict[asyncio.Task, Hashable] = {}
+        self._size = 0
+        self._anonymous = itertools.count()
+
+    def put_nowait(self, item: Any) -> bool:
+        """
+        Queues an update behind the earlier ones of its user.
+
+        Args:
+            item (Any): The update.
+
+        Returns:
+            bool: Whether the update was queued rather than dropped.
+        """
+        user_id = self.sender(item)
+        urgent = user_id in self.priority_ids
+        # Each update without a user is queued on its own
+        if user_id is None or urgent or self.bypass(user_id):
+            key: Hashable = ("update", next(self._anonymous))
+        else:
+            key = user_id
+        text = self.text(item)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = deque()
+            (self._urgent if urgent else self._ready).append(key)
+        elif self.per_user and len(pending) >= self.per_user:
+            metrics.inc("fsub_updates_dropped_total", reason="full")
+            return False
+        elif text and (
+            self._handling.get(key) == text or any(text == e[1] for e in pending)
+        ):
+            metrics.inc("fsub_updates_dropped_total", reason="duplicate")
+            return False
+
+        pending.append((time.monotonic(), text, item))
+        self._size += 1
+        self._unfinished_tasks += 1
+        self._finished.clear()
+        self._wakeup_next(self._getters)
+        return True
+
+    def _get(self) -> Any:
+        key = (self._urgent or self._ready).popleft()
+        queued, text, item = self._pending[key].popleft()
+        self._size -= 1
+        self._busy[asyncio.current_task()] = key
+        self._handling[key] = text
+        metrics.observe("fsub_update_wait_seconds", time.monotonic() - queued)
+        return item
+
+    def task_done(self) -> None:
+        """Marks the update of the calling worker done, readying its user again."""
+        key = self._busy.pop(asyncio.current_task(), None)
+        if key is not None:
+            del self._handling[key]
+            if self._pending[key]:
+                # Behind the users already waiting, so no user starves the others
+                self._ready.append(key)
+                self._wakeup_next(self._getters)
+            else:
+                del self._pending[key]
+        super().task_done()
+
+    def qsize(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return not self._ready and not self._urgent
+
+    def age(self) -> float:
+        """
+        Returns how long the first ready update has been waiting.
+
+        Returns:
+            float: The wait in seconds, 0 if the queue is empty.
+        """
+        heads = [
+            self._pending[queue[0]][0][0]
+            for queue in (self._ready, self._urgent)
+            if queue
+        ]
+        return time.monotonic() - min(heads) if heads else 0.0
+
+    def overloaded(self) -> bool:
+        """
+        Checks the backlog against the shedding thresholds.
+
+        Returns:
+            bool: True while cheap requests should be answered from the caches.
+        """
+        max_age, in_flight = config.SHED_QUEUE_AGE_MS, config.SHED_IN_FLIGHT
+        shedding = bool(max_age and self.age() * 1000 >= max_age) or bool(
+            in_flight and len(watchdog.in_flight) >= in_flight
+        )
+        if shedding != self.shedding:
+            self.shedding = shedding
+            metrics.set("fsub_shedding", int(shedding))
+            logger.warning(
+                f"Load: Shedding, {self.qsize()} queued for {self.age():.1f}s"
+                if shedding
+                else "Load: Recovered"
+            )
+        return shedding
@@ -0,0 +1,395 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+import aiosqlite
+
+from bot.utils import logger
+
+from .database import Database
+from .exception import BotError
+
+# Settings hold scalar fields, lists hold list fields in insertion order
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    bot_id INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (bot_id, key)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS lists (
+    id INTEGER PRIMARY KEY,
+    bot_id INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    UNIQUE (bot_id, key, value)
+);
+
+CREATE TABLE IF NOT EXISTS users (
+    bot_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    PRIMARY KEY (bot_id, user_id)
+) WITHOUT ROWID;
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS lists_by_key ON lists (bot_id, key, id);
+"""
+
+
+class SQLiteDatabase(Database):
+    """
+    A class to manage a local SQLite database running in WAL mode.
+
+    Writes go through one connection and are serialized by a lock so that
+    multi-statement transactions never interleave. Reads go through a second,
+    read-only connection: in WAL mode each read statement sees the last
+    committed state, never a transaction half applied, without waiting for
+    the writes.
+
+    Attributes:
+        path (str): The path of the database file.
+        conn (Optional[aiosqlite.Connection]): The write connection.
+        reader (Optional[aiosqlite.Connection]): The read connection.
+    """
+
+    name: str = "SQLite"
+
+    def __init__(self, path: str) -> None:
+        """
+        Initializes the SQLiteDatabase instance with no active connection.
+
+        Args:
+            path (str): The path of the database file.
+        """
+        self.path: str = path
+        self.conn: Optional[aiosqlite.Connection] = None
+        self.reader: Optional[aiosqlite.Connection] = None
+        self.lock: asyncio.Lock = asyncio.Lock()
+
+    async def connect(self) -> None:
+        """Opens the database file, creates the tables, then opens the reader."""
+        try:
+            self.conn = await aiosqlite.connect(self.path, isolation_level=None)
+            await self.conn.execute("PRAGMA journal_mode=WAL")
+            await self.conn.execute("PRAGMA synchronous=NORMAL")
+            await self.conn.execute("PRAGMA busy_timeout=5000")
+            await self.conn.executescript(SCHEMA)
+
+            self.reader = await aiosqlite.connect(self.path, isolation_level=None)
+            await self.reader.execute("PRAGMA query_only=ON")
+            await self.reader.execute("PRAGMA busy_timeout=5000")
+            logger.info("SQLite: Connected")
+        except Exception as exc:
+            raise BotError(str(exc))
+
+    async def close(self) -> None:
+        """Closes the database connections."""
+        if self.conn:
+            if self.reader:
+                await self.reader.close()
+                self.reader = None
+            await self.conn.close()
+            self.conn = None
+            logger.info("SQLite: Closed")
+        else:
+            logger.info("SQLite: Already Closed")
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Runs the enclosed statements as one serialized write transaction."""
+        async with self.lock:
+            await self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                await self.conn.execute("ROLLBACK")
+                raise
+            else:
+                await self.conn.execute("COMMIT")
+
+    async def ping(self) -> None:
+        """Runs a trivial query through the read connection thread."""
+        await self.reader.execute_fetchall("SELECT 1")
+
+    async def create_indexes(self) -> None:
+        """Creates the indexes required by the storage layout."""
+        async with self.lock:
+            await self.conn.executescript(INDEXES)
+
+    async def list_docs(self) -> List[int]:
+        """Lists all document IDs.
+
+        Returns:
+            List[int]: A list of document IDs.
+        """
+        rows = await self.reader.execute_fetchall(
+            "SELECT bot_id FROM settings UNION SELECT bot_id FROM lists"
+        )
+        return [row[0] for row in rows]
+
+    async def get_doc(self, _id: int) -> Optional[Dict[str, Any]]:
+        """Assembles a document from its settings and list rows.
+
+        Args:
+            _id (int): The ID of the document.
+
+        Returns:
+            Optional[Dict[str, Any]]: The document, if found.
+        """
+        # One statement, so settings and lists are read from the same snapshot
+        rows = await self.reader.execute_fetchall(
+            "SELECT 0, key, value, 0 FROM settings WHERE bot_id = ? "
+            "UNION ALL SELECT 1, key, value, id FROM lists WHERE bot_id = ? "
+            "ORDER BY 1, 4",
+            (_id, _id),
+        )
+        if not rows:
+            return None
+
+        document: Dict[str, Any] = {"_id": _id}
+        for is_list, key, value, _ in rows:
+            if is_list:
+                document.setdefault(key, []).append(json.loads(value))
+            else:
+                document[key] = json.loads(value)
+
+        return document
+
+    async def get_slice(self, _id: int, key: str, skip: int, limit: int) -> List[Any]:
+        """Retrieves part of a document's list field.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The list field to read.
+            skip (int): The number of leading elements to skip.
+            limit (int): The maximum number of elements to return.
+
+        Returns:
+            List[Any]: The requested elements, empty if there are none.
+        """
+        rows = await self.reader.execute_fetchall(
+            "SELECT value FROM lists WHERE bot_id = ? AND key = ? "
+            "ORDER BY id LIMIT ? OFFSET ?",
+            (_id, key, limit, skip),
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    async def add_value(self, _id: int, key: str, value: Any) -> None:
+        """Adds a value to a document's list field if not already present.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field to which the value will be added.
+            value (Any): The value to be added.
+        """
+        async with self.transaction() as conn:
+            await conn.execute(
+                "INSERT OR IGNORE INTO lists (bot_id, key, value) VALUES (?, ?, ?)",
+                (_id, key, json.dumps(value)),
+            )
+
+    async def set_value(self, _id: int, key: str, value: Any) -> Any:
+        """Sets a scalar field in a document, replacing any previous shape.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field to be set.
+            value (Any): The value to be stored.
+
+        Returns:
+            Any: The stored value.
+        """
+        await self.set_fields(_id, {key: value})
+        return value
+
+    async def toggle_value(self, _id: int, key: str) -> bool:
+        """Atomically negates a boolean field and returns the new value.
+
+        A missing field counts as False.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field to be toggled.
+
+        Returns:
+            bool: The value after toggling.
+        """
+        async with self.transaction() as conn:
+            cursor = await conn.execute(
+                "INSERT INTO settings (bot_id, key, value) VALUES (?, ?, 'true') "
+                "ON CONFLICT (bot_id, key) DO UPDATE SET value = "
+                "CASE WHEN value = 'true' THEN 'false' ELSE 'true' END "
+                "RETURNING value",
+                (_id, key),
+            )
+            row = await cursor.fetchone()
+            await cursor.close()
+
+        return json.loads(row[0])
+
+    async def fill_defaults(
+        self, _id: int, defaults: Dict[str, Any], version: int
+    ) -> Optional[Dict[str, Any]]:
+        """Fills missing fields of a document in a single transaction.
+
+        Nothing is written when every field is already present. A new document
+        also gets `SCHEMA_VERSION` set to `version`; an existing document
+        without one is marked as version 0.
+
+        Args:
+            _id (int): The ID of the document.
+            defaults (Dict[str, Any]): Field names mapped to default values.
+            version (int): The schema version of newly created documents.
+
+        Returns:
+            Optional[Dict[str, Any]]: The document before the update, or None
+                if it was just created.
+        """
+        document = await self.get_doc(_id)
+        fields = {
+            key: value for key, value in defaults.items() if key not in (document or {})
+        }
+        if document is None:
+            fields["SCHEMA_VERSION"] = version
+        elif "SCHEMA_VERSION" not in document:
+            fields["SCHEMA_VERSION"] = 0
+
+        if fields:
+            async with self.transaction() as conn:
+                await conn.executemany(
+                    "INSERT OR IGNORE INTO settings (bot_id, key, value) VALUES (?, ?, ?)",
+                    [(_id, key, json.dumps(value)) for key, value in fields.items()],
+                )
+
+        return document
+
+    async def set_fields(
+        self, _id: int, fields: Dict[str, Any], unset: Iterable[str] = ()
+    ) -> None:
+        """Sets and clears several fields in a single transaction.
+
+        Args:
+            _id (int): The ID of the document.
+            fields (Dict[str, Any]): Field names mapped to their new values.
+            unset (Iterable[str]): Field names to be cleared.
+        """
+        removed = [(_id, key) for key in [*fields, *unset]]
+        async with self.transaction() as conn:
+            await conn.executemany(
+                "DELETE FROM lists WHERE bot_id = ? AND key = ?", removed
+            )
+            await conn.executemany(
+                "DELETE FROM settings WHERE bot_id = ? AND key = ?",
+                [(_id, key) for key in unset],
+            )
+            await conn.executemany(
+                "INSERT INTO settings (bot_id, key, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (bot_id, key) DO UPDATE SET value = excluded.value",
+                [(_id, key, json.dumps(value)) for key, value in fields.items()],
+            )
+
+    async def unwrap_values(self, _id: int, keys: Iterable[str]) -> None:
+        """Replaces legacy one-element array fields with their element.
+
+        Empty arrays are removed, scalar fields are left untouched.
+
+        Args:
+            _id (int): The ID of the document.
+            keys (Iterable[str]): The fields to be unwrapped.
+        """
+        document = await self.get_doc(_id) or {}
+        fields, unset = {}, []
+        for key in keys:
+            value = document.get(key)
+            if isinstance(value, list):
+                if value:
+                    fields[key] = value[0]
+                else:
+                    unset.append(key)
+
+        if fields or unset:
+            await self.set_fields(_id, fields, unset)
+
+    async def del_value(self, _id: int, key: str, value: Any) -> None:
+        """Removes a value from a document's list field.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field from which the value will be removed.
+            value (Any): The value to be removed.
+        """
+        async with self.transaction() as conn:
+            await conn.execute(
+                "DELETE FROM lists WHERE bot_id = ? AND key = ? AND value = ?",
+                (_id, key, json.dumps(value)),
+            )
+
+    async def clear_value(self, _id: int, key: str) -> None:
+        """Clears a field in a document.
+
+        Args:
+            _id (int): The ID of the document.
+            key (str): The field to be cleared.
+        """
+        await self.set_fields(_id, {}, [key])
+
+    async def del_doc(self, _id: int) -> None:
+        """Deletes a document by its ID.
+
+        Args:
+            _id (int): The ID of the document.
+        """
+        async with self.transaction() as conn:
+            await conn.execute("DELETE FROM settings WHERE bot_id = ?", (_id,))
+            await conn.execute("DELETE FROM lists WHERE bot_id = ?", (_id,))
+
+    async def add_user(self, _id: int, user_id: int) -> None:
+        """Adds a user to a bot.
+
+        Args:
+            _id (int): The ID of the bot document.
+            user_id (int): The ID of the user.
+        """
+        await self.add_users(_id, [user_id])
+
+    async def add_users(self, _id: int, user_ids: List[int]) -> None:
+        """Adds many users to a bot in one transaction.
+
+        Args:
+            _id (int): The ID of the bot document.
+            user_ids (List[int]): The IDs of the users.
+        """
+        async with self.transaction() as conn:
+            await conn.executemany(
+                "INSERT OR IGNORE INTO users (bot_id, user_id) VALUES (?, ?)",
+                [(_id, user_id) for user_id in user_ids],
+            )
+
+    async def del_user(self, _id: int, user_id: int) -> None:
+        """Removes a user from a bot.
+
+        Args:
+            _id (int): The ID of the bot document.
+            user_id (int): The ID of the user.
+        """
+        async with self.transaction() as conn:
+            await conn.execute(
+                "DELETE FROM users WHERE bot_id = ? AND user_id = ?", (_id, user_id)
+            )
+
+    async def list_users(self, _id: int) -> List[int]:
+        """Lists the user IDs of a bot.
+
+        Args:
+            _id (int): The ID of the bot document.
+
+        Returns:
+            List[int]: A list of user IDs.
+        """
+        rows = await self.reader.execute_fetchall(
+            "SELECT user_id FROM users WHERE bot_id = ?", (_id,)
+        )
+        return [row[0] for row in rows]
@@ -1,45 +1,66 @@
 from .admin import add_admin, del_admin, get_admins
+from .clone import add_clone, del_clone, get_clones
 from .content import (
     get_generate_status,
     get_protect_content,
     update_generate_status,
     update_protect_content,
 )
-from .fsub import add_fs_chat, del_fs_chat, get_fs_chats
+from .fsub import (
+    add_fs_chat,
+    del_fs_chat,
+    get_fs_chats,
+    get_fs_chats_snapshot,
+    set_fs_chats_snapshot,
+)
 from .initial import initial_database
+from .migration import SCHEMA_VERSION, migrate_database
 from .restart import (
     add_broadcast_data_id,
     del_broadcast_data_id,
     get_broadcast_data_ids,
 )
+from .setting import get_setting, set_setting, toggle_setting, unwrap_value
 from .text import (
     get_force_text_msg,
     get_start_text_msg,
     update_force_text_msg,
     update_start_text_msg,
 )
-from .user import add_user, del_user, get_users
+from .user import add_user, add_users, del_user, get_users
 
 __all__ = [
     "add_admin",
     "del_admin",
     "get_admins",
+    "add_clone",
+    "del_clone",
+    "get_clones",
     "get_generate_status",
     "get_protect_content",
     "update_generate_status",
     "update_protect_content",
     "initial_database",
+    "SCHEMA_VERSION",
+    "migrate_database",
     "add_fs_chat",
     "del_fs_chat",
     "get_fs_chats",
+    "get_fs_chats_snapshot",
+    "set_fs_chats_snapshot",
     "add_broadcast_data_id",
     "del_broadcast_data_id",
     "get_broadcast_data_ids",
+    "get_setting",
+    "set_setting",
+    "toggle_setting",
+    "unwrap_value",
     "get_force_text_msg",
     "get_start_text_msg",
     "update_force_text_msg",
     "update_start_text_msg",
     "add_user",
+    "add_users",
     "del_user",
     "get_users",
 ]
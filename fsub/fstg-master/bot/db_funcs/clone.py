@@ -0,0 +1,39 @@
+from typing import Any, Dict, List, Optional
+
+from bot.base import database
+from bot.utils import config
+
+
+async def add_clone(bot_token: str) -> None:
+    """
+    Adds a bot token to the list of clone bots hosted by the main bot.
+
+    Args:
+        bot_token (str): The token of the clone bot.
+    """
+    await database.add_value(int(config.BOT_ID), "CLONE_TOKENS", bot_token)
+
+
+async def del_clone(bot_token: str) -> None:
+    """
+    Removes a bot token from the list of clone bots.
+
+    Args:
+        bot_token (str): The token of the clone bot.
+    """
+    await database.del_value(int(config.BOT_ID), "CLONE_TOKENS", bot_token)
+
+
+async def get_clones() -> List[str]:
+    """
+    Retrieves the tokens of the clone bots hosted by the main bot.
+
+    Returns:
+        List[str]: The bot tokens.
+    """
+    doc: Optional[Dict[str, Any]] = await database.get_doc(int(config.BOT_ID))
+    return (
+        doc.get("CLONE_TOKENS", [])
+        if doc and isinstance(doc.get("CLONE_TOKENS"), list)
+        else []
+    )
@@ -1,24 +1,4 @@
-from typing import Any, Dict, Optional
-
-from bot.base import database
-from bot.utils import config
-
-
-async def add_generate_status(value: bool) -> None:
-    """
-    Adds or updates the generate URL status in the database.
-
-    Args:
-        value (bool): The status to set for generating URLs.
-    """
-    await database.add_value(int(config.BOT_ID), "GENERATE_URL", value)
-
-
-async def del_generate_status() -> None:
-    """
-    Clears the generate URL status from the database.
-    """
-    await database.clear_value(int(config.BOT_ID), "GENERATE_URL")
+from .setting import get_setting, toggle_setting
 
 
 async def get_generate_status() -> bool:
@@ -28,35 +8,18 @@ async def get_generate_status() -> bool:
     Returns:
         bool: The current status of generate URLs.
     """
-    doc: Optional[Dict[str, Any]] = await database.get_doc(int(config.BOT_ID))
     # Assume default value of False if no status is found
-    return doc.get("GENERATE_URL", [False])[0]
+    return await get_setting("GENERATE_URL", False)
 
 
-async def update_generate_status() -> None:
+async def update_generate_status() -> bool:
     """
     Toggles the generate URL status in the database.
-    """
-    current_generate_status = await get_generate_status()
-    await del_generate_status()
-    await add_generate_status(not current_generate_status)
 
-
-async def add_protect_content(value: bool) -> None:
-    """
-    Adds or updates the protect content status in the database.
-
-    Args:
-        value (bool): The status to set for protecting content.
-    """
-    await database.add_value(int(config.BOT_ID), "PROTECT_CONTENT", value)
-
-
-async def del_protect_content() -> None:
-    """
-    Clears the protect content status from the database.
+    Returns:
+        bool: The new status of generate URLs.
     """
-    await database.clear_value(int(config.BOT_ID), "PROTECT_CONTENT")
+    return await toggle_setting("GENERATE_URL")
 
 
 async def get_protect_content() -> bool:
@@ -66,15 +29,15 @@ async def get_protect_content() -> bool:
     Returns:
         bool: The current status of protecting content.
     """
-    doc: Optional[Dict[str, Any]] = await database.get_doc(int(config.BOT_ID))
     # Assume default value of False if no status is found
-    return doc.get("PROTECT_CONTENT", [False])[0]
+    return await get_setting("PROTECT_CONTENT", False)
 
 
-async def update_protect_content() -> None:
+async def update_protect_content() -> bool:
     """
     Toggles the protect content status in the database.
+
+    Returns:
+        bool: The new status of protecting content.
     """
-    current_protect_content_status = await get_protect_content()
-    await del_protect_content()
-    await add_protect_content(not current_protect_content_status)
+    return await toggle_setting("PROTECT_CONTENT")
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from bot.base import database
 from bot.utils import config
@@ -38,3 +38,42 @@ async def get_fs_chats() -> List[int]:
         if doc and isinstance(doc.get("FSUB_CHATS"), list)
         else []
     )
+
+
+async def get_fs_chats_snapshot() -> Tuple[List[int], Dict[int, Dict[str, Any]]]:
+    """
+    Retrieves the subscribed chat IDs and their last resolved details in one read.
+
+    Returns:
+        Tuple[List[int], Dict[int, Dict[str, Any]]]: The chat IDs, and the
+            snapshot entries by chat ID.
+    """
+    doc: Optional[Dict[str, Any]] = await database.get_doc(int(config.BOT_ID))
+    if not doc:
+        return [], {}
+
+    chat_ids = doc.get("FSUB_CHATS")
+    snapshot = doc.get("FSUB_SNAPSHOT")
+    return (
+        chat_ids if isinstance(chat_ids, list) else [],
+        # Stored keys are strings, as documents only allow string keys
+        (
+            {int(chat_id): entry for chat_id, entry in snapshot.items()}
+            if isinstance(snapshot, dict)
+            else {}
+        ),
+    )
+
+
+async def set_fs_chats_snapshot(snapshot: Dict[int, Dict[str, Any]]) -> None:
+    """
+    Stores the resolved details of the subscribed chats.
+
+    Args:
+        snapshot (Dict[int, Dict[str, Any]]): The snapshot entries by chat ID.
+    """
+    await database.set_value(
+        int(config.BOT_ID),
+        "FSUB_SNAPSHOT",
+        {str(chat_id): entry for chat_id, entry in snapshot.items()},
+    )
@@ -1,21 +1,30 @@
-from typing import Dict, Union
+import asyncio
+from typing import Any, Dict, Union
 
 from bot.base import database
 from bot.utils import config, logger
 
+from .migration import SCHEMA_VERSION, migrate_database
+from .setting import unwrap_value
 
-async def initial_database() -> None:
+
+async def initial_database() -> Dict[str, Any]:
     """
     Initializes the database with default values if they are not already present.
 
-    This function sets up initial configuration values in the database.
-    It checks if certain keys exist in the database; if not, it adds them with default values.
+    Defaults are applied by one conditional upsert that only fills missing
+    fields, so a new bot is set up with a single write and an existing bot
+    with none. Required indexes are created alongside, and documents with an
+    older schema version are migrated afterwards.
 
     Default values added:
         - "GENERATE_URL": False
         - "PROTECT_CONTENT": False
         - "FORCE_TEXT": A default force text message
         - "START_TEXT": A default start text message
+
+    Returns:
+        Dict[str, Any]: The bot document after defaults have been applied.
     """
     default_start_text = (
         "Hello, {mention}!\n"
@@ -34,16 +43,24 @@ async def initial_database() -> None:
     }
 
     bot_id = int(config.BOT_ID)
-    doc = await database.get_doc(
-        bot_id
-    )  # Fetch the document once to avoid multiple database calls
+    doc, _ = await asyncio.gather(
+        database.fill_defaults(bot_id, default_key_value_db, SCHEMA_VERSION),
+        database.create_indexes(),
+    )
+    if doc is None:
+        logger.info(f"Schema Version: {SCHEMA_VERSION}")
+        doc = {"_id": bot_id, "SCHEMA_VERSION": SCHEMA_VERSION}
+    else:
+        doc.setdefault("SCHEMA_VERSION", 0)
 
     for key, value in default_key_value_db.items():
         data = key.replace("_", " ").title()
 
-        if doc is None or key not in doc:
-            await database.add_value(bot_id, key, value)
+        if key not in doc:
+            doc[key] = value
             logger.info(f"{data}: Default")
-        else:
-            if key not in {"FORCE_TEXT", "START_TEXT"}:
-                logger.info(f"{data}: {value}")
+        elif key not in {"FORCE_TEXT", "START_TEXT"}:
+            logger.info(f"{data}: {unwrap_value(doc[key], value)}")
+
+    await migrate_database(bot_id, doc)
+    return doc
@@ -0,0 +1,157 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Set
+
+from bot.base import database
+from bot.utils import logger
+
+from .setting import unwrap_value
+
+# Number of legacy users copied per write while migrating
+MIGRATION_BATCH_SIZE: int = 10000
+
+# Reads a whole list field with `get_slice`
+ALL: int = 2**31 - 1
+
+
+class Migration(NamedTuple):
+    """
+    A single step of the storage layout.
+
+    Attributes:
+        version (int): The schema version reached once the step completes.
+        name (str): A short description used in logs.
+        func (Callable): Processes one batch given the bot ID and the progress
+            cursor, returning the next cursor or None once complete. Every
+            returned cursor is persisted, so a crashed run resumes from it.
+        online (bool): Whether the step may run in the background while the
+            bot serves updates.
+    """
+
+    version: int
+    name: str
+    func: Callable[[int, int], Awaitable[Optional[int]]]
+    online: bool = False
+
+
+async def scalar_settings(bot_id: int, _: int) -> Optional[int]:
+    """
+    Stores settings and restart data as scalars instead of one-element arrays.
+
+    Args:
+        bot_id (int): The ID of the bot document.
+        _ (int): Unused, the step is a single atomic update.
+
+    Returns:
+        Optional[int]: Always None.
+    """
+    keys = ["GENERATE_URL", "PROTECT_CONTENT", "FORCE_TEXT", "START_TEXT"]
+    await database.unwrap_values(bot_id, keys + ["RESTART_IDS"])
+    return None
+
+
+async def users_collection(bot_id: int, cursor: int) -> Optional[int]:
+    """
+    Moves one batch of `BOT_USERS` out of the bot document into the users collection.
+
+    New users are written to the collection while this runs and readers merge
+    both sources, so the step is safe to run online. Users deleted meanwhile
+    are recorded in `DELETED_USERS` and not copied; the record is cleared
+    with the array. Copies are idempotent, so a batch repeated after a crash
+    does no harm.
+
+    Args:
+        bot_id (int): The ID of the bot document.
+        cursor (int): The number of legacy users already copied.
+
+    Returns:
+        Optional[int]: The number of users copied so far, or None once the
+            legacy array has been removed.
+    """
+    batch = await database.get_slice(bot_id, "BOT_USERS", cursor, MIGRATION_BATCH_SIZE)
+    if not batch:
+        await database.set_fields(bot_id, {}, unset=["BOT_USERS", "DELETED_USERS"])
+        return None
+
+    deleted = set(await database.get_slice(bot_id, "DELETED_USERS", 0, ALL))
+    users = [user for user in batch if user not in deleted]
+    if users:
+        await database.add_users(bot_id, users)
+    return cursor + len(batch)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Scalar Settings", scalar_settings),
+    Migration(2, "Users Collection", users_collection, online=True),
+]
+
+# Version of the storage layout written by this code for new bots
+SCHEMA_VERSION: int = MIGRATIONS[-1].version
+
+_background_tasks: Set[asyncio.Task] = set()
+
+
+async def run_migration(bot_id: int, migration: Migration, cursor: int) -> None:
+    """
+    Runs one migration step to completion, recording its progress.
+
+    Args:
+        bot_id (int): The ID of the bot document.
+        migration (Migration): The step to run.
+        cursor (int): The progress cursor to resume from.
+    """
+    logger.info(f"Migration {migration.version}: {migration.name} from {cursor}")
+    while (cursor := await migration.func(bot_id, cursor)) is not None:
+        state = {"version": migration.version, "cursor": cursor}
+        await database.set_value(bot_id, "MIGRATION", state)
+        await asyncio.sleep(0)  # Let handlers run between batches
+
+    await database.set_fields(
+        bot_id, {"SCHEMA_VERSION": migration.version}, unset=["MIGRATION"]
+    )
+    logger.info(f"Migration {migration.version}: Done")
+
+
+async def run_migrations(bot_id: int, pending: List[Migration], cursor: int) -> None:
+    """
+    Runs pending migration steps in order, logging instead of raising.
+
+    Args:
+        bot_id (int): The ID of the bot document.
+        pending (List[Migration]): The steps to run.
+        cursor (int): The progress cursor of the first step.
+    """
+    try:
+        for migration in pending:
+            await run_migration(bot_id, migration, cursor)
+            cursor = 0
+    except Exception as exc:
+        logger.error(f"Migration: {exc}")
+
+
+async def migrate_database(bot_id: int, doc: Dict[str, Any]) -> None:
+    """
+    Brings the bot document up to the current schema version.
+
+    Offline steps run before returning. From the first online step onwards,
+    the remaining steps run in a background task.
+
+    Args:
+        bot_id (int): The ID of the bot document.
+        doc (Dict[str, Any]): The bot document as read at startup.
+    """
+    version = unwrap_value(doc.get("SCHEMA_VERSION"), 0)
+    pending = [migration for migration in MIGRATIONS if migration.version > version]
+    if not pending:
+        return
+
+    state = doc.get("MIGRATION") or {}
+    cursor = state.get("cursor", 0) if state.get("version") == pending[0].version else 0
+
+    while pending and not pending[0].online:
+        await run_migration(bot_id, pending.pop(0), cursor)
+        cursor = 0
+
+    if pending:
+        task = asyncio.create_task(run_migrations(bot_id, pending, cursor))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
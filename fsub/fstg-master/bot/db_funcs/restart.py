@@ -3,22 +3,21 @@ from typing import Any, Dict, Optional, Tuple
 from bot.base import database
 from bot.utils import config
 
+from .setting import unwrap_value
+
 
 async def add_broadcast_data_id(chat_id: int, message_id: int) -> None:
     """
     Adds or updates broadcast data in the database.
 
-    This function deletes any existing broadcast data and then adds new data
-    with the provided chat ID and message ID.
+    Any existing broadcast data is replaced in a single update.
 
     Args:
         chat_id (int): The ID of the chat where the message is sent.
         message_id (int): The ID of the message to broadcast.
     """
-    await del_broadcast_data_id()
-
     broadcast_data = {"chat_id": chat_id, "message_id": message_id}
-    await database.add_value(int(config.BOT_ID), "RESTART_IDS", broadcast_data)
+    await database.set_value(int(config.BOT_ID), "RESTART_IDS", broadcast_data)
 
 
 async def del_broadcast_data_id() -> None:
@@ -38,16 +37,9 @@ async def get_broadcast_data_ids() -> Tuple[Optional[int], Optional[int]]:
             `None` if no broadcast data is found.
     """
     doc: Optional[Dict[str, Any]] = await database.get_doc(int(config.BOT_ID))
+    broadcast_data = unwrap_value(doc.get("RESTART_IDS"), None) if doc else None
+
+    if isinstance(broadcast_data, dict):
+        return broadcast_data.get("chat_id"), broadcast_data.get("message_id")
 
-    if doc:
-        data = doc.get("RESTART_IDS")
-        if isinstance(data, list) and data:
-            broadcast_data = data[0]
-            chat_id = broadcast_data.get("chat_id")
-            message_id = broadcast_data.get("message_id")
-        else:
-            chat_id, message_id = None, None
-    else:
-        chat_id, message_id = None, None
-
-    return chat_id, message_id
+    return None, None
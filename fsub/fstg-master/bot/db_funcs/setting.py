@@ -0,0 +1,62 @@
+from typing import Any, Dict, Optional
+
+from bot.base import database
+from bot.utils import config
+
+
+def unwrap_value(value: Any, default: Any) -> Any:
+    """
+    Normalizes a stored setting, accepting the legacy one-element array shape.
+
+    Args:
+        value (Any): The raw value read from the database.
+        default (Any): The value to return when the setting is missing.
+
+    Returns:
+        Any: The scalar setting value.
+    """
+    if isinstance(value, list):
+        return value[0] if value else default
+    return default if value is None else value
+
+
+async def get_setting(key: str, default: Any) -> Any:
+    """
+    Retrieves a scalar setting of the bot document.
+
+    Args:
+        key (str): The setting name.
+        default (Any): The value to return when the setting is missing.
+
+    Returns:
+        Any: The current setting value.
+    """
+    doc: Optional[Dict[str, Any]] = await database.get_doc(int(config.BOT_ID))
+    return unwrap_value(doc.get(key), default) if doc else default
+
+
+async def set_setting(key: str, value: Any) -> Any:
+    """
+    Stores a scalar setting in a single update.
+
+    Args:
+        key (str): The setting name.
+        value (Any): The new value.
+
+    Returns:
+        Any: The stored value.
+    """
+    return await database.set_value(int(config.BOT_ID), key, value)
+
+
+async def toggle_setting(key: str) -> bool:
+    """
+    Negates a boolean setting in a single atomic update.
+
+    Args:
+        key (str): The setting name.
+
+    Returns:
+        bool: The value after toggling.
+    """
+    return await database.toggle_value(int(config.BOT_ID), key)
@@ -1,24 +1,4 @@
-from typing import Any, Dict, Optional
-
-from bot.base import database
-from bot.utils import config
-
-
-async def add_force_text_msg(value: str) -> None:
-    """
-    Adds or updates the force text message in the database.
-
-    Args:
-        value (str): The force text message to set.
-    """
-    await database.add_value(int(config.BOT_ID), "FORCE_TEXT", value)
-
-
-async def del_force_text_msg() -> None:
-    """
-    Clears the force text message from the database.
-    """
-    await database.clear_value(int(config.BOT_ID), "FORCE_TEXT")
+from .setting import get_setting, set_setting
 
 
 async def get_force_text_msg() -> str:
@@ -26,41 +6,22 @@ async def get_force_text_msg() -> str:
     Retrieves the current force text message from the database.
 
     Returns:
-        str: The force text message. Defaults to an empty string if not set.
+        str: The force text message. Defaults to "#" if not set.
     """
-    doc: Optional[Dict[str, Any]] = await database.get_doc(int(config.BOT_ID))
-    return doc.get("FORCE_TEXT", ["#"])[0] if doc else "#"
+    return await get_setting("FORCE_TEXT", "#")
 
 
-async def update_force_text_msg(value: str) -> None:
+async def update_force_text_msg(value: str) -> str:
     """
-    Updates the force text message in the database.
-
-    This function first deletes the existing force text message and then
-    adds the new message.
+    Replaces the force text message in a single update.
 
     Args:
         value (str): The new force text message to set.
-    """
-    await del_force_text_msg()
-    await add_force_text_msg(value)
 
-
-async def add_start_text_msg(value: str) -> None:
-    """
-    Adds or updates the start text message in the database.
-
-    Args:
-        value (str): The start text message to set.
-    """
-    await database.add_value(int(config.BOT_ID), "START_TEXT", value)
-
-
-async def del_start_text_msg() -> None:
-    """
-    Clears the start text message from the database.
+    Returns:
+        str: The stored force text message.
     """
-    await database.clear_value(int(config.BOT_ID), "START_TEXT")
+    return await set_setting("FORCE_TEXT", value)
 
 
 async def get_start_text_msg() -> str:
@@ -68,21 +29,19 @@ async def get_start_text_msg() -> str:
     Retrieves the current start text message from the database.
 
     Returns:
-        str: The start text message. Defaults to an empty string if not set.
+        str: The start text message. Defaults to "#" if not set.
     """
-    doc: Optional[Dict[str, Any]] = await database.get_doc(int(config.BOT_ID))
-    return doc.get("START_TEXT", ["#"])[0] if doc else "#"
+    return await get_setting("START_TEXT", "#")
 
 
-async def update_start_text_msg(value: str) -> None:
+async def update_start_text_msg(value: str) -> str:
     """
-    Updates the start text message in the database.
-
-    This function first deletes the existing start text message and then
-    adds the new message.
+    Replaces the start text message in a single update.
 
     Args:
         value (str): The new start text message to set.
+
+    Returns:
+        str: The stored start text message.
     """
-    await del_start_text_msg()
-    await add_start_text_msg(value)
+    return await set_setting("START_TEXT", value)
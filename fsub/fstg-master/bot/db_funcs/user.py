@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+from typing import List
 
 from bot.base import database
 from bot.utils import config
@@ -6,35 +7,62 @@ from bot.utils import config
 
 async def add_user(user_id: int) -> None:
     """
-    Adds a user ID to the list of bot users in the database.
+    Adds a user ID to the bot users in the database.
 
     Args:
         user_id (int): The ID of the user to add.
     """
-    await database.add_value(int(config.BOT_ID), "BOT_USERS", user_id)
+    await database.add_user(int(config.BOT_ID), user_id)
+
+
+async def add_users(user_ids: List[int]) -> None:
+    """
+    Adds many user IDs to the bot users in one bulk write.
+
+    Args:
+        user_ids (List[int]): The IDs of the users to add.
+    """
+    await database.add_users(int(config.BOT_ID), user_ids)
 
 
 async def del_user(user_id: int) -> None:
     """
-    Removes a user ID from the list of bot users in the database.
+    Removes a user ID from the bot users in the database.
+
+    While the legacy `BOT_USERS` array is being migrated, the user is also
+    recorded in `DELETED_USERS`, so neither `get_users` nor the migration
+    reads them back from the array.
 
     Args:
         user_id (int): The ID of the user to remove.
     """
-    await database.del_value(int(config.BOT_ID), "BOT_USERS", user_id)
+    bot_id = int(config.BOT_ID)
+    await database.del_user(bot_id, user_id)
+    if await database.get_slice(bot_id, "BOT_USERS", 0, 1):
+        await database.add_value(bot_id, "DELETED_USERS", user_id)
 
 
 async def get_users() -> List[int]:
     """
     Retrieves the list of bot users from the database.
 
+    Users still stored in the legacy `BOT_USERS` array of the bot document are
+    included until the users collection migration has finished, except those
+    deleted since.
+
     Returns:
         List[int]: A list of user IDs that are associated with the bot.
-                   Returns an empty list if no users are found or if the document does not exist.
+                   Returns an empty list if no users are found.
     """
-    doc: Optional[Dict[str, Any]] = await database.get_doc(int(config.BOT_ID))
-    return (
-        doc.get("BOT_USERS", [])
-        if doc and isinstance(doc.get("BOT_USERS"), list)
-        else []
+    bot_id = int(config.BOT_ID)
+    users, doc = await asyncio.gather(
+        database.list_users(bot_id), database.get_doc(bot_id)
     )
+
+    legacy_users = doc.get("BOT_USERS") if doc else None
+    if not isinstance(legacy_users, list) or not legacy_users:
+        return users
+
+    deleted = set(doc.get("DELETED_USERS") or [])
+    legacy_users = [user for user in legacy_users if user not in deleted]
+    return list(dict.fromkeys(users + legacy_users))
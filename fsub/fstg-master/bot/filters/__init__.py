@@ -1,4 +1,5 @@
 from .authorized import filter_authorized
 from .broadcast import filter_broadcast
+from .main_bot import filter_main_bot
 
-__all__ = ["filter_authorized", "filter_broadcast"]
+__all__ = ["filter_authorized", "filter_broadcast", "filter_main_bot"]
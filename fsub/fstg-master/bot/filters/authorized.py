@@ -5,7 +5,6 @@ from hydrogram.enums import ChatType
 from hydrogram.types import CallbackQuery, Message
 
 from bot.helpers import cache
-from bot.utils import config
 
 if TYPE_CHECKING:
     from hydrogram import Client
@@ -30,7 +29,7 @@ def authorized(_: "Filter", __: "Client", event: Union[CallbackQuery, Message])
     # Check if the message is in a private chat
     if msg.chat.type == ChatType.PRIVATE:
         # Check if the user is an admin
-        if event.from_user.id in cache.admins or event.from_user.id == config.OWNER_ID:
+        if event.from_user.id in cache.authorized:
             return True
 
     # For all other cases, return False
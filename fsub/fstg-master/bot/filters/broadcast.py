@@ -4,7 +4,6 @@ from hydrogram import filters
 from hydrogram.types import CallbackQuery, Message
 
 from bot.helpers import cache
-from bot.utils import config
 
 if TYPE_CHECKING:
     from hydrogram import Client
@@ -24,7 +23,7 @@ def broadcast(_: "Filter", __: "Client", event: Union[CallbackQuery, Message]) -
         bool: True if the user is an admin; otherwise, False.
     """
     # Check if the user ID is in the list of admins
-    if event.from_user.id in cache.admins or event.from_user.id == config.OWNER_ID:
+    if event.from_user.id in cache.authorized:
         return True
 
     # Return False if none of the conditions are met
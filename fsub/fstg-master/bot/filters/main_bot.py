@@ -0,0 +1,29 @@
+from typing import TYPE_CHECKING, Union
+
+from hydrogram import filters
+from hydrogram.types import CallbackQuery, Message
+
+from bot.utils import current_bot
+
+if TYPE_CHECKING:
+    from hydrogram import Client
+    from hydrogram.filters import Filter
+
+
+def main_bot(_: "Filter", __: "Client", ___: Union[CallbackQuery, Message]) -> bool:
+    """
+    Determines if the update was received by the main bot rather than a clone.
+
+    Args:
+        _ (Filter): Ignored argument.
+        __ (Client): Ignored argument.
+        ___ (Union[CallbackQuery, Message]): Ignored argument.
+
+    Returns:
+        bool: True for the main bot; otherwise, False.
+    """
+    return current_bot.get() is None
+
+
+# Create the filter using the main_bot function
+filter_main_bot = filters.create(main_bot, name="filter_main_bot")
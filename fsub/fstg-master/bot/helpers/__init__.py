@@ -1,9 +1,20 @@
-from .button import admin_buttons, button, join_buttons
+from .button import admin_buttons, button, fs_chats_buttons, join_buttons
 from .cache import cache
+from .clones import clones
+from .deferred import deferred
+from .latency import latency
+from .prefetch import prefetch
+from .throttle import throttle
 
 __all__ = [
     "admin_buttons",
     "button",
+    "fs_chats_buttons",
     "join_buttons",
     "cache",
+    "clones",
+    "deferred",
+    "latency",
+    "prefetch",
+    "throttle",
 ]
@@ -1,8 +1,9 @@
-from typing import TYPE_CHECKING, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from hydrogram.helpers import ikb
+from hydrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
-from bot.utils import config
+from bot.utils import config, metrics, per_bot
 
 from .cache import cache
 
@@ -62,61 +63,151 @@ class Button:
 button: Button = Button()
 
 
-def admin_buttons() -> ikb:
+class Keyboards:
+    """
+    Inline keyboards built from the F-Sub chats, cached by F-Sub cache version.
+
+    A join keyboard only depends on which chats the user has not joined, so
+    it is cached by a bitmask of their positions in `cache.fs_chats`. All
+    cached keyboards are dropped when the version changes.
+
+    Attributes:
+        version (int): The F-Sub cache version the keyboards were built for.
+        positions (Dict[int, int]): The bit of each chat ID in the masks.
+        admin (Optional[InlineKeyboardMarkup]): The admin keyboard.
+        join (Dict[int, List[List[InlineKeyboardButton]]]): Join rows by mask.
+    """
+
+    MAX_JOIN: int = 256
+
+    def __init__(self) -> None:
+        self.version: int = -1
+        self.positions: Dict[int, int] = {}
+        self.admin: Optional[InlineKeyboardMarkup] = None
+        self.join: Dict[int, List[List[InlineKeyboardButton]]] = {}
+
+    def sync(self) -> None:
+        """Drops the cached keyboards if the F-Sub chats changed."""
+        if self.version == cache.fs_version:
+            return
+
+        self.version = cache.fs_version
+        self.positions = {chat_id: i for i, chat_id in enumerate(cache.fs_chats)}
+        self.admin = None
+        self.join = {}
+
+    def join_rows(self, mask: int) -> List[List[InlineKeyboardButton]]:
+        """
+        Returns the join rows of the chats in a mask, building them once.
+
+        Args:
+            mask (int): The positions of the chats not joined.
+
+        Returns:
+            List[List[InlineKeyboardButton]]: The join buttons, two per row.
+        """
+        rows = self.join.get(mask)
+        metrics.inc(
+            "fsub_cache_requests_total",
+            cache="keyboards",
+            result="hit" if rows else "miss",
+        )
+        if rows:
+            return rows
+
+        buttons = [
+            (f"Join {chat_info['chat_type']}", chat_info["invite_link"], "url")
+            for i, chat_info in enumerate(cache.fs_chats.values())
+            if mask >> i & 1
+        ]
+        layout = [buttons[i : i + 2] for i in range(0, len(buttons), 2)]
+        rows = ikb(layout).inline_keyboard
+
+        if len(self.join) >= self.MAX_JOIN:
+            self.join.clear()
+        self.join[mask] = rows
+        return rows
+
+
+keyboards: Keyboards = per_bot(Keyboards)
+
+
+def admin_buttons() -> InlineKeyboardMarkup:
     """
     Creates an inline keyboard with buttons for admin-related actions.
 
     Returns:
-        ikb: An inline keyboard with buttons for managing chats and additional settings.
+        InlineKeyboardMarkup: An inline keyboard with buttons for managing chats and additional settings.
     """
-    buttons: List[Tuple[str, str, str]] = []
-    fs_data = cache.fs_chats
-    if fs_data:
-        for chat_id, chat_info in fs_data.items():
-            chat_type = chat_info.get("chat_type", "Unknown")
-            invite_link = chat_info.get("invite_link", "#")
-            buttons.append((chat_type, invite_link, "url"))
+    keyboards.sync()
+    if keyboards.admin:
+        return keyboards.admin
 
+    buttons: List[Tuple[str, str, str]] = [
+        (chat_info["chat_type"], chat_info["invite_link"], "url")
+        for chat_info in cache.fs_chats.values()
+    ]
     button_layouts: List[List[Tuple[str, str, str]]] = [
         buttons[i : i + 3] for i in range(0, len(buttons), 3)
     ]
     button_layouts.append([("Bot Settings", "settings")])
 
-    return ikb(button_layouts)
+    keyboards.admin = ikb(button_layouts)
+    return keyboards.admin
+
+
+def fs_chats_buttons() -> Optional[InlineKeyboardMarkup]:
+    """
+    Creates an inline keyboard with join buttons for every subscription chat,
+    without checking which ones the user has joined.
+
+    Returns:
+        Optional[InlineKeyboardMarkup]: The join buttons, or None if there are no chats.
+    """
+    keyboards.sync()
+    if not keyboards.positions:
+        return None
+    return InlineKeyboardMarkup(
+        keyboards.join_rows((1 << len(keyboards.positions)) - 1)
+    )
 
 
 async def join_buttons(
     client: "Client", message: "Message", user_id: int
-) -> Optional[ikb]:
+) -> Optional[InlineKeyboardMarkup]:
     """
     Creates an inline keyboard with buttons for joining chats the user hasn't joined yet.
 
+    Only the "Try Again" row is built per request; the join rows are cached.
+
     Args:
         client (Client): The hydrogram client instance.
         message (Message): The message that triggered this action.
         user_id (int): The ID of the user for whom the join buttons are being created.
 
     Returns:
-        Optional[ikb]: An inline keyboard with join buttons, or None if the user is already joined.
+        Optional[InlineKeyboardMarkup]: An inline keyboard with join buttons, or None if the user is already joined.
     """
     no_join_ids = await cache.user_is_not_join(user_id)
     if not no_join_ids:
         return None
 
-    buttons: List[Tuple[str, str, str]] = []
-    fs_data = cache.fs_chats
+    keyboards.sync()
+    mask = 0
     for chat_id in no_join_ids:
-        chat_info = fs_data.get(chat_id, {})
-        chat_type = chat_info.get("chat_type", "Unknown")
-        invite_link = chat_info.get("invite_link", "#")
-        buttons.append((f"Join {chat_type}", invite_link, "url"))
-
-    button_layouts: List[List[Tuple[str, str, str]]] = [
-        buttons[i : i + 2] for i in range(0, len(buttons), 2)
-    ]
+        position = keyboards.positions.get(chat_id)
+        result = "miss" if position is None else "hit"
+        metrics.inc("fsub_cache_requests_total", cache="fs_chats", result=result)
+        # Left out if removed while the membership was being checked
+        if position is not None:
+            mask |= 1 << position
+
+    if not mask:
+        return None
 
+    rows = keyboards.join_rows(mask)
     if len(message.command) > 1:
         start_url = f"https://t.me/{client.me.username}?start={message.command[1]}"
-        button_layouts.append([("Try Again", start_url, "url")])
+        rows = rows + [[InlineKeyboardButton("Try Again", url=start_url)]]
 
-    return ikb(button_layouts)
+    return InlineKeyboardMarkup(rows)
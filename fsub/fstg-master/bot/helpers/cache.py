@@ -1,25 +1,32 @@
-from typing import TYPE_CHECKING, Dict, List, Optional
+import asyncio
+import random
+import time
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional
 
 from hydrogram.enums import ChatType
-from hydrogram.errors import RPCError
+from hydrogram.errors import BadRequest, Forbidden, NotAcceptable, RPCError
 
 from bot.base import bot
 from bot.db_funcs import (
     del_fs_chat,
     get_admins,
     get_force_text_msg,
-    get_fs_chats,
+    get_fs_chats_snapshot,
     get_generate_status,
     get_protect_content,
     get_start_text_msg,
+    set_fs_chats_snapshot,
 )
-from bot.utils import logger
+from bot.utils import Template, config, logger, per_bot
 
 if TYPE_CHECKING:
     from hydrogram import Client
+    from hydrogram.types import Chat
 
 
 class Cache:
+    FS_CONCURRENCY: int = 4
+
     def __init__(self, client: "Client") -> None:
         """
         Initializes the Caches with the given bot client.
@@ -30,39 +37,82 @@ class Cache:
         self.client = client
         self.start_text: str = "Initializing..."
         self.force_text: str = "Initializing..."
+        self.start_template: Template = Template(self.start_text)
+        self.force_template: Template = Template(self.force_text)
         self.admins: List[int] = []
+        self.authorized: FrozenSet[int] = frozenset({config.OWNER_ID})
         self.fs_chats: Dict[int, Dict[str, str]] = {}
+        self.fs_chat_ids: List[int] = []
+        self.fs_version: int = 0
+        self.fs_snapshot: Dict[int, Dict[str, Any]] = {}
+        self.fs_task: Optional[asyncio.Task] = None
         self.protect_content: bool = False
         self.generate_status: bool = False
 
-    async def start_text_init(self) -> str:
+    async def start_text_init(self, value: Optional[str] = None) -> str:
         """
-        Initializes the start text from the database.
+        Initializes the start text from the database and compiles it.
+
+        Args:
+            value (Optional[str]): A value already returned by an update,
+                used instead of reading the database again.
 
         Returns:
             str: The start text.
         """
-        self.start_text = await get_start_text_msg()
+        self.start_text = await get_start_text_msg() if value is None else value
+        self.start_template = self.compile_text("Start Text", self.start_text)
         return self.start_text
 
-    async def force_text_init(self) -> str:
+    async def force_text_init(self, value: Optional[str] = None) -> str:
         """
-        Initializes the force text from the database.
+        Initializes the force text from the database and compiles it.
+
+        Args:
+            value (Optional[str]): A value already returned by an update,
+                used instead of reading the database again.
 
         Returns:
             str: The force text.
         """
-        self.force_text = await get_force_text_msg()
+        self.force_text = await get_force_text_msg() if value is None else value
+        self.force_template = self.compile_text("Force Text", self.force_text)
         return self.force_text
 
-    async def admins_init(self) -> List[int]:
+    @staticmethod
+    def compile_text(name: str, text: str) -> Template:
+        """
+        Compiles a stored text, sending it as is if it no longer compiles.
+
+        Args:
+            name (str): The setting name, for the log.
+            text (str): The stored text.
+
+        Returns:
+            Template: The compiled text.
+        """
+        try:
+            return Template(text)
+        except ValueError as exc:
+            logger.warning(f"{name}: {exc}, Sent As Is")
+            return Template.literal(text)
+
+    async def admins_init(self, value: Optional[List[int]] = None) -> List[int]:
         """
-        Initializes the list of admin user IDs from the database and adds the owner ID.
+        Initializes the list of admin user IDs from the database, and the set
+        of authorized IDs, the admins and the owner, swapped in as a whole.
+        Updates of authorized users are served first by the update queue.
+
+        Args:
+            value (Optional[List[int]]): The admins of a document already read,
+                used instead of reading the database again.
 
         Returns:
             List[int]: A list of admin user IDs.
         """
-        self.admins = await get_admins()
+        admins = await get_admins() if value is None else value
+        self.admins, self.authorized = admins, frozenset([*admins, config.OWNER_ID])
+        self.client.updates.priority_ids = self.authorized
         for i, user_id in enumerate(self.admins):
             logger.info(f"Bot Admin {i + 1}: {user_id}")
 
@@ -70,55 +120,232 @@ class Cache:
 
     async def fs_chats_init(self) -> Dict[int, Dict[str, str]]:
         """
-        Initializes the list of free subscription chats from the database and verifies their details.
+        Initializes the subscription chats from the persisted snapshot.
+
+        Chats resolved before are served from the snapshot right away and
+        revalidated in the background; only chats never resolved are looked
+        up before returning. The background refresher is (re)started.
 
         Returns:
-            Dict[int, Dict[str, Union[str, str]]]: A dictionary of chat details.
+            Dict[int, Dict[str, str]]: The chat type and invite link by chat ID.
+        """
+        chat_ids, snapshot = await get_fs_chats_snapshot()
+        self.fs_chat_ids = chat_ids
+        self.fs_snapshot = {cid: snapshot[cid] for cid in chat_ids if cid in snapshot}
+        self.fs_swap()
+
+        if self.fs_chats:
+            oldest = min(self.fs_snapshot[cid]["resolved_at"] for cid in self.fs_chats)
+            logger.info(f"Sub. Chats: Snapshot from {time.time() - oldest:.0f}s ago")
+
+        unresolved = [cid for cid in chat_ids if cid not in self.fs_chats]
+        if unresolved:
+            await self.fs_chats_resolve(unresolved)
+
+        for i, chat_id in enumerate(self.fs_chats):
+            logger.info(f"Sub. Chat {i + 1}: {chat_id}")
+
+        # Chats just looked up are left out of the first revalidation
+        self.fs_refresh_stop()
+        self.fs_task = asyncio.create_task(
+            self.fs_refresher([cid for cid in chat_ids if cid not in unresolved])
+        )
+
+        return self.fs_chats
+
+    async def fs_chats_resolve(self, chat_ids: List[int]) -> None:
+        """
+        Looks up subscription chats concurrently and stores the snapshot.
+
+        A chat failing with a confirmed error, or without an invite link, is
+        still served from its last good entry, and is removed from the
+        database after `FSUB_MAX_FAILURES` of them in a row, never if that is
+        0. Transient errors leave its entry as it was.
+
+        Args:
+            chat_ids (List[int]): The chats to look up.
         """
-        self.fs_chats.clear()  # Restore to default
+        semaphore = asyncio.Semaphore(self.FS_CONCURRENCY)
+        await asyncio.gather(
+            *(self.fs_chat_resolve(chat_id, semaphore) for chat_id in chat_ids)
+        )
 
-        fs_chats = await get_fs_chats()
-        for i, chat_id in enumerate(fs_chats):
+        for chat_id in chat_ids:
+            entry = self.fs_snapshot.get(chat_id)
+            max_failures = config.FSUB_MAX_FAILURES
+            if entry and max_failures and entry["failures"] >= max_failures:
+                logger.warning(f"Sub. Chat {chat_id}: Removed")
+                await del_fs_chat(chat_id)
+                self.fs_chat_ids = [cid for cid in self.fs_chat_ids if cid != chat_id]
+                self.fs_snapshot.pop(chat_id, None)
+
+        self.fs_swap()
+        await set_fs_chats_snapshot(self.fs_snapshot)
+
+    async def fs_chat_resolve(self, chat_id: int, semaphore: asyncio.Semaphore) -> None:
+        """
+        Looks up one subscription chat and updates its snapshot entry.
+
+        Args:
+            chat_id (int): The chat to look up.
+            semaphore (asyncio.Semaphore): Bounds the concurrent lookups.
+        """
+        async with semaphore:
             try:
                 chat = await self.client.get_chat(chat_id=chat_id)
-                chat_type = (
+            except (BadRequest, Forbidden, NotAcceptable) as rpc:
+                chat, reason = None, rpc.MESSAGE
+            except (RPCError, OSError, asyncio.TimeoutError) as exc:
+                logger.warning(f"Sub. Chat {chat_id}: {type(exc).__name__}, Kept")
+                return
+            else:
+                reason = "No Invite Link"
+
+        # Deleted while being looked up
+        if chat_id in self.fs_chat_ids:
+            self.fs_chat_update(chat_id, chat, reason)
+
+    def fs_chat_update(
+        self, chat_id: int, chat: Optional["Chat"], reason: str = "No Invite Link"
+    ) -> None:
+        """
+        Updates the snapshot entry of a subscription chat after a lookup.
+
+        Args:
+            chat_id (int): The chat looked up.
+            chat (Optional[Chat]): The chat found, None if the lookup failed.
+            reason (str): Why the lookup failed, logged with the failure count.
+        """
+        if chat and chat.invite_link:
+            self.fs_snapshot[chat_id] = {
+                "chat_type": (
                     "Group"
                     if chat.type in [ChatType.GROUP, ChatType.SUPERGROUP]
                     else "Channel"
-                )
-                invite_link = chat.invite_link
-                if not invite_link:
-                    raise RPCError
-
-                self.fs_chats[chat_id] = {
-                    "chat_type": chat_type,
-                    "invite_link": invite_link,
-                }
-                logger.info(f"Sub. Chat {i + 1}: {chat_id}")
-            except RPCError as rpc:
-                logger.warning(f"Sub. Chat {i + 1}: {rpc.MESSAGE}")
-                await del_fs_chat(chat_id)
+                ),
+                "invite_link": chat.invite_link,
+                "resolved_at": time.time(),
+                "failures": 0,
+            }
+            return
 
-        return self.fs_chats
+        # Copied, as the served dict may still hold the previous entry
+        entry = dict(self.fs_snapshot.get(chat_id, {"resolved_at": 0.0}))
+        entry["failures"] = entry.get("failures", 0) + 1
+        self.fs_snapshot[chat_id] = entry
+        logger.warning(
+            f"Sub. Chat {chat_id}: {reason} "
+            f"({entry['failures']}/{config.FSUB_MAX_FAILURES})"
+        )
+
+    async def fs_chat_add(self, chat: "Chat") -> bool:
+        """
+        Adds one subscription chat from a chat already looked up, without
+        resolving the other chats again.
 
-    async def protect_content_init(self) -> bool:
+        Args:
+            chat (Chat): The chat to add.
+
+        Returns:
+            bool: Whether the chat is enforced, False until the bot can read
+                an invite link for it.
+        """
+        self.fs_chat_update(chat.id, chat)
+        if chat.id not in self.fs_chat_ids:
+            self.fs_chat_ids = [*self.fs_chat_ids, chat.id]
+
+        self.fs_swap()
+        await set_fs_chats_snapshot(self.fs_snapshot)
+        return chat.id in self.fs_chats
+
+    async def fs_chat_remove(self, chat_id: int) -> None:
+        """
+        Removes one subscription chat, without resolving the other chats again.
+
+        Args:
+            chat_id (int): The chat to remove.
+        """
+        self.fs_chat_ids = [cid for cid in self.fs_chat_ids if cid != chat_id]
+        self.fs_snapshot.pop(chat_id, None)
+
+        self.fs_swap()
+        await set_fs_chats_snapshot(self.fs_snapshot)
+
+    async def fs_refresher(self, chat_ids: List[int]) -> None:
+        """
+        Revalidates the given chats, then all chats every
+        `FSUB_REFRESH_INTERVAL` seconds, give or take a fifth, so that several
+        bots never look their chats up in step. An interval of 0 leaves it
+        at the first revalidation.
+
+        Args:
+            chat_ids (List[int]): The chats to revalidate first.
+        """
+        while True:
+            if chat_ids:
+                try:
+                    await self.fs_chats_resolve(chat_ids)
+                except Exception as exc:
+                    logger.error(f"Sub. Chats: {exc}")
+
+            interval = config.FSUB_REFRESH_INTERVAL
+            if not interval:
+                return
+            await asyncio.sleep(interval * random.uniform(0.8, 1.2))
+            chat_ids = list(self.fs_chat_ids)
+
+    def fs_refresh_stop(self) -> None:
+        """Stops the background refresher."""
+        if self.fs_task:
+            self.fs_task.cancel()
+            self.fs_task = None
+
+    def fs_swap(self) -> None:
+        """
+        Publishes the snapshot entries with an invite link as a new dict, in
+        database order, so readers never see a partial state. Chats failing
+        lookups keep their last good entry until they are removed. The
+        version is bumped whenever the published chats, their order or their
+        links change.
+        """
+        fs_chats = {
+            chat_id: {
+                "chat_type": entry["chat_type"],
+                "invite_link": entry["invite_link"],
+            }
+            for chat_id in self.fs_chat_ids
+            if (entry := self.fs_snapshot.get(chat_id)) and entry.get("invite_link")
+        }
+        if list(fs_chats.items()) != list(self.fs_chats.items()):
+            self.fs_version += 1
+        self.fs_chats = fs_chats
+
+    async def protect_content_init(self, value: Optional[bool] = None) -> bool:
         """
         Initializes the content protection status from the database.
 
+        Args:
+            value (Optional[bool]): A value already returned by an update,
+                used instead of reading the database again.
+
         Returns:
             bool: The content protection status.
         """
-        self.protect_content = await get_protect_content()
+        self.protect_content = await get_protect_content() if value is None else value
         return self.protect_content
 
-    async def generate_status_init(self) -> bool:
+    async def generate_status_init(self, value: Optional[bool] = None) -> bool:
         """
         Initializes the generate status from the database.
 
+        Args:
+            value (Optional[bool]): A value already returned by an update,
+                used instead of reading the database again.
+
         Returns:
             bool: The generate status.
         """
-        self.generate_status = await get_generate_status()
+        self.generate_status = await get_generate_status() if value is None else value
         return self.generate_status
 
     async def user_is_not_join(self, user_id: int) -> Optional[List[int]]:
@@ -129,10 +356,10 @@ class Cache:
             user_id (int): The ID of the user to check.
 
         Returns:
-            Optional[List[int]]: A list of chat IDs that the user has not joined, or None if the user is an admin.
+            Optional[List[int]]: A list of chat IDs that the user has not joined, or None if the user is authorized.
         """
         chat_ids = list(self.fs_chats.keys())
-        if not chat_ids or user_id in self.admins:
+        if not chat_ids or user_id in self.authorized:
             return None
 
         already_joined = set()
@@ -146,4 +373,4 @@ class Cache:
         return [chat_id for chat_id in chat_ids if chat_id not in already_joined]
 
 
-cache: Cache = Cache(bot)
+cache: Cache = per_bot(lambda: Cache(bot))
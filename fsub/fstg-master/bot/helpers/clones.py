@@ -0,0 +1,171 @@
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Pattern
+
+from bot.base import BotError, bot
+from bot.db_funcs import add_clone, del_clone, get_clones
+from bot.utils import config, drop_bot, logger, running_as
+
+from .cache import cache
+from .deferred import deferred
+
+
+class Clones:
+    """
+    The clone bots hosted in this process next to the main bot.
+
+    A clone runs the same plugins under its own token, with its own settings,
+    F-Sub chats and users, while the event loop, the database connection
+    pool, the metrics and the watchdog are shared. Everything kept per bot
+    is a `per_bot` singleton; a clone is started `running_as` its token, so
+    the tasks of its client, and those its handlers create, run as that
+    clone and only add its client and caches to the process.
+
+    Attributes:
+        setup (Optional[Callable[[], Awaitable[Any]]]): Prepares the bot of the
+            current context once its client is started, as for the main bot.
+        tokens (Dict[int, str]): The tokens of the running clones by bot ID.
+        usernames (Dict[int, str]): The usernames of the running clones.
+    """
+
+    TOKEN: Pattern[str] = re.compile(r"^\d+:[\w-]{30,}$")
+
+    def __init__(self) -> None:
+        self.setup: Optional[Callable[[], Awaitable[Any]]] = None
+        self.tokens: Dict[int, str] = {}
+        self.usernames: Dict[int, str] = {}
+
+    async def load(self) -> None:
+        """
+        Starts the clones stored for the main bot, all at once. A clone that
+        fails to start is logged and left stored.
+        """
+        tokens = await get_clones()
+        results = await asyncio.gather(
+            *(self.start(token) for token in tokens), return_exceptions=True
+        )
+        for token, result in zip(tokens, results):
+            if isinstance(result, Exception):
+                logger.error(f"Clone: {token.split(':', 1)[0]}, {result}")
+
+    async def add(self, bot_token: str) -> str:
+        """
+        Starts a clone and stores it, to be started again with the main bot.
+
+        Args:
+            bot_token (str): The token of the clone.
+
+        Returns:
+            str: The username of the clone.
+
+        Raises:
+            BotError: If the token is invalid, already running or rejected.
+        """
+        username = await self.start(bot_token)
+        await add_clone(bot_token)
+        return username
+
+    async def remove(self, bot_id: int) -> bool:
+        """
+        Stops a clone, if it is running, and forgets it. A stored clone that
+        failed to start, such as after its token was revoked, is forgotten too.
+
+        Args:
+            bot_id (int): The ID of the clone.
+
+        Returns:
+            bool: True if the clone was running or stored.
+        """
+        bot_token = self.tokens.get(bot_id)
+        if bot_token is None:
+            stored = await get_clones()
+            bot_token = next(
+                (token for token in stored if token.startswith(f"{bot_id}:")), None
+            )
+            if bot_token is None:
+                return False
+
+        await del_clone(bot_token)
+        if bot_id in self.tokens:
+            await self.stop(bot_token)
+        return True
+
+    async def stopped(self) -> List[int]:
+        """
+        Lists the clones that are stored but not running, such as those that
+        failed to start.
+
+        Returns:
+            List[int]: The IDs of the clones.
+        """
+        bot_ids = (int(token.split(":", 1)[0]) for token in await get_clones())
+        return [bot_id for bot_id in bot_ids if bot_id not in self.tokens]
+
+    async def start(self, bot_token: str) -> str:
+        """
+        Starts the client of a clone and prepares it with `setup`.
+
+        Args:
+            bot_token (str): The token of the clone.
+
+        Returns:
+            str: The username of the clone.
+
+        Raises:
+            BotError: If the token is invalid, already running or rejected.
+        """
+        if not self.TOKEN.match(bot_token):
+            raise BotError("Invalid Bot Token")
+
+        bot_id = int(bot_token.split(":", 1)[0])
+        if bot_id == int(config.BOT_ID) or bot_id in self.tokens:
+            raise BotError("Bot Already Running")
+
+        # Taken before the first await, so a token is never started twice
+        self.tokens[bot_id] = bot_token
+        try:
+            with running_as(bot_token):
+                await bot.start_client()
+                try:
+                    if self.setup:
+                        await self.setup()
+                except BaseException:
+                    cache.fs_refresh_stop()
+                    await bot.stop_client()
+                    raise
+                username = bot.me.username
+        except BaseException:
+            del self.tokens[bot_id]
+            drop_bot(bot_token)
+            raise
+
+        self.usernames[bot_id] = username
+        logger.info(f"Clone: Started @{username} {bot_id}")
+        return username
+
+    async def stop(self, bot_token: str) -> None:
+        """
+        Stops the client of a clone and drops its per-bot state.
+
+        Args:
+            bot_token (str): The token of the clone.
+        """
+        bot_id = int(bot_token.split(":", 1)[0])
+        with running_as(bot_token):
+            cache.fs_refresh_stop()
+            await deferred.close()
+            await bot.stop_client()
+
+        drop_bot(bot_token)
+        self.tokens.pop(bot_id, None)
+        self.usernames.pop(bot_id, None)
+        logger.info(f"Clone: Stopped {bot_id}")
+
+    async def stop_all(self) -> None:
+        """Stops every running clone, as the main bot stops."""
+        await asyncio.gather(
+            *(self.stop(token) for token in list(self.tokens.values()))
+        )
+
+
+clones: Clones = Clones()
@@ -0,0 +1,59 @@
+import asyncio
+from typing import Optional, Set
+
+from bot.db_funcs import add_users
+from bot.utils import logger, per_bot
+
+
+class Deferred:
+    """
+    Database writes put off while the bot sheds load, flushed in bulk.
+
+    Attributes:
+        interval (float): Seconds between flushes.
+        users (Set[int]): User IDs waiting to be added.
+    """
+
+    def __init__(self, interval: float = 5.0) -> None:
+        self.interval = interval
+        self.users: Set[int] = set()
+        self.task: Optional[asyncio.Task] = None
+
+    def add_user(self, user_id: int) -> None:
+        """
+        Adds a user with the next flush.
+
+        Args:
+            user_id (int): The user to add.
+        """
+        self.users.add(user_id)
+        if not self.task:
+            self.task = asyncio.create_task(self.flush())
+
+    async def flush(self) -> None:
+        """Writes the deferred users in one bulk write after the interval."""
+        await asyncio.sleep(self.interval)
+        # Users deferred from now on are left to the next flush
+        self.task = None
+        users, self.users = self.users, set()
+        try:
+            await add_users(list(users))
+        except Exception as exc:
+            logger.error(f"Deferred: {exc}")
+            for user_id in users:
+                self.add_user(user_id)
+
+    async def close(self) -> None:
+        """Writes the deferred users at once, for a bot being stopped."""
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        users, self.users = self.users, set()
+        try:
+            if users:
+                await add_users(list(users))
+        except Exception as exc:
+            logger.error(f"Deferred: {exc}")
+
+
+deferred: Deferred = per_bot(Deferred)
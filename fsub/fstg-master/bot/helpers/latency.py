@@ -0,0 +1,113 @@
+import asyncio
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Awaitable, Callable, Deque, Dict, Optional
+
+from hydrogram.raw.functions import Ping
+
+from bot.base import bot, database
+from bot.utils import config, logger
+
+if TYPE_CHECKING:
+    from hydrogram import Client
+
+
+class LatencySampler:
+    """
+    Pings Telegram and the database in the background and keeps the results.
+
+    Every `interval` seconds one round trip is timed against each target
+    with the monotonic clock; the latest `size` samples of each are kept in
+    a ring buffer, so reading the statistics never waits on the network.
+
+    Attributes:
+        interval (float): Seconds between samples; 0 disables sampling.
+        samples (Dict[str, Deque[Optional[float]]]): Latencies in seconds by
+            target, None for a failed ping.
+    """
+
+    def __init__(self, client: "Client", interval: float, size: int = 120) -> None:
+        """
+        Initializes the LatencySampler with empty ring buffers.
+
+        Args:
+            client (Client): The client whose connection to Telegram is pinged.
+            interval (float): Seconds between samples.
+            size (int): Samples kept per target.
+        """
+        self.client = client
+        self.interval = interval
+        self.targets: Dict[str, Callable[[], Awaitable[object]]] = {
+            "Telegram": lambda: self.client.invoke(Ping(ping_id=0)),
+            database.name: database.ping,
+        }
+        self.samples: Dict[str, Deque[Optional[float]]] = {
+            name: deque(maxlen=size) for name in self.targets
+        }
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Starts sampling in the background, unless it is disabled."""
+        if not self.task and self.interval:
+            self.task = asyncio.create_task(self.run())
+
+    def stop(self) -> None:
+        """Stops sampling."""
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self) -> None:
+        while True:
+            await self.sample()
+            await asyncio.sleep(self.interval)
+
+    async def sample(self) -> None:
+        """Pings every target once, concurrently."""
+        await asyncio.gather(
+            *(self.ping(name, func) for name, func in self.targets.items())
+        )
+
+    async def ping(self, name: str, func: Callable[[], Awaitable[object]]) -> None:
+        started = time.monotonic()
+        try:
+            await func()
+        except Exception as exc:
+            logger.warning(f"Latency: {name} {exc}")
+            self.samples[name].append(None)
+        else:
+            self.samples[name].append(time.monotonic() - started)
+
+    def stats(self, name: str) -> Optional[Dict[str, float]]:
+        """
+        Summarizes the samples of one target.
+
+        Args:
+            name (str): The target name.
+
+        Returns:
+            Optional[Dict[str, float]]: The latest, p50, p95 and max latency
+                in milliseconds, and the failed pings; None without samples.
+        """
+        samples = self.samples[name]
+        ordered = sorted(sample for sample in samples if sample is not None)
+        if not samples:
+            return None
+
+        def rank(fraction: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+        latest = samples[-1]
+        return {
+            "current": latest * 1000 if latest is not None else -1.0,
+            "p50": rank(0.50),
+            "p95": rank(0.95),
+            "max": ordered[-1] * 1000 if ordered else 0.0,
+            "count": len(samples),
+            "failed": len(samples) - len(ordered),
+        }
+
+
+latency: LatencySampler = LatencySampler(bot, interval=config.PING_INTERVAL)
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from bot.utils import config, decode_data, logger, metrics, per_bot
+
+if TYPE_CHECKING:
+    from hydrogram import Client
+    from hydrogram.types import Message
+
+
+class Prefetcher:
+    """
+    Fetches the messages of a payload while its user is at the join wall.
+
+    A user shown the force text usually comes back with "Try Again" for the
+    same payload within seconds, so its messages are fetched from the
+    database chat in the background and kept for `ttl` seconds. A fetch
+    still running when it expires, or evicted by a newer one, is cancelled.
+
+    Attributes:
+        ttl (float): Seconds a fetched payload is kept.
+        size (int): The most payloads kept at once.
+        entries (Dict[str, Tuple[float, asyncio.Task]]): The expiry time and
+            the fetch of each payload, oldest first.
+    """
+
+    def __init__(self, ttl: float, size: int = 1024) -> None:
+        self.ttl = ttl
+        self.size = size
+        self.entries: Dict[str, Tuple[float, asyncio.Task]] = {}
+
+    def start(self, client: "Client", payload: str) -> None:
+        """
+        Starts fetching the messages of a payload, unless already fetched.
+
+        Args:
+            client (Client): The client to fetch with.
+            payload (str): The start payload.
+        """
+        if not self.ttl:
+            return
+
+        now = time.monotonic()
+        entry = self.entries.get(payload)
+        if entry and entry[0] > now:
+            return
+
+        self.drop(payload)
+        while len(self.entries) >= self.size:
+            self.drop(next(iter(self.entries)))
+
+        task = asyncio.create_task(self.fetch(client, payload))
+        self.entries[payload] = (now + self.ttl, task)
+        asyncio.get_running_loop().call_later(self.ttl, self.expire, payload, task)
+
+    async def get(self, client: "Client", payload: str) -> List["Message"]:
+        """
+        Returns the messages of a payload, prefetched if possible.
+
+        Args:
+            client (Client): The client to fetch with on a miss.
+            payload (str): The start payload.
+
+        Returns:
+            List[Message]: The messages, empty ones included.
+        """
+        entry = self.entries.get(payload)
+        msgs = None
+        if entry and entry[0] > time.monotonic():
+            # Shielded, so a cancelled handler leaves the fetch to others
+            try:
+                msgs = await asyncio.shield(entry[1])
+            except asyncio.CancelledError:
+                if not entry[1].cancelled():
+                    raise
+
+        metrics.inc(
+            "fsub_cache_requests_total",
+            cache="prefetch",
+            result="miss" if msgs is None else "hit",
+        )
+        if msgs is None:
+            msgs = await client.get_messages(
+                config.DATABASE_CHAT_ID, decode_data(payload)
+            )
+        return msgs
+
+    async def fetch(self, client: "Client", payload: str) -> Optional[List["Message"]]:
+        try:
+            return await client.get_messages(
+                config.DATABASE_CHAT_ID, decode_data(payload)
+            )
+        except Exception as exc:
+            # Left to the fetch on delivery, which reports it
+            logger.debug(f"Prefetch: {exc}")
+            return None
+
+    def expire(self, payload: str, task: asyncio.Task) -> None:
+        entry = self.entries.get(payload)
+        if entry and entry[1] is task:
+            self.drop(payload)
+
+    def drop(self, payload: str) -> None:
+        entry = self.entries.pop(payload, None)
+        if entry and not entry[1].done():
+            entry[1].cancel()
+            metrics.inc("fsub_prefetch_cancelled_total")
+
+
+prefetch: Prefetcher = per_bot(lambda: Prefetcher(ttl=config.PREFETCH_TTL))
@@ -0,0 +1,159 @@
+import contextlib
+import functools
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional, Set, Tuple
+
+from hydrogram.errors import RPCError
+
+from bot.utils import config, metrics
+
+from .cache import cache
+
+if TYPE_CHECKING:
+    from hydrogram import Client
+    from hydrogram.types import Message
+
+Handler = Callable[["Client", "Message"], Awaitable[Any]]
+
+
+class Bucket:
+    """
+    The token bucket of one user.
+
+    Attributes:
+        tokens (float): The requests the user may still make right now.
+        updated (float): The monotonic time the tokens were last counted.
+        notified (bool): Whether the user was told they are limited.
+    """
+
+    __slots__ = ("tokens", "updated", "notified")
+
+    def __init__(self, tokens: float, updated: float) -> None:
+        self.tokens = tokens
+        self.updated = updated
+        self.notified = False
+
+
+class Throttle:
+    """
+    Limits how often each user can run a handler, and drops duplicates.
+
+    Every user gets a token bucket of `burst` requests, refilled at `rate`
+    per second. Buckets are kept least recently used first, at most `size`
+    of them; a bucket idle long enough to be full again is dropped, as a new
+    one would be the same. A request for the same user and payload as one
+    still running is dropped outright.
+
+    One throttle serves every hosted bot, so the buckets of all of them
+    stay within `size`; users are counted separately on each bot.
+
+    Attributes:
+        rate (float): Tokens refilled per second.
+        burst (int): The bucket capacity; 0 disables throttling, as does a 0 rate.
+        size (int): The most buckets kept at once.
+        buckets (OrderedDict[Tuple[str, int], Bucket]): Buckets by bot ID
+            and user ID.
+        in_flight (Set[Tuple[str, int, str]]): Bots, users and payloads being
+            handled.
+    """
+
+    NOTICE: str = "<b>Too many requests! Please wait a moment.</b>"
+
+    def __init__(self, rate: float, burst: int, size: int = 10000) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.size = size
+        self.buckets: "OrderedDict[Tuple[str, int], Bucket]" = OrderedDict()
+        self.in_flight: Set[Tuple[str, int, str]] = set()
+
+    def take(self, key: Tuple[str, int]) -> Optional[bool]:
+        """
+        Takes a token from the bucket of a user.
+
+        Args:
+            key (Tuple[str, int]): The bot and the user making a request.
+
+        Returns:
+            Optional[bool]: True if allowed, False if limited and not yet
+                told so, None if limited and already told.
+        """
+        now = time.monotonic()
+        self.expire(now)
+
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = Bucket(self.burst, now)
+            if len(self.buckets) > self.size:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+            bucket.tokens = min(
+                self.burst, bucket.tokens + (now - bucket.updated) * self.rate
+            )
+            bucket.updated = now
+
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            bucket.notified = False
+            return True
+
+        if bucket.notified:
+            return None
+        bucket.notified = True
+        return False
+
+    def expire(self, now: float) -> None:
+        """Drops the buckets that have been idle long enough to be full."""
+        refill = self.burst / self.rate
+        while self.buckets:
+            key, bucket = next(iter(self.buckets.items()))
+            if now - bucket.updated < refill:
+                break
+            del self.buckets[key]
+
+    def guard(self, func: Handler) -> Handler:
+        """
+        Wraps a command handler, limiting and de-duplicating its requests.
+
+        Authorized users are never limited. Limited users get one notice
+        until they are allowed again.
+
+        Args:
+            func (Handler): The handler, taking the client and the message.
+
+        Returns:
+            Handler: The guarded handler.
+        """
+
+        @functools.wraps(func)
+        async def guarded(client: "Client", message: "Message") -> Any:
+            user_id = message.from_user.id
+            if not self.rate or not self.burst or user_id in cache.authorized:
+                return await func(client, message)
+
+            allowed = self.take((config.BOT_ID, user_id))
+            if not allowed:
+                metrics.inc("fsub_throttled_total", result="limited")
+                if allowed is False:
+                    with contextlib.suppress(RPCError):
+                        await message.reply_text(self.NOTICE, quote=True)
+                return None
+
+            key = (config.BOT_ID, user_id, " ".join(message.command[1:]))
+            if key in self.in_flight:
+                metrics.inc("fsub_throttled_total", result="duplicate")
+                return None
+
+            self.in_flight.add(key)
+            try:
+                return await func(client, message)
+            finally:
+                self.in_flight.discard(key)
+
+        return guarded
+
+
+throttle: Throttle = Throttle(
+    rate=config.THROTTLE_PER_MINUTE / 60, burst=config.THROTTLE_BURST
+)
@@ -1,11 +1,31 @@
+from .calls import calls, current_handler
 from .config import config
-from .logger import logger
+from .context import current_bot, drop_bot, per_bot, running_as
+from .logger import LOG_FILE, logger
+from .logsearch import LOG_LEVELS, search_logs
+from .metrics import metrics
 from .misc import aiofiles_read, decode_data, url_safe
+from .profiler import profiler
+from .template import Template
+from .watchdog import watchdog
 
 __all__ = [
+    "calls",
+    "current_handler",
     "config",
+    "current_bot",
+    "drop_bot",
+    "per_bot",
+    "running_as",
+    "LOG_FILE",
     "logger",
+    "LOG_LEVELS",
+    "search_logs",
+    "metrics",
     "aiofiles_read",
     "decode_data",
+    "profiler",
+    "Template",
     "url_safe",
+    "watchdog",
 ]
@@ -0,0 +1,130 @@
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Deque, Dict, Optional, Tuple
+
+from .config import config
+from .metrics import Histogram
+
+# The plugin handler on whose behalf the current task is calling the API
+current_handler: ContextVar[str] = ContextVar("current_handler", default="background")
+
+
+class CallRecord:
+    """
+    Accounting of the calls to one API method.
+
+    Attributes:
+        count (int): Number of calls.
+        errors (Counter): Failed calls by error class.
+        flood_waits (int): Number of FloodWait errors.
+        flood_seconds (int): Total seconds of FloodWait requested.
+        latency (Histogram): Call latencies.
+    """
+
+    __slots__ = ("count", "errors", "flood_waits", "flood_seconds", "latency")
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.errors: Counter = Counter()
+        self.flood_waits: int = 0
+        self.flood_seconds: int = 0
+        self.latency: Histogram = Histogram()
+
+    def merge(self, other: "CallRecord") -> None:
+        self.count += other.count
+        self.errors.update(other.errors)
+        self.flood_waits += other.flood_waits
+        self.flood_seconds += other.flood_seconds
+        self.latency.merge(other.latency)
+
+
+class CallStats:
+    """
+    Per-method API accounting over a rolling time window.
+
+    Calls are recorded into one-minute slices keyed by handler and method;
+    slices older than the window are dropped as new ones are opened, so
+    memory stays bounded by the window length and the number of methods.
+
+    Attributes:
+        window (int): The window length in seconds, 0 when disabled.
+        slices (Deque): Pairs of slice number and records by (handler, method).
+    """
+
+    SLICE_SECONDS: int = 60
+
+    def __init__(self, window: int) -> None:
+        """
+        Initializes the CallStats instance with an empty window.
+
+        Args:
+            window (int): The window length in seconds; 0 disables recording.
+        """
+        self.window: int = window
+        self.slices: Deque[Tuple[int, Dict[Tuple[str, str], CallRecord]]] = deque()
+
+    def _records(self) -> Dict[Tuple[str, str], CallRecord]:
+        """Returns the records of the current slice, expiring old slices."""
+        now = int(time.monotonic() // self.SLICE_SECONDS)
+        if not self.slices or self.slices[-1][0] != now:
+            self.slices.append((now, {}))
+        oldest = now - max(1, self.window // self.SLICE_SECONDS)
+        while self.slices[0][0] <= oldest:
+            self.slices.popleft()
+        return self.slices[-1][1]
+
+    def record(
+        self,
+        method: str,
+        seconds: float,
+        error: Optional[str] = None,
+        flood_wait: Optional[int] = None,
+    ) -> None:
+        """
+        Records one call, attributed to the handler running it.
+
+        Args:
+            method (str): The raw method name.
+            seconds (float): The call latency.
+            error (Optional[str]): The error class name, if the call failed.
+            flood_wait (Optional[int]): The requested wait, if it was a FloodWait.
+        """
+        if not self.window:
+            return
+
+        key = (current_handler.get(), method)
+        records = self._records()
+        entry = records.get(key)
+        if entry is None:
+            entry = records[key] = CallRecord()
+
+        entry.count += 1
+        entry.latency.observe(seconds)
+        if error:
+            entry.errors[error] += 1
+        if flood_wait is not None:
+            entry.flood_waits += 1
+            entry.flood_seconds += flood_wait
+
+    def summary(self) -> Tuple[Dict[str, CallRecord], Dict[str, Counter]]:
+        """
+        Merges the slices in the window.
+
+        Returns:
+            Tuple[Dict[str, CallRecord], Dict[str, Counter]]: Records by
+                method, and call counts by method for each handler.
+        """
+        methods: Dict[str, CallRecord] = {}
+        handlers: Dict[str, Counter] = {}
+        if self.window:
+            self._records()
+        for _, records in self.slices:
+            for (handler, method), entry in records.items():
+                methods.setdefault(method, CallRecord()).merge(entry)
+                handlers.setdefault(handler, Counter())[method] += entry.count
+
+        return methods, handlers
+
+
+calls: CallStats = CallStats(config.API_STATS_WINDOW)
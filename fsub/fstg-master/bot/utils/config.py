@@ -1,28 +1,71 @@
 import os
 from typing import Optional
 
+from .context import current_bot
+
 
 class Config:
     """
     Configuration class that reads environment variables to set various settings.
+
+    A clone bot shares every setting with the main bot except its token,
+    so `BOT_TOKEN` and `BOT_ID` are those of the bot the current task runs
+    for, see `current_bot`.
     """
 
     def __init__(self):
         self.OWNER_ID = self._get_int_env("OWNER_ID")
         self.API_ID = self._get_int_env("API_ID")
         self.API_HASH: str = os.environ.get("API_HASH", None)
-        self.BOT_TOKEN: str = os.environ.get("BOT_TOKEN", None)
+        self.MAIN_BOT_TOKEN: str = os.environ.get("BOT_TOKEN", None)
         self.MONGODB_URL: str = os.environ.get("MONGODB_URL", None)
         self.DATABASE_CHAT_ID = self._get_int_env("DATABASE_CHAT_ID")
         self.OWNER_USERNAME: str = os.environ.get("OWNER_USERNAME", "@BotFather")
+        self.DATABASE_BACKEND: str = self._parse_database_backend(self.MONGODB_URL)
+        self.SQLITE_PATH: str = self._parse_sqlite_path(self.MONGODB_URL)
+        self.METRICS_PORT = self._get_int_env("METRICS_PORT")
+        self.METRICS_HOST: str = os.environ.get("METRICS_HOST", "127.0.0.1")
+        self.API_STATS_WINDOW: int = self._get_int_env("API_STATS_WINDOW", 0)
+        self.PING_INTERVAL: int = self._get_int_env("PING_INTERVAL", 30)
+        self.LOOP_LAG_MS: int = self._get_int_env("LOOP_LAG_MS", 250)
+        self.SLOW_HANDLER_MS: int = self._get_int_env("SLOW_HANDLER_MS", 5000)
+        self.LOG_JSON: bool = self._get_bool_env("LOG_JSON")
+        self.LOG_QUEUE_SIZE: int = self._get_int_env("LOG_QUEUE_SIZE", 10000)
+        self.LOG_SAMPLE_BURST: int = self._get_int_env("LOG_SAMPLE_BURST", 20)
+        self.FSUB_MAX_FAILURES: int = self._get_int_env("FSUB_MAX_FAILURES", 3)
+        self.FSUB_REFRESH_INTERVAL: int = self._get_int_env(
+            "FSUB_REFRESH_INTERVAL", 3600
+        )
+        self.PREFETCH_TTL: int = self._get_int_env("PREFETCH_TTL", 30)
+        self.THROTTLE_BURST: int = self._get_int_env("THROTTLE_BURST", 5)
+        self.THROTTLE_PER_MINUTE: int = self._get_int_env("THROTTLE_PER_MINUTE", 30)
+        self.WORKERS = self._get_int_env("WORKERS")
+        self.USER_QUEUE_SIZE: int = self._get_int_env("USER_QUEUE_SIZE", 10)
+        self.SHED_QUEUE_AGE_MS: int = self._get_int_env("SHED_QUEUE_AGE_MS", 2000)
+        self.SHED_IN_FLIGHT: int = self._get_int_env("SHED_IN_FLIGHT", 0)
+        self.SHED_BROADCAST_DELAY_MS: int = self._get_int_env(
+            "SHED_BROADCAST_DELAY_MS", 500
+        )
 
         # Perform validation
         self._validate_required_vars()
-        self.BOT_ID = self._parse_bot_id(self.BOT_TOKEN)
+        self.MAIN_BOT_ID = self._parse_bot_id(self.MAIN_BOT_TOKEN)
+
+    @property
+    def BOT_TOKEN(self) -> str:
+        """The token of the current bot."""
+        return current_bot.get() or self.MAIN_BOT_TOKEN
 
-    def _get_int_env(self, key: str) -> Optional[int]:
+    @property
+    def BOT_ID(self) -> Optional[str]:
+        """The ID of the current bot, parsed from its token."""
+        token = current_bot.get()
+        return self._parse_bot_id(token) if token else self.MAIN_BOT_ID
+
+    def _get_int_env(self, key: str, default: Optional[int] = None) -> Optional[int]:
         """
-        Helper method to get an environment variable as an integer.
+        Helper method to get an environment variable as an integer, or
+        `default` if it is unset, so that 0 can be set explicitly.
         """
         value = os.environ.get(key, None)
         if value is not None:
@@ -30,7 +73,14 @@ class Config:
                 return int(value)
             except ValueError:
                 raise ValueError(f"{key}: Invalid")
-        return None
+        return default
+
+    def _get_bool_env(self, key: str) -> bool:
+        """
+        Helper method to get an environment variable as a boolean.
+        """
+        value = os.environ.get(key, "")
+        return value.strip().lower() in {"1", "true", "yes", "on"}
 
     def _parse_bot_id(self, bot_token: str) -> Optional[str]:
         """
@@ -40,18 +90,47 @@ class Config:
             return bot_token.split(":", 1)[0]
         return None
 
+    def _parse_database_backend(self, database_url: Optional[str]) -> str:
+        """
+        Helper method to select the database backend.
+
+        DATABASE_BACKEND takes precedence; otherwise a `sqlite://` or
+        `memory://` MONGODB_URL selects that backend and anything else
+        selects MongoDB.
+        """
+        backend = os.environ.get("DATABASE_BACKEND", None)
+        if backend is None:
+            scheme = database_url.split("://", 1)[0] if database_url else ""
+            backend = scheme if scheme in {"sqlite", "memory"} else "mongodb"
+
+        backend = backend.lower()
+        if backend not in {"mongodb", "sqlite", "memory"}:
+            raise ValueError("DATABASE_BACKEND: Invalid")
+        return backend
+
+    def _parse_sqlite_path(self, database_url: Optional[str]) -> str:
+        """
+        Helper method to get the SQLite file path, from a URL such as
+        `sqlite:///relative.db` or `sqlite:////absolute/path.db`.
+        """
+        if database_url and database_url.startswith("sqlite:///"):
+            return database_url[len("sqlite:///") :] or "fsub.sqlite3"
+        return os.environ.get("SQLITE_PATH", "fsub.sqlite3")
+
     def _validate_required_vars(self):
         """
         Validate that all required environment variables are present.
         """
         required_vars = {
-            "BOT_TOKEN": self.BOT_TOKEN,
-            "MONGODB_URL": self.MONGODB_URL,
+            "BOT_TOKEN": self.MAIN_BOT_TOKEN,
             "API_HASH": self.API_HASH,
             "OWNER_ID": self.OWNER_ID,
             "API_ID": self.API_ID,
             "DATABASE_CHAT_ID": self.DATABASE_CHAT_ID,
         }
+        if self.DATABASE_BACKEND == "mongodb":
+            required_vars["MONGODB_URL"] = self.MONGODB_URL
+
         for var_name, value in required_vars.items():
             if value is None:
                 raise ValueError(f"{var_name}: Missed")
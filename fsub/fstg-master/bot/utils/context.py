@@ -0,0 +1,101 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar, cast
+
+T = TypeVar("T")
+
+# The token of the clone bot the current task runs for, None for the main bot
+current_bot: ContextVar[Optional[str]] = ContextVar("current_bot", default=None)
+
+
+class PerBot:
+    """
+    A module singleton kept once per hosted bot.
+
+    Attribute access is forwarded to the instance of the bot the current
+    task runs for, see `current_bot`. Each instance is created by `factory`
+    on first use, in the context of its bot, so it may itself use other
+    per-bot singletons.
+
+    Attributes:
+        registry (List[PerBot]): Every per-bot singleton, to drop a bot from.
+    """
+
+    __slots__ = ("_factory", "_instances")
+
+    registry: List["PerBot"] = []
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instances", {})
+        PerBot.registry.append(self)
+
+    def __getattribute__(self, name: str) -> Any:
+        # Rather than __getattr__, which only runs after a failed lookup and
+        # is several times slower on the hot paths
+        return getattr(instance(self), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(instance(self), name, value)
+
+    def __repr__(self) -> str:
+        return f"<PerBot {instance(self)!r}>"
+
+
+def instance(singleton: PerBot) -> Any:
+    """
+    Returns the instance of a per-bot singleton for the current bot.
+
+    Args:
+        singleton (PerBot): The singleton.
+
+    Returns:
+        Any: The instance, created if it does not exist yet.
+    """
+    instances: Dict[Optional[str], Any] = object.__getattribute__(
+        singleton, "_instances"
+    )
+    key = current_bot.get()
+    obj = instances.get(key)
+    if obj is None:
+        obj = instances[key] = object.__getattribute__(singleton, "_factory")()
+    return obj
+
+
+def per_bot(factory: Callable[[], T]) -> T:
+    """
+    Creates a module singleton kept once per hosted bot.
+
+    Args:
+        factory (Callable[[], T]): Creates the instance of one bot.
+
+    Returns:
+        T: A proxy to the instance of the current bot.
+    """
+    return cast(T, PerBot(factory))
+
+
+def drop_bot(token: str) -> None:
+    """
+    Forgets the per-bot instances of a clone bot.
+
+    Args:
+        token (str): The token of the clone.
+    """
+    for singleton in PerBot.registry:
+        object.__getattribute__(singleton, "_instances").pop(token, None)
+
+
+@contextmanager
+def running_as(token: Optional[str]) -> Iterator[None]:
+    """
+    Runs the enclosed code, and the tasks it creates, for a hosted bot.
+
+    Args:
+        token (Optional[str]): The token of a clone, None for the main bot.
+    """
+    reset = current_bot.set(token)
+    try:
+        yield
+    finally:
+        current_bot.reset(reset)
@@ -1,10 +1,20 @@
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
-from typing import TYPE_CHECKING
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import TYPE_CHECKING, Dict, Tuple
+
+from .config import config
 
 if TYPE_CHECKING:
     import logging.Logger
 
+LOG_FILE = "logs.txt"
+LOG_BACKUPS = 1
+
 
 class PaddedLevelFormatter(logging.Formatter):
     def format(self, record) -> str:
@@ -19,12 +29,121 @@ class PaddedLevelFormatter(logging.Formatter):
         return super().format(record)
 
 
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as JSON lines with time, level, logger name and message.
+    """
+
+    def format(self, record) -> str:
+        return json.dumps(
+            {
+                "time": self.formatTime(record, self.datefmt),
+                "level": logging.getLevelName(record.levelno),
+                "name": record.name,
+                "message": record.getMessage(),
+            },
+            ensure_ascii=False,
+        )
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Limits each call site to `burst` records per second below ERROR level.
+
+    Suppressed records are counted, and the count is appended to the next
+    record let through from the same call site.
+
+    Attributes:
+        burst (int): Records allowed per call site and second; 0 disables sampling.
+        suppressed (int): Total number of suppressed records.
+    """
+
+    def __init__(self, burst: int) -> None:
+        super().__init__()
+        self.burst = burst
+        self.suppressed = 0
+        self.sites: Dict[Tuple[str, int], list] = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not self.burst or record.levelno >= logging.ERROR:
+            return True
+
+        second = int(time.monotonic())
+        with self.lock:
+            site = self.sites.setdefault((record.pathname, record.lineno), [0, 0, 0])
+            if site[0] != second:
+                site[0], site[1] = second, 0
+            site[1] += 1
+            if site[1] > self.burst:
+                site[2] += 1
+                self.suppressed += 1
+                return False
+
+            skipped, site[2] = site[2], 0
+
+        if skipped:
+            record.msg = f"{record.getMessage()} (+{skipped} similar suppressed)"
+            record.args = None
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Enqueues records without blocking, dropping them when the queue is full.
+
+    The number of dropped records is counted and reported by a warning once
+    the queue has room again.
+
+    Attributes:
+        dropped (int): Total number of dropped records.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.unreported = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Leave tracebacks out, as PaddedLevelFormatter always has
+        record.exc_info = None
+        return super().prepare(record)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self.unreported += 1
+            return
+
+        if self.unreported:
+            count, self.unreported = self.unreported, 0
+            notice = logging.LogRecord(
+                record.name,
+                logging.WARNING,
+                __file__,
+                0,
+                f"Logger: Dropped {count} records, queue full",
+                None,
+                None,
+            )
+            try:
+                self.queue.put_nowait(notice)
+            except queue.Full:
+                self.unreported += count
+
+
 class Logger:
     def __init__(self, log_name: str) -> None:
         self.log_name = log_name
         self.log_setup()
 
     def log_setup(self) -> "logging.Logger":
+        """
+        Routes all records through a bounded queue to a writer thread, so
+        that neither file writes nor rotation run on the event loop.
+        """
         log_level = logging.INFO
 
         formatter = PaddedLevelFormatter(
@@ -33,17 +152,36 @@ class Logger:
         )
 
         file_handler = RotatingFileHandler(
-            "logs.txt", mode="a", maxBytes=4194304, backupCount=1, encoding="utf-8"
+            LOG_FILE,
+            mode="a",
+            maxBytes=4194304,
+            backupCount=LOG_BACKUPS,
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(
+            JsonFormatter(datefmt="%Y-%m-%dT%H:%M:%S") if config.LOG_JSON else formatter
         )
-        file_handler.setFormatter(formatter)
         file_handler.setLevel(log_level)
 
         stream_handler = logging.StreamHandler()
         stream_handler.setFormatter(formatter)
         stream_handler.setLevel(log_level)
 
+        self.sampling = SamplingFilter(config.LOG_SAMPLE_BURST)
+        self.queue_handler = DroppingQueueHandler(queue.Queue(config.LOG_QUEUE_SIZE))
+        self.queue_handler.setFormatter(logging.Formatter("%(message)s"))
+        self.queue_handler.addFilter(self.sampling)
+        self.listener = QueueListener(
+            self.queue_handler.queue,
+            file_handler,
+            stream_handler,
+            respect_handler_level=True,
+        )
+        self.listener.start()
+        atexit.register(self.listener.stop)
+
         # Set up the basic configuration
-        logging.basicConfig(level=log_level, handlers=[file_handler, stream_handler])
+        logging.basicConfig(level=log_level, handlers=[self.queue_handler])
 
         self.log = logging.getLogger(self.log_name)
 
@@ -54,4 +192,5 @@ class Logger:
         return self.log
 
 
-logger: "Logger" = Logger(log_name="fsub.bot").log
+log_pipeline: Logger = Logger(log_name="fsub.bot")
+logger: "logging.Logger" = log_pipeline.log
@@ -0,0 +1,106 @@
+import mmap
+import os
+import re
+from typing import Iterator, List, Optional, Pattern
+
+from .logger import LOG_BACKUPS, LOG_FILE
+
+LOG_LEVELS = {
+    "DEBUG": 10,
+    "INFO": 20,
+    "WARN": 30,
+    "WARNING": 30,
+    "ERROR": 40,
+    "CRITICAL": 50,
+}
+
+# Matches the level of plain lines, "[ INFO  ]", and of JSON lines
+LEVEL_PATTERN = re.compile(rb'\[ ([A-Z]+) *\]|"level": "([A-Z]+)"')
+
+
+def log_files() -> List[str]:
+    """
+    Lists the current log file and its rotated backups, newest first.
+
+    Returns:
+        List[str]: The paths that exist.
+    """
+    paths = [LOG_FILE] + [f"{LOG_FILE}.{i}" for i in range(1, LOG_BACKUPS + 1)]
+    return [path for path in paths if os.path.isfile(path)]
+
+
+def reverse_lines(path: str) -> Iterator[bytes]:
+    """
+    Yields the lines of a file from the last to the first.
+
+    The file is memory-mapped, so only the pages holding the lines actually
+    read are loaded, however large the file is.
+
+    Args:
+        path (str): The file to read.
+
+    Yields:
+        bytes: One line, without its newline.
+    """
+    with open(path, mode="rb") as doc:
+        if not os.fstat(doc.fileno()).st_size:
+            return
+
+        with mmap.mmap(doc.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            end = len(mapped)
+            if mapped[end - 1 : end] == b"\n":
+                end -= 1
+            while end > 0:
+                start = mapped.rfind(b"\n", 0, end) + 1
+                yield mapped[start:end]
+                end = start - 1
+
+
+def line_level(line: bytes) -> int:
+    """
+    Reads the level of a log line.
+
+    Args:
+        line (bytes): The raw line.
+
+    Returns:
+        int: The numeric level, or 0 if the line has none.
+    """
+    match = LEVEL_PATTERN.search(line, 0, 96)
+    if not match:
+        return 0
+    return LOG_LEVELS.get((match.group(1) or match.group(2)).decode(), 0)
+
+
+def search_logs(
+    limit: int, level: int = 0, pattern: Optional[Pattern[str]] = None
+) -> List[str]:
+    """
+    Finds the most recent log lines matching a level and a pattern.
+
+    Files are scanned backwards, newest first, and scanning stops as soon as
+    `limit` lines have been found.
+
+    Args:
+        limit (int): The maximum number of lines to return.
+        level (int): The minimum level of returned lines; 0 returns all.
+        pattern (Optional[Pattern[str]]): A pattern the lines must contain.
+
+    Returns:
+        List[str]: The matching lines, oldest first.
+    """
+    matches: List[str] = []
+    for path in log_files():
+        for line in reverse_lines(path):
+            if level and line_level(line) < level:
+                continue
+
+            text = line.decode("utf-8", errors="replace")
+            if pattern and not pattern.search(text):
+                continue
+
+            matches.append(text)
+            if len(matches) >= limit:
+                return matches[::-1]
+
+    return matches[::-1]
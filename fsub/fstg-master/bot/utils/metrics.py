@@ -0,0 +1,282 @@
+import asyncio
+import functools
+import time
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+from .logger import log_pipeline, logger
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Upper bounds in seconds, covering cache hits up to slow API calls
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """
+    Bucketed observations of one labelled series.
+
+    Attributes:
+        counts (List[int]): Observations per bucket, the last one unbounded.
+        sum (float): The sum of all observations.
+        count (int): The number of observations.
+    """
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(DEFAULT_BUCKETS) + 1)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(DEFAULT_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: "Histogram") -> None:
+        """Adds the observations of another histogram to this one."""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.count += other.count
+
+    def quantile(self, fraction: float) -> float:
+        """
+        Estimates a quantile as the upper bound of the bucket containing it.
+
+        Args:
+            fraction (float): The quantile as a fraction, e.g. 0.95.
+
+        Returns:
+            float: The estimate in seconds; observations above the last bound
+                report that bound.
+        """
+        rank, cumulative = fraction * self.count, 0
+        for bound, count in zip(DEFAULT_BUCKETS, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return DEFAULT_BUCKETS[-1]
+
+
+class Metrics:
+    """
+    A process-wide registry of counters, gauges and histograms.
+
+    Recording is a dictionary update on the event loop, so it costs next to
+    nothing on the hot path. The registry is rendered in the Prometheus text
+    format by `render`, optionally over a local HTTP endpoint started by `serve`.
+
+    Attributes:
+        counters (Dict[str, Dict[Labels, float]]): Monotonic totals.
+        gauges (Dict[str, Dict[Labels, float]]): Current values.
+        histograms (Dict[str, Dict[Labels, Histogram]]): Latency distributions.
+        collectors (List[Callable[[], None]]): Called before each render to
+            copy in values kept elsewhere.
+    """
+
+    def __init__(self) -> None:
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.gauges: Dict[str, Dict[Labels, float]] = {}
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self.collectors: List[Callable[[], None]] = []
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """
+        Increments a counter.
+
+        Args:
+            name (str): The metric name.
+            value (float): The amount to add.
+            **labels: The label values of the series.
+        """
+        series = self.counters.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        """
+        Sets a gauge.
+
+        Args:
+            name (str): The metric name.
+            value (float): The current value.
+            **labels: The label values of the series.
+        """
+        self.gauges.setdefault(name, {})[_labels(labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """
+        Records a duration in a histogram.
+
+        Args:
+            name (str): The metric name.
+            value (float): The duration in seconds.
+            **labels: The label values of the series.
+        """
+        series = self.histograms.setdefault(name, {})
+        key = _labels(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        histogram.observe(value)
+
+    def timed(
+        self,
+        func: Callable[..., Awaitable[Any]],
+        name: str,
+        ignore: Tuple[Type[BaseException], ...] = (),
+        **labels: Any,
+    ) -> Callable[..., Awaitable[Any]]:
+        """
+        Wraps a coroutine function to record its latency and errors.
+
+        The latency goes to `<name>_seconds` and raised exceptions are counted
+        in `<name>_errors_total` by class name, except those in `ignore`.
+
+        Args:
+            func (Callable): The coroutine function to wrap.
+            name (str): The metric name prefix.
+            ignore (Tuple[Type[BaseException], ...]): Exceptions used for control flow.
+            **labels: The label values of the series.
+
+        Returns:
+            Callable: The wrapped coroutine function.
+        """
+        seconds, errors = f"{name}_seconds", f"{name}_errors_total"
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except ignore:
+                raise
+            except Exception as exc:
+                self.inc(errors, error=type(exc).__name__, **labels)
+                raise
+            finally:
+                self.observe(seconds, time.perf_counter() - started, **labels)
+
+        return wrapper
+
+    def render(self) -> str:
+        """
+        Renders every series in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text.
+        """
+        for collector in self.collectors:
+            collector()
+
+        lines: List[str] = []
+        for kind, registry in (("counter", self.counters), ("gauge", self.gauges)):
+            for name, series in sorted(registry.items()):
+                lines.append(f"# TYPE {name} {kind}")
+                for key, value in series.items():
+                    lines.append(f"{name}{_format(key)} {value:g}")
+
+        for name, series in sorted(self.histograms.items()):
+            lines.append(f"# TYPE {name} histogram")
+            for key, histogram in series.items():
+                cumulative = 0
+                for bound, count in zip(DEFAULT_BUCKETS + (None,), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound is None else f"{bound:g}"
+                    bucket = _format(key + (("le", le),))
+                    lines.append(f"{name}_bucket{bucket} {cumulative}")
+                lines.append(f"{name}_sum{_format(key)} {histogram.sum:.6f}")
+                lines.append(f"{name}_count{_format(key)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Answers one HTTP request: `GET /metrics` renders the registry.
+        """
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=5)
+            while (await asyncio.wait_for(reader.readline(), timeout=5)).strip():
+                pass
+
+            parts = request.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1] == "/metrics":
+                status, body = "200 OK", self.render().encode()
+            else:
+                status, body = "404 Not Found", b"Not Found\n"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> Optional[asyncio.AbstractServer]:
+        """
+        Starts the HTTP endpoint.
+
+        Args:
+            host (str): The address to bind.
+            port (int): The port to listen on.
+
+        Returns:
+            Optional[asyncio.AbstractServer]: The server, or None if it could not bind.
+        """
+        try:
+            server = await asyncio.start_server(self.handle, host, port)
+        except OSError as exc:
+            logger.error(f"Metrics: {exc}")
+            return None
+
+        logger.info(f"Metrics: http://{host}:{port}/metrics")
+        return server
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format(key: Labels) -> str:
+    if not key:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(name, value.replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in key
+    )
+    return "{" + pairs + "}"
+
+
+def _collect_logging() -> None:
+    metrics.counters["fsub_log_dropped_total"] = {
+        (): float(log_pipeline.queue_handler.dropped)
+    }
+    metrics.counters["fsub_log_suppressed_total"] = {
+        (): float(log_pipeline.sampling.suppressed)
+    }
+    metrics.set("fsub_log_queue_depth", log_pipeline.queue_handler.queue.qsize())
+
+
+metrics: Metrics = Metrics()
+metrics.collectors.append(_collect_logging)
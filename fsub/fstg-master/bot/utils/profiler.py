@@ -0,0 +1,134 @@
+import asyncio
+import os
+import tracemalloc
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Tuple
+
+
+class Profiler:
+    """
+    On-demand CPU and memory profiling of the running bot.
+
+    Both profiles cover the event-loop thread for a fixed duration while
+    the bot keeps serving updates. Only one profile runs at a time.
+
+    Attributes:
+        running (bool): Whether a profile is in progress.
+    """
+
+    def __init__(self) -> None:
+        self.running: bool = False
+
+    async def cpu(self, seconds: float, path: str, limit: int = 15) -> str:
+        """
+        Profiles the event-loop thread with cProfile.
+
+        Args:
+            seconds (float): The profiling duration.
+            path (str): Where the raw stats file is written.
+            limit (int): The number of functions listed.
+
+        Returns:
+            str: The functions with the most own time, one per line.
+        """
+        # Imported on demand, profiling being rare
+        import cProfile
+        import pstats
+
+        profile = cProfile.Profile()
+        async with self.busy():
+            profile.enable()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                profile.disable()
+
+        profile.dump_stats(path)
+        stats = pstats.Stats(profile)
+        # Time spent waiting in the selector is the loop being idle
+        ranked = sorted(
+            (item for item in stats.stats.items() if not is_idle(*item[0])),
+            key=lambda item: item[1][2],
+            reverse=True,
+        )
+
+        lines: List[str] = []
+        for (filename, lineno, name), (_, calls, own, total, _) in ranked[:limit]:
+            lines.append(
+                f"{own * 1000:8.1f} {total * 1000:8.1f} {calls:7} "
+                f"{name} ({os.path.basename(filename)}:{lineno})"
+            )
+
+        header = f"{'own ms':>8} {'cum ms':>8} {'calls':>7} function"
+        return "\n".join([header, *lines])
+
+    async def memory(self, seconds: float, limit: int = 10) -> Tuple[str, str]:
+        """
+        Compares two tracemalloc snapshots taken `seconds` apart.
+
+        Tracing is started for the duration if it was not already running;
+        allocations made before it started are not seen.
+
+        Args:
+            seconds (float): The time between the snapshots.
+            limit (int): The number of sites listed.
+
+        Returns:
+            Tuple[str, str]: The largest allocation sites, and the sites
+                that grew the most between the snapshots.
+        """
+        async with self.busy():
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+            try:
+                before = tracemalloc.take_snapshot()
+                await asyncio.sleep(seconds)
+                after = tracemalloc.take_snapshot()
+            finally:
+                if started:
+                    tracemalloc.stop()
+
+        ignored = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        )
+        before, after = before.filter_traces(ignored), after.filter_traces(ignored)
+
+        top = [
+            f"{stat.size / 1024:9.1f} KiB {stat.count:7} {format_site(stat.traceback)}"
+            for stat in after.statistics("lineno")[:limit]
+        ]
+        growth = [
+            f"{stat.size_diff / 1024:+9.1f} KiB {stat.count_diff:+7} "
+            f"{format_site(stat.traceback)}"
+            for stat in after.compare_to(before, "lineno")[:limit]
+            if stat.size_diff
+        ]
+        return "\n".join(top), "\n".join(growth)
+
+    @asynccontextmanager
+    async def busy(self) -> AsyncIterator[None]:
+        """Marks the profiler busy, refusing to run two profiles at once."""
+        if self.running:
+            raise RuntimeError("A profile is already running")
+
+        self.running = True
+        try:
+            yield
+        finally:
+            self.running = False
+
+
+def is_idle(filename: str, lineno: int, name: str) -> bool:
+    return filename == "~" and name.startswith(
+        ("<method 'poll'", "<method 'select'", "<method 'control'")
+    )
+
+
+def format_site(traceback: tracemalloc.Traceback) -> str:
+    frame = traceback[0]
+    return f"{os.path.basename(frame.filename)}:{frame.lineno}"
+
+
+profiler: Profiler = Profiler()
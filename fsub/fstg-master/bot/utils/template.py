@@ -0,0 +1,123 @@
+import string
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from hydrogram.enums import ParseMode
+from hydrogram.types import User
+
+
+def full_name(user: "User") -> str:
+    first_name, last_name = user.first_name, user.last_name
+    return f"{first_name} {last_name}".strip() if last_name else first_name
+
+
+PLACEHOLDERS: Dict[str, Callable[["User"], Any]] = {
+    "first_name": lambda user: user.first_name,
+    "last_name": lambda user: user.last_name,
+    "full_name": full_name,
+    "mention": lambda user: user.mention(full_name(user)),
+}
+
+CONVERSIONS: Dict[str, Callable[[Any], str]] = {"s": str, "r": repr, "a": ascii}
+
+# Rendered once by every new template, with the optional fields missing
+SAMPLE_USER: User = User(
+    id=0, first_name="User", client=SimpleNamespace(parse_mode=ParseMode.HTML)
+)
+
+
+class Template:
+    """
+    A start or force text compiled once, in the syntax of `str.format`.
+
+    Only the placeholders listed in `PLACEHOLDERS` and the conversions in
+    `CONVERSIONS` are accepted, and only the placeholders the text uses are
+    computed when it is rendered. A text is rendered once for
+    `SAMPLE_USER` when compiled, so a format spec that cannot be applied
+    fails here rather than on every /start.
+
+    Attributes:
+        text (str): The source text.
+        parts (List[Union[str, Tuple[str, str, str]]]): Literal text, and
+            placeholders as (name, format spec, conversion).
+        fields (List[str]): The placeholders used, each once.
+    """
+
+    __slots__ = ("text", "parts", "fields")
+
+    def __init__(self, text: str) -> None:
+        """
+        Compiles a text.
+
+        Args:
+            text (str): The text with its placeholders.
+
+        Raises:
+            ValueError: If the text is malformed, uses an unknown placeholder
+                or conversion, or cannot be rendered.
+        """
+        self.text = text
+        self.parts: List[Union[str, Tuple[str, str, str]]] = []
+        for literal, field, spec, conversion in string.Formatter().parse(text):
+            if literal:
+                self.parts.append(literal)
+            if field is None:
+                continue
+            if field not in PLACEHOLDERS:
+                raise ValueError(f"Unknown placeholder {{{field}}}")
+            if "{" in (spec or ""):
+                raise ValueError(f"Nested placeholder in {{{field}}}")
+            if conversion and conversion not in CONVERSIONS:
+                raise ValueError(f"Unknown conversion !{conversion} in {{{field}}}")
+            self.parts.append((field, spec or "", conversion or ""))
+
+        self.fields = list(
+            dict.fromkeys(p[0] for p in self.parts if isinstance(p, tuple))
+        )
+        try:
+            self.render(SAMPLE_USER)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid format: {exc}") from None
+
+    @classmethod
+    def literal(cls, text: str) -> "Template":
+        """
+        Wraps a text rendered as is, for stored texts that fail to compile.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            Template: A template without placeholders.
+        """
+        template = cls("")
+        template.text, template.parts = text, [text]
+        return template
+
+    def render(self, user: "User") -> str:
+        """
+        Fills in the placeholders for a user.
+
+        Args:
+            user (User): The user the text is sent to.
+
+        Returns:
+            str: The rendered text.
+        """
+        if not self.fields:
+            return "".join(self.parts)
+
+        values = {name: PLACEHOLDERS[name](user) for name in self.fields}
+        rendered = []
+        for part in self.parts:
+            if isinstance(part, str):
+                rendered.append(part)
+                continue
+
+            name, spec, conversion = part
+            value = values[name]
+            if conversion:
+                value = CONVERSIONS[conversion](value)
+            rendered.append(format(value, spec))
+
+        return "".join(rendered)
@@ -0,0 +1,252 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from types import FrameType
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from .config import config
+from .logger import logger
+from .metrics import metrics
+
+
+class Tracked:
+    """
+    A handler call in progress.
+
+    Attributes:
+        name (str): The handler name.
+        detail (str): The command or callback data, and the user.
+        started (float): The monotonic start time.
+        reported (bool): Whether it was already logged as slow.
+    """
+
+    __slots__ = ("name", "detail", "started", "reported")
+
+    def __init__(self, name: str, detail: str) -> None:
+        self.name = name
+        self.detail = detail
+        self.started = time.monotonic()
+        self.reported = False
+
+
+class Watchdog:
+    """
+    Samples event-loop lag and times every plugin handler.
+
+    A loop task wakes up every `interval` seconds; how late it wakes up is
+    the loop lag. A daemon thread watches the same heartbeat, so a callback
+    blocking the loop is caught while it blocks and logged with the stack
+    of the loop thread. Handlers running longer than the slow threshold are
+    logged with their command, user and await chain.
+
+    Attributes:
+        interval (float): Seconds between lag samples.
+        lag_threshold (float): Lag in seconds that gets logged; 0 disables it.
+        slow_threshold (float): Handler duration in seconds that gets logged;
+            0 disables it.
+        lags (Deque[float]): The most recent lag samples.
+        durations (Dict[str, Deque[float]]): Recent durations by handler.
+        slow (Counter): Slow calls by handler.
+        in_flight (Dict[asyncio.Task, Tracked]): Handler calls in progress.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        lag_threshold: float,
+        slow_threshold: float,
+        samples: int = 600,
+    ) -> None:
+        self.interval = interval
+        self.lag_threshold = lag_threshold
+        self.slow_threshold = slow_threshold
+        self.samples = samples
+        self.lags: Deque[float] = deque(maxlen=samples)
+        self.durations: Dict[str, Deque[float]] = {}
+        self.slow: Counter = Counter()
+        self.in_flight: Dict[asyncio.Task, Tracked] = {}
+        self.beat = time.monotonic()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread: Optional[int] = None
+        self.task: Optional[asyncio.Task] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts the lag sampler and the stall detector on the running loop."""
+        if self.task:
+            return
+
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self.beat = time.monotonic()
+        self.task = self.loop.create_task(self.sample())
+        self.thread = threading.Thread(target=self.watch, name="watchdog", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stops the lag sampler; the stall detector exits with it."""
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    async def sample(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self.beat = now
+            self.lags.append(lag)
+            metrics.observe("fsub_loop_lag_seconds", lag)
+            self.check_handlers(now)
+
+    def watch(self) -> None:
+        """Runs in a thread, logging the loop stack whenever the loop stalls."""
+        reported = None
+        while self.task:
+            time.sleep(self.interval)
+            beat = self.beat
+            stalled = time.monotonic() - beat - self.interval
+            lagging = self.lag_threshold and stalled >= self.lag_threshold
+            if not lagging or reported == beat:
+                continue
+
+            reported = beat
+            frame = sys._current_frames().get(self.loop_thread)
+            task = asyncio.current_task(self.loop)
+            tracked = self.in_flight.get(task) if task else None
+            where = f"{tracked.name} ({tracked.detail})" if tracked else "loop"
+            logger.warning(
+                f"Loop: Blocked over {stalled * 1000:.0f} ms in {where} "
+                f"at {format_frames(walk_frames(frame))}"
+            )
+
+    def check_handlers(self, now: float) -> None:
+        """Logs in-flight handlers crossing the slow threshold, with their await chain."""
+        if not self.slow_threshold:
+            return
+
+        for task, tracked in list(self.in_flight.items()):
+            if tracked.reported or now - tracked.started < self.slow_threshold:
+                continue
+
+            tracked.reported = True
+            logger.warning(
+                f"Handler: {tracked.name} ({tracked.detail}) running "
+                f"{(now - tracked.started) * 1000:.0f} ms "
+                f"at {format_frames(await_chain(task))}"
+            )
+
+    @contextmanager
+    def track(self, name: str, update: Any) -> Iterator[None]:
+        """
+        Times one handler call.
+
+        Args:
+            name (str): The handler name.
+            update (Any): The message or callback query being handled.
+        """
+        task = asyncio.current_task()
+        tracked = Tracked(name, describe(update))
+        self.in_flight[task] = tracked
+        try:
+            yield
+        finally:
+            if self.in_flight.get(task) is tracked:
+                del self.in_flight[task]
+
+            elapsed = time.monotonic() - tracked.started
+            durations = self.durations.get(name)
+            if durations is None:
+                durations = self.durations[name] = deque(maxlen=self.samples)
+            durations.append(elapsed)
+            if self.slow_threshold and elapsed >= self.slow_threshold:
+                self.slow[name] += 1
+                logger.warning(
+                    f"Handler: {name} ({tracked.detail}) took {elapsed * 1000:.0f} ms"
+                )
+
+    def summary(self) -> Tuple[Dict[str, float], List[Tuple[str, Dict[str, float]]]]:
+        """
+        Summarizes the recent loop lag and handler durations.
+
+        Returns:
+            Tuple: Lag percentiles in seconds, and per-handler count,
+                percentiles and slow calls, slowest p95 first.
+        """
+        handlers = [
+            (name, {**percentiles(durations), "slow": self.slow[name]})
+            for name, durations in self.durations.items()
+        ]
+        handlers.sort(key=lambda item: item[1]["p95"], reverse=True)
+        return percentiles(self.lags), handlers
+
+
+def percentiles(samples: Deque[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {"count": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+    def rank(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "p50": rank(0.50),
+        "p95": rank(0.95),
+        "p99": rank(0.99),
+        "max": ordered[-1],
+    }
+
+
+def describe(update: Any) -> str:
+    """Names the command or callback data of an update, and its user."""
+    user = getattr(update, "from_user", None)
+    text = getattr(update, "data", None) or getattr(update, "text", None) or "-"
+    if isinstance(text, bytes):
+        text = text.decode(errors="replace")
+    return f"{(text.split() or ['-'])[0][:32]}, user {user.id if user else '-'}"
+
+
+def walk_frames(frame: Optional[FrameType], limit: int = 6) -> List[FrameType]:
+    """Returns the innermost frames of a thread stack, innermost first."""
+    frames = []
+    while frame is not None and len(frames) < limit:
+        frames.append(frame)
+        frame = frame.f_back
+    return frames
+
+
+def await_chain(task: asyncio.Task, limit: int = 8) -> List[FrameType]:
+    """Returns the frames of the coroutines a task is awaiting, innermost first."""
+    frames = []
+    coro = task.get_coro()
+    while coro is not None and len(frames) < limit:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return frames[::-1]
+
+
+def format_frames(frames: List[FrameType]) -> str:
+    """Formats frames on one line, so that stacks stay searchable in /logs."""
+    if not frames:
+        return "-"
+    return " < ".join(
+        f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)}:"
+        f"{frame.f_lineno})"
+        for frame in frames
+    )
+
+
+watchdog: Watchdog = Watchdog(
+    interval=0.1,
+    lag_threshold=config.LOOP_LAG_MS / 1000,
+    slow_threshold=config.SLOW_HANDLER_MS / 1000,
+)
@@ -9,6 +9,10 @@ except ImportError:
     pass
 
 
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Dict, Optional, TypeVar
+
 import aiofiles.os
 
 from bot import (
@@ -16,13 +20,51 @@ from bot import (
     aiofiles_read,
     bot,
     cache,
+    clones,
     config,
+    deferred,
     del_broadcast_data_id,
     get_broadcast_data_ids,
+    get_setting,
     initial_database,
+    latency,
     logger,
+    set_setting,
+    unwrap_value,
 )
 
+T = TypeVar("T")
+
+
+@asynccontextmanager
+async def phase(name: str) -> AsyncIterator[None]:
+    """
+    Logs how long a startup phase takes.
+
+    Args:
+        name (str): The phase name.
+    """
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        logger.info(f"Startup: {name} {(time.monotonic() - started) * 1000:.0f} ms")
+
+
+async def timed(name: str, coro: Awaitable[T]) -> T:
+    """
+    Awaits a coroutine as a timed startup phase.
+
+    Args:
+        name (str): The phase name.
+        coro (Awaitable[T]): The phase to run.
+
+    Returns:
+        T: The result of the phase.
+    """
+    async with phase(name):
+        return await coro
+
 
 async def send_restart_msg(chat_id: int, message_id: int, text: str) -> None:
     """
@@ -36,20 +78,65 @@ async def send_restart_msg(chat_id: int, message_id: int, text: str) -> None:
     await bot.send_message(chat_id, text, reply_to_message_id=message_id)
 
 
-async def cache_db_init() -> None:
+async def cache_db_init(doc: Dict[str, Any]) -> None:
     """
-    Initializes various cache-related handlers.
+    Initializes the cached settings from the bot document read at startup,
+    without reading the database again.
+
+    Args:
+        doc (Dict[str, Any]): The bot document returned by `initial_database`.
     """
+    admins = doc.get("BOT_ADMINS")
     await asyncio.gather(
-        cache.force_text_init(),
-        cache.start_text_init(),
-        cache.generate_status_init(),
-        cache.protect_content_init(),
-        cache.admins_init(),
-        cache.fs_chats_init(),
+        cache.force_text_init(unwrap_value(doc.get("FORCE_TEXT"), "#")),
+        cache.start_text_init(unwrap_value(doc.get("START_TEXT"), "#")),
+        cache.generate_status_init(unwrap_value(doc.get("GENERATE_URL"), False)),
+        cache.protect_content_init(unwrap_value(doc.get("PROTECT_CONTENT"), False)),
+        cache.admins_init(admins if isinstance(admins, list) else []),
     )
 
 
+async def database_init() -> None:
+    """
+    Applies the database defaults and migrations, then fills the caches.
+    """
+    doc = await timed("Database", initial_database())
+    await cache_db_init(doc)
+
+
+async def bot_commands_init() -> Optional[str]:
+    """
+    Sets up the bot commands unless the same set was already set up.
+
+    Returns:
+        Optional[str]: The digest to store once the database is ready, or
+            None if nothing changed.
+    """
+    digest = bot.commands_digest()
+    if await get_setting("COMMANDS_DIGEST", None) == digest:
+        logger.info("Bot Commands: Unchanged")
+        return None
+
+    return digest if await bot.bot_commands_setup() else None
+
+
+async def bot_init() -> None:
+    """
+    Prepares the bot of the current context once its client is started:
+    bot commands, database defaults with the settings cache, and F-Sub chat
+    resolution, concurrently. Run for the main bot and for every clone.
+    """
+    digest, *_ = await asyncio.gather(
+        timed("Bot Commands", bot_commands_init()),
+        timed("Settings", database_init()),
+        timed("F-Sub Chats", cache.fs_chats_init()),
+    )
+
+    # Written after the defaults, so it never creates the bot document
+    if digest:
+        await set_setting("COMMANDS_DIGEST", digest)
+
+
 async def restart_data_init() -> None:
     """
     Handles the initialization process when the bot restarts, including sending messages and handling broadcast data.
@@ -82,21 +169,24 @@ async def main() -> None:
     """
     Main function to initialize and run the bot, including database setup, cache initialization,
     restart handling, and setting up the scheduler.
-    """
-    # Start bot and connect MongoDB
-    await bot.start()
-
-    # Initializing MongoDB
-    await initial_database()
 
-    # Fetching MongoDB
-    await cache_db_init()
+    Phases that do not depend on each other run concurrently: bot commands,
+    database defaults with the settings cache, F-Sub chat resolution and
+    restart messages. Each phase is timed. The stored clone bots are then
+    started in this process, sharing its database connection.
+    """
+    async with phase("Total"):
+        # Start bot and connect the database
+        await timed("Connect", bot.start())
+        latency.start()
 
-    # Initializing BroadcastID
-    await restart_data_init()
+        await asyncio.gather(bot_init(), timed("Restart Data", restart_data_init()))
 
     logger.info(f"@{bot.me.username} {config.BOT_ID}")
 
+    clones.setup = bot_init
+    await timed("Clones", clones.load())
+
 
 if __name__ == "__main__":
     loop = asyncio.get_event_loop()
@@ -110,5 +200,9 @@ if __name__ == "__main__":
     except BotError as e:
         logger.error(str(e))
     finally:
+        latency.stop()
+        cache.fs_refresh_stop()
+        loop.run_until_complete(clones.stop_all())
+        loop.run_until_complete(deferred.close())
         loop.run_until_complete(bot.stop())
         loop.close()
@@ -1,15 +1,22 @@
 list_available_commands = [
+    "apistats",
     "batch",
     "broadcast",
     "bc",
+    "clone",
+    "clones",
+    "lag",
     "logs",
     "log",
+    "memprofile",
     "ping",
     "privacy",
+    "profile",
     "restart",
     "r",
     "start",
     "stop",
+    "unclone",
     "users",
     "uptime",
     "set",
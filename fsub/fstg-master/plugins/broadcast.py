@@ -9,11 +9,14 @@ from bot import (
     add_broadcast_data_id,
     button,
     cache,
+    config,
     del_broadcast_data_id,
     del_user,
     filter_broadcast,
     get_users,
     logger,
+    metrics,
+    per_bot,
 )
 
 if TYPE_CHECKING:
@@ -45,10 +48,11 @@ class BroadcastManager:
             reply_markup=ikb(button.Broadcast),
         )
 
-        users, admins = await get_users(), cache.admins
-        user_ids = [user for user in users if user not in admins]
+        users, authorized = await get_users(), cache.authorized
+        user_ids = [user for user in users if user not in authorized]
 
         self.is_running, self.total = True, len(user_ids)
+        metrics.set("fsub_broadcast_running", 1)
         logger.info("Broadcast: Starting...")
 
         chat_id, message_id = message.chat.id, progress_msg.id
@@ -57,16 +61,25 @@ class BroadcastManager:
         for user_id in user_ids:
             if not self.is_running:
                 break
+            # Paced down while user updates are backed up
+            if client.updates.overloaded():
+                await asyncio.sleep(config.SHED_BROADCAST_DELAY_MS / 1000)
 
             try:
                 await broadcast_msg.copy(user_id, protect_content=cache.protect_content)
                 self.sent += 1
+                metrics.inc("fsub_broadcast_messages_total", result="sent")
             except FloodWait as fw:
                 logger.warning(f"FloodWait: Sleep {fw.value}")
+                metrics.inc("fsub_broadcast_messages_total", result="flood_wait")
+                metrics.inc(
+                    "fsub_flood_wait_sleep_seconds_total", fw.value, source="broadcast"
+                )
                 await asyncio.sleep(fw.value)
             except RPCError:
                 await del_user(user_id)
                 self.failed += 1
+                metrics.inc("fsub_broadcast_messages_total", result="failed")
             except Exception:
                 continue
 
@@ -105,9 +118,10 @@ class BroadcastManager:
         await progress_msg.delete()
 
         self.is_running, self.sent, self.failed, self.total = False, 0, 0, 0
+        metrics.set("fsub_broadcast_running", 0)
 
 
-broadcast_manager = BroadcastManager()
+broadcast_manager: BroadcastManager = per_bot(BroadcastManager)
 
 
 @Client.on_message(filter_broadcast & filters.command(["broadcast", "bc"]))
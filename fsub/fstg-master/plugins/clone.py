@@ -0,0 +1,74 @@
+import html
+from typing import TYPE_CHECKING
+
+from hydrogram import Client, filters
+
+from bot import BotError, clones, config, filter_main_bot, logger
+
+if TYPE_CHECKING:
+    from hydrogram.types import Message
+
+    from bot import bot
+
+
+@Client.on_message(
+    filters.user(config.OWNER_ID)
+    & filter_main_bot
+    & filters.private
+    & filters.command("clone")
+)
+async def clone_handler(_: "bot", message: "Message") -> None:
+    if len(message.command) != 2:
+        await message.reply_text("<b>Usage:</b> /clone [bot token]", quote=True)
+        return
+
+    # The token is a secret, so it does not stay in the chat
+    await message.delete()
+    status_msg = await message.reply_text("<b>Starting...</b>")
+
+    try:
+        username = await clones.add(message.command[1])
+    except BotError as exc:
+        await status_msg.edit_text(f"<b>{html.escape(exc.message)}</b>")
+        return
+    except Exception as exc:
+        logger.error(f"Clone: {exc}")
+        await status_msg.edit_text("<b>An Error Occurred!</b>")
+        return
+
+    await status_msg.edit_text(f"<b>Clone Started:</b> @{username}")
+
+
+@Client.on_message(
+    filters.user(config.OWNER_ID)
+    & filter_main_bot
+    & filters.private
+    & filters.command("unclone")
+)
+async def unclone_handler(_: "bot", message: "Message") -> None:
+    if len(message.command) != 2 or not message.command[1].isdigit():
+        await message.reply_text("<b>Usage:</b> /unclone [bot id]", quote=True)
+        return
+
+    if not await clones.remove(int(message.command[1])):
+        await message.reply_text("<b>That bot isn't a clone!</b>", quote=True)
+        return
+
+    await message.reply_text("<b>Clone Removed!</b>", quote=True)
+
+
+@Client.on_message(
+    filters.user(config.OWNER_ID)
+    & filter_main_bot
+    & filters.private
+    & filters.command("clones")
+)
+async def clones_handler(_: "bot", message: "Message") -> None:
+    lines = [
+        f"  - <code>{bot_id}</code> @{username}"
+        for bot_id, username in clones.usernames.items()
+    ]
+    lines += [f"  - <code>{bot_id}</code> Stopped" for bot_id in await clones.stopped()]
+    await message.reply_text(
+        f"<b>Clones:</b> {len(lines)}\n" + "\n".join(lines), quote=True
+    )
@@ -1,12 +1,24 @@
 import asyncio
+import html
+import os
+import re
 import sys
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List, Optional, Pattern, Tuple
 
 import aiofiles
 from hydrogram import Client, filters
 from hydrogram.helpers import ikb
 
-from bot import button, config, filter_authorized, logger
+from bot import (
+    LOG_FILE,
+    LOG_LEVELS,
+    button,
+    config,
+    filter_authorized,
+    logger,
+    profiler,
+    search_logs,
+)
 
 if TYPE_CHECKING:
     from hydrogram.types import Message
@@ -23,10 +35,129 @@ async def settings_handler(_: "bot", message: "Message") -> None:
 
 @Client.on_message(filters.user(config.OWNER_ID) & filters.command(["logs", "log"]))
 async def logs_handler(_: "bot", message: "Message") -> None:
-    await message.reply_document(
-        document="logs.txt", quote=True, caption="<b>Bot Logs</b>"
+    args = message.command[1:]
+    if args and args[0].lower() in {"file", "full"}:
+        await message.reply_document(
+            document=LOG_FILE, quote=True, caption="<b>Bot Logs</b>"
+        )
+        return
+
+    try:
+        limit, level, pattern = parse_logs_query(args)
+    except re.error as exc:
+        await message.reply_text(f"<b>Invalid Regex:</b> {exc}", quote=True)
+        return
+
+    lines = await asyncio.to_thread(search_logs, limit, level, pattern)
+    await message.reply_text(format_logs(lines, args), quote=True)
+
+
+def parse_logs_query(args: List[str]) -> Tuple[int, int, Optional[Pattern[str]]]:
+    """
+    Parses `/logs [N] [level] [text or /regex/]`.
+
+    Args:
+        args (List[str]): The command arguments.
+
+    Returns:
+        Tuple[int, int, Optional[Pattern[str]]]: The number of lines, the
+            minimum level and the search pattern.
+    """
+    limit, level, terms = 20, 0, []
+    for arg in args:
+        if arg.isdigit() and not terms:
+            limit = max(1, min(int(arg), 200))
+        elif arg.upper() in LOG_LEVELS and not terms:
+            level = LOG_LEVELS[arg.upper()]
+        else:
+            terms.append(arg)
+
+    query = " ".join(terms)
+    if len(query) > 2 and query.startswith("/") and query.endswith("/"):
+        return limit, level, re.compile(query[1:-1])
+    return limit, level, re.compile(re.escape(query), re.IGNORECASE) if query else None
+
+
+def format_logs(lines: List[str], args: List[str], max_length: int = 3800) -> str:
+    """
+    Formats log lines for a message, keeping the newest ones that fit.
+
+    Args:
+        lines (List[str]): The lines, oldest first.
+        args (List[str]): The command arguments, echoed in the header.
+        max_length (int): The maximum length of the line block.
+
+    Returns:
+        str: The message text.
+    """
+    header = "<b>Bot Logs</b>"
+    if args:
+        header += f" <code>{html.escape(' '.join(args))}</code>"
+    if not lines:
+        return f"{header}\n<b>No Matching Lines</b>"
+
+    kept: List[str] = []
+    length = 0
+    for line in reversed(lines):
+        line = html.escape(line)
+        length += len(line) + 1
+        if length > max_length:
+            break
+        kept.append(line)
+
+    body = "\n".join(reversed(kept))
+    return f"{header}\n<pre>{body}</pre>"
+
+
+@Client.on_message(filters.user(config.OWNER_ID) & filters.command("profile"))
+async def profile_handler(_: "bot", message: "Message") -> None:
+    seconds = profile_seconds(message.command)
+    status_msg = await message.reply_text(
+        f"<b>Profiling CPU for {seconds} s...</b>", quote=True
     )
 
+    path = f"profile-{message.id}.prof"
+    try:
+        top = await profiler.cpu(seconds, path)
+        await status_msg.edit_text(
+            f"<b>CPU Profile</b> ({seconds} s)\n<pre>{html.escape(top)}</pre>"
+        )
+        await message.reply_document(
+            document=path, quote=True, caption="<b>Raw Stats</b> (pstats)"
+        )
+    except Exception as exc:
+        logger.error(f"Profile: {exc}")
+        await status_msg.edit_text(f"<b>An Error Occurred!</b> {html.escape(str(exc))}")
+    finally:
+        if os.path.isfile(path):
+            os.remove(path)
+
+
+@Client.on_message(filters.user(config.OWNER_ID) & filters.command("memprofile"))
+async def memprofile_handler(_: "bot", message: "Message") -> None:
+    seconds = profile_seconds(message.command)
+    status_msg = await message.reply_text(
+        f"<b>Tracing Allocations for {seconds} s...</b>", quote=True
+    )
+
+    try:
+        top, growth = await profiler.memory(seconds)
+        await status_msg.edit_text(
+            f"<b>Memory Profile</b> ({seconds} s)\n"
+            f"<b>Largest Sites</b>\n<pre>{html.escape(top) or '-'}</pre>\n"
+            f"<b>Growth</b>\n<pre>{html.escape(growth) or '-'}</pre>"
+        )
+    except Exception as exc:
+        logger.error(f"Memprofile: {exc}")
+        await status_msg.edit_text(f"<b>An Error Occurred!</b> {html.escape(str(exc))}")
+
+
+def profile_seconds(command: List[str], default: int = 30) -> int:
+    """Reads the profiling duration argument, between 1 and 300 seconds."""
+    if len(command) > 1 and command[1].isdigit():
+        return max(1, min(int(command[1]), 300))
+    return default
+
 
 @Client.on_message(filters.user(config.OWNER_ID) & filters.command(["restart", "r"]))
 async def restart_handler(_: "bot", message: "Message") -> None:
@@ -1,11 +1,10 @@
-import time
 from typing import TYPE_CHECKING
 
 from hydrogram import Client, filters
+from hydrogram.errors import MessageNotModified
 from hydrogram.helpers import ikb
-from hydrogram.raw.functions import Ping
 
-from bot import button, logger
+from bot import button, latency, logger
 
 if TYPE_CHECKING:
     from hydrogram.types import CallbackQuery, Message
@@ -14,13 +13,11 @@ if TYPE_CHECKING:
 
 
 @Client.on_message(filters.private & filters.command("ping"))
-async def ping_handler(client: "bot", message: "Message") -> None:
+async def ping_handler(_: "bot", message: "Message") -> None:
     try:
-        latency = await ping_function(client)
+        latency_text = await ping_function()
         await message.reply_text(
-            f"<b>Latency:</b> {latency}",
-            quote=True,
-            reply_markup=ikb(button.Ping),
+            latency_text, quote=True, reply_markup=ikb(button.Ping)
         )
     except Exception as exc:
         logger.error(f"Latency: {exc}")
@@ -28,14 +25,13 @@ async def ping_handler(client: "bot", message: "Message") -> None:
 
 
 @Client.on_callback_query(filters.regex(r"\bping\b"))
-async def ping_handler_query(client: "bot", query: "CallbackQuery") -> None:
-    await query.message.edit_text("<b>Refreshing...</b>")
-
+async def ping_handler_query(_: "bot", query: "CallbackQuery") -> None:
     try:
-        latency = await ping_function(client)
-        await query.message.edit_text(
-            f"<b>Latency:</b> {latency}", reply_markup=ikb(button.Ping)
-        )
+        latency_text = await ping_function()
+        await query.message.edit_text(latency_text, reply_markup=ikb(button.Ping))
+    except MessageNotModified:
+        # No new sample since the last refresh
+        await query.answer("Up to date")
     except Exception as exc:
         logger.error(f"Latency: {exc}")
         await query.message.edit_text(
@@ -43,15 +39,24 @@ async def ping_handler_query(client: "bot", query: "CallbackQuery") -> None:
         )
 
 
-async def ping_function(client: "bot") -> str:
-    try:
-        start_time = time.time()
-        await client.invoke(Ping(ping_id=0))
-        end_time = time.time()
+async def ping_function() -> str:
+    # Only the very first request, before any background sample, waits
+    if not all(latency.samples.values()):
+        await latency.sample()
 
-        # Calculate latency in milliseconds
-        latency_ms = (end_time - start_time) * 1000
-        return f"{latency_ms:.2f} ms"
-    except Exception as exc:
-        logger.error(f"Latency: {exc}")
-        return "<b>An Error Occurred!</b>"
+    lines = ["<b>Latency</b>"]
+    for name in latency.targets:
+        stats = latency.stats(name)
+        current = (
+            f"{stats['current']:.2f} ms" if stats["current"] >= 0 else "<b>Failed</b>"
+        )
+        lines.append(
+            f"  - <code>{name}:</code> {current}\n"
+            f"    p50 {stats['p50']:.1f}, p95 {stats['p95']:.1f}, "
+            f"max {stats['max']:.1f} ms"
+            + (f", {stats['failed']} failed" if stats["failed"] else "")
+        )
+
+    count = max(len(samples) for samples in latency.samples.values())
+    lines.append(f"<i>{count} samples, every {latency.interval} s</i>")
+    return "\n".join(lines)
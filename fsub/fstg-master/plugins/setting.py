@@ -1,3 +1,4 @@
+import html
 from typing import TYPE_CHECKING
 
 from hydrogram import Client, filters
@@ -6,6 +7,7 @@ from hydrogram.errors import ListenerStopped, ListenerTimeout, RPCError
 from hydrogram.helpers import ikb
 
 from bot import (
+    Template,
     add_admin,
     add_fs_chat,
     button,
@@ -86,15 +88,13 @@ async def change_handler_query(_: "bot", query: "CallbackQuery") -> None:
     query_data = query.data.split("_")[1]
 
     if query_data == "generate":
-        await update_generate_status()
-        await cache.generate_status_init()
+        await cache.generate_status_init(await update_generate_status())
         logger.info("Generate Status: Changed")
         text = f"Generate Status has been changed to <b>{cache.generate_status}</b>"
         buttons = button.Generate_
 
     elif query_data == "protect":
-        await update_protect_content()
-        await cache.protect_content_init()
+        await cache.protect_content_init(await update_protect_content())
         logger.info("Protect Content: Changed")
         text = f"Protect Content has been changed to <b>{cache.protect_content}</b>"
         buttons = button.Protect_
@@ -132,18 +132,21 @@ async def set_handler_query(client: "bot", query: "CallbackQuery") -> None:
         )
         return
 
-    if not new_text:
+    try:
+        if not new_text:
+            raise ValueError("Just send a text message.")
+        # Rejected before it is stored, rather than breaking every /start
+        Template(new_text)
+    except ValueError as exc:
         await query.message.edit_text(
-            "<b>Invalid! Just send a text message.</b>", reply_markup=buttons
+            f"<b>Invalid! {html.escape(str(exc))}</b>", reply_markup=buttons
         )
     else:
         if query_data == "start":
-            await update_start_text_msg(new_text)
-            await cache.start_text_init()
+            await cache.start_text_init(await update_start_text_msg(new_text))
             logger.info("Start Text: Customized")
         else:
-            await update_force_text_msg(new_text)
-            await cache.force_text_init()
+            await cache.force_text_init(await update_force_text_msg(new_text))
             logger.info("Force Text: Customized")
 
         await query.message.edit_text(
@@ -185,7 +188,7 @@ async def add_handler_query(client: "bot", query: "CallbackQuery") -> None:
         )
         return
 
-    list_ids = cache.admins if query_data == "admin" else cache.fs_chats
+    list_ids = cache.admins if query_data == "admin" else cache.fs_chat_ids
     if new_id in list_ids:
         await query.message.edit_text(
             f"<b>That's {entity_data} already added!</b>", reply_markup=buttons
@@ -205,6 +208,7 @@ async def add_handler_query(client: "bot", query: "CallbackQuery") -> None:
         )
         return
 
+    note = ""
     if query_data == "admin":
         await add_admin(new_id)
         logger.info("Bot Admins: Updating...")
@@ -212,10 +216,14 @@ async def add_handler_query(client: "bot", query: "CallbackQuery") -> None:
     else:
         await add_fs_chat(new_id)
         logger.info("Sub. Chats: Updating...")
-        await cache.fs_chats_init()
+        if not await cache.fs_chat_add(chat):
+            note = (
+                "\n\n<b>No invite link! It's not enforced until the bot "
+                "is an admin there that can invite users.</b>"
+            )
 
     await query.message.edit_text(
-        f"Added new {query_data.title()}: <code>{new_id}</code>",
+        f"Added new {query_data.title()}: <code>{new_id}</code>{note}",
         reply_markup=buttons,
     )
 
@@ -253,7 +261,7 @@ async def del_handler_query(client: "bot", query: "CallbackQuery") -> None:
         )
         return
 
-    list_ids = cache.admins if query_data == "admin" else cache.fs_chats
+    list_ids = cache.admins if query_data == "admin" else cache.fs_chat_ids
     if get_id not in list_ids:
         await query.message.edit_text(
             f"<b>That's {entity_data} not found!</b>", reply_markup=buttons
@@ -273,7 +281,7 @@ async def del_handler_query(client: "bot", query: "CallbackQuery") -> None:
     else:
         await del_fs_chat(get_id)
         logger.info("Sub. Chats: Updating...")
-        await cache.fs_chats_init()
+        await cache.fs_chat_remove(get_id)
 
     await query.message.edit_text(
         f"The {query_data.title()} has been deleted: <code>{get_id}</code>",
@@ -9,39 +9,52 @@ from bot import (
     admin_buttons,
     button,
     cache,
-    config,
-    decode_data,
+    deferred,
+    fs_chats_buttons,
     join_buttons,
+    prefetch,
+    throttle,
 )
 
 if TYPE_CHECKING:
-    from hydrogram.types import Message, User
+    from hydrogram.types import Message
 
     from bot import bot
 
 
 @Client.on_message(filters.private & filters.command("start"))
+@throttle.guard
 async def start_handler(client: "bot", message: "Message") -> None:
     try:
         user = message.from_user
+        if len(message.command) == 1 and client.updates.overloaded():
+            # Answered from the caches alone until the backlog drains
+            deferred.add_user(user.id)
+            buttons = (
+                admin_buttons() if user.id in cache.authorized else fs_chats_buttons()
+            )
+            await message.reply_text(
+                cache.start_template.render(user), quote=True, reply_markup=buttons
+            )
+            return
+
         await add_user(user.id)
 
-        start_text = format_text_message(cache.start_text, user)
         user_buttons = await join_buttons(client, message, user.id)
-        list_of_admins = cache.admins + [config.OWNER_ID]
         if len(message.command) == 1:
-            buttons = admin_buttons() if user.id in list_of_admins else user_buttons
+            start_text = cache.start_template.render(user)
+            buttons = admin_buttons() if user.id in cache.authorized else user_buttons
             await message.reply_text(start_text, quote=True, reply_markup=buttons)
         else:
-            force_text = format_text_message(cache.force_text, user)
             if await cache.user_is_not_join(user.id):
+                prefetch.start(client, message.command[1])
+                force_text = cache.force_template.render(user)
                 await message.reply_text(
                     force_text, quote=True, reply_markup=user_buttons
                 )
                 return
 
-        message_ids = decode_data(message.command[1])
-        msgs = await client.get_messages(config.DATABASE_CHAT_ID, message_ids)
+        msgs = await prefetch.get(client, message.command[1])
         for msg in msgs:
             if not msg.empty:
                 await msg.copy(user.id, protect_content=cache.protect_content)
@@ -97,15 +110,3 @@ This Privacy Policy explains how we collect, use, and protect your information w
     await message.reply_text(
         privacy_policy, quote=True, reply_markup=ikb(button.Contact)
     )
-
-
-def format_text_message(text: str, user: "User") -> str:
-    first_name, last_name = user.first_name, user.last_name
-    full_name = f"{first_name} {last_name}".strip() if last_name else first_name
-
-    return text.format(
-        first_name=first_name,
-        last_name=last_name,
-        full_name=full_name,
-        mention=user.mention(full_name),
-    )
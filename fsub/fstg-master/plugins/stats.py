@@ -4,7 +4,16 @@ from typing import TYPE_CHECKING
 from hydrogram import Client, filters
 from hydrogram.helpers import ikb
 
-from bot import button, cache, filter_authorized, get_users, logger
+from bot import (
+    button,
+    cache,
+    calls,
+    config,
+    filter_authorized,
+    get_users,
+    logger,
+    watchdog,
+)
 
 startup_date = datetime.datetime.now()
 
@@ -20,7 +29,7 @@ async def users_handler(_: "bot", message: "Message") -> None:
 
     try:
         all_users = await get_users()
-        bot_users = [user for user in all_users if user not in cache.admins]
+        bot_users = [user for user in all_users if user not in cache.authorized]
 
         msg_users = (
             "<b>Bot Members</b>\n"
@@ -33,6 +42,16 @@ async def users_handler(_: "bot", message: "Message") -> None:
         await counting_message.edit_text("<b>An Error Occurred!</b>")
 
 
+@Client.on_message(filters.user(config.OWNER_ID) & filters.command("apistats"))
+async def apistats_handler(_: "bot", message: "Message") -> None:
+    await message.reply_text(apistats_func(), quote=True)
+
+
+@Client.on_message(filters.user(config.OWNER_ID) & filters.command("lag"))
+async def lag_handler(_: "bot", message: "Message") -> None:
+    await message.reply_text(lag_func(), quote=True)
+
+
 @Client.on_message(filters.private & filters.command("uptime"))
 async def uptime_handler(_: "bot", message: "Message") -> None:
     uptime_text = uptime_func()
@@ -62,6 +81,67 @@ def uptime_func() -> str:
     return msg_text
 
 
+def apistats_func(limit: int = 10) -> str:
+    if not calls.window:
+        return "<b>API Stats:</b> Disabled, set API_STATS_WINDOW to enable"
+
+    methods, handlers = calls.summary()
+    if not methods:
+        return "<b>API Stats:</b> No calls yet"
+
+    window = convert_seconds(calls.window)
+    lines = [f"<b>API Calls</b> (last {window})"]
+    ranked = sorted(methods.items(), key=lambda item: item[1].count, reverse=True)
+    for method, entry in ranked[:limit]:
+        p50 = entry.latency.quantile(0.50) * 1000
+        p95 = entry.latency.quantile(0.95) * 1000
+        lines.append(
+            f"  - <code>{method}:</code> {entry.count}, "
+            f"p50 ≤{p50:g} ms, p95 ≤{p95:g} ms"
+        )
+        errors = ", ".join(f"{name} {count}" for name, count in entry.errors.items())
+        if errors:
+            lines.append(f"    <code>Errors:</code> {errors}")
+        if entry.flood_waits:
+            lines.append(
+                f"    <code>FloodWait:</code> {entry.flood_waits}, "
+                f"{entry.flood_seconds} s"
+            )
+
+    lines.append("\n<b>By Handler</b>")
+    totals = sorted(
+        handlers.items(), key=lambda item: sum(item[1].values()), reverse=True
+    )
+    for handler, counts in totals[:limit]:
+        by_method = ", ".join(f"{m} {c}" for m, c in counts.most_common(3))
+        lines.append(
+            f"  - <code>{handler}:</code> {sum(counts.values())} ({by_method})"
+        )
+
+    return "\n".join(lines)
+
+
+def lag_func(limit: int = 10) -> str:
+    lag, handlers = watchdog.summary()
+    lines = [
+        "<b>Event Loop Lag</b>",
+        f"  - <code>p50:</code> {lag['p50'] * 1000:.1f} ms",
+        f"  - <code>p99:</code> {lag['p99'] * 1000:.1f} ms",
+        f"  - <code>Max:</code> {lag['max'] * 1000:.1f} ms",
+    ]
+    if handlers:
+        lines.append("\n<b>Handlers</b> (slowest p95 first)")
+    for name, stats in handlers[:limit]:
+        lines.append(
+            f"  - <code>{name}:</code> {stats['count']}, "
+            f"p50 {stats['p50'] * 1000:.0f} ms, p95 {stats['p95'] * 1000:.0f} ms, "
+            f"max {stats['max'] * 1000:.0f} ms"
+            + (f", slow {stats['slow']}" if stats["slow"] else "")
+        )
+
+    return "\n".join(lines)
+
+
 def convert_seconds(seconds: int) -> str:
     weeks, remainder = divmod(seconds, 7 * 24 * 60 * 60)
     days, remainder = divmod(remainder, 24 * 60 * 60)